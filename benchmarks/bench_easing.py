@@ -0,0 +1,99 @@
+"""
+Easing benchmark
+比较缓动函数逐个标量调用（与改为支持数组之前的标量实现对比）与一次数组调用的每元素耗时，
+以及贝塞尔缓动查找表与迭代求解的耗时
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.animation import EaseFunction
+
+
+# 参照实现：支持数组之前的标量缓动函数
+def original_linear(t):
+    return t
+
+
+def original_ease_in_out(t):
+    return 3 * t**2 - 2 * t**3
+
+
+def original_ease_in_quad(t):
+    return t * t
+
+
+def original_ease_out_quad(t):
+    return 1 - (1 - t) * (1 - t)
+
+
+def original_ease_in_out_quad(t):
+    if t < 0.5:
+        return 2 * t * t
+    else:
+        return 1 - 2 * (1 - t) * (1 - t)
+
+
+def solve_cubic_bezier(x1, y1, x2, y2, t, iterations=8):
+    """参照实现：牛顿迭代由x求曲线参数，再求y（每次调用都要迭代）"""
+    s = t
+    for _ in range(iterations):
+        u = 1.0 - s
+        x = 3 * u * u * s * x1 + 3 * u * s * s * x2 + s ** 3 - t
+        dx = 3 * u * u * x1 + 6 * u * s * (x2 - x1) + 3 * s * s * (1.0 - x2)
+        if abs(dx) < 1e-9:
+            break
+        s -= x / dx
+    u = 1.0 - s
+    return 3 * u * u * s * y1 + 3 * u * s * s * y2 + s ** 3
+
+
+def per_element(func, values, repeats):
+    """返回每个元素的平均耗时（纳秒）"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(values)
+    return (time.perf_counter() - start) / (repeats * len(values)) * 1e9
+
+
+def main():
+    count = 10000
+    values = np.random.default_rng(0).random(count)
+    scalars = values.tolist()
+    
+    # (名称, 缓动, 支持数组之前的标量实现；新增的缓动没有)
+    easings = [
+        ('linear', EaseFunction.linear, original_linear),
+        ('ease_in_out', EaseFunction.ease_in_out, original_ease_in_out),
+        ('ease_in_quad', EaseFunction.ease_in_quad, original_ease_in_quad),
+        ('ease_out_quad', EaseFunction.ease_out_quad, original_ease_out_quad),
+        ('ease_in_out_quad', EaseFunction.ease_in_out_quad, original_ease_in_out_quad),
+        ('cubic_bezier', EaseFunction.cubic_bezier(0.25, 0.1, 0.25, 1.0), None),
+        ('elastic', EaseFunction.elastic(), None),
+        ('bounce', EaseFunction.bounce(), None),
+        ('steps', EaseFunction.steps(8), None),
+    ]
+    
+    print(f"{count} 个进度值，单位：纳秒/元素；比值为逐个标量调用相对原标量实现的耗时")
+    print(f"{'缓动':<20}{'原标量实现':>12}{'逐个标量':>12}{'比值':>8}{'数组':>12}{'加速':>10}")
+    for name, ease, original in easings:
+        scalar = per_element(lambda xs: [ease(x) for x in xs], scalars, 20)
+        vector = per_element(ease, values, 50)
+        if original is None:
+            reference, ratio = f"{'-':>12}", f"{'-':>8}"
+        else:
+            baseline = per_element(lambda xs: [original(x) for x in xs], scalars, 20)
+            reference, ratio = f"{baseline:>12.1f}", f"{scalar / baseline:>7.2f}x"
+        print(f"{name:<20}{reference}{scalar:>12.1f}{ratio}{vector:>12.1f}{scalar / vector:>9.0f}x")
+        
+    # 贝塞尔缓动：查找表插值与逐个迭代求解
+    bezier = EaseFunction.cubic_bezier(0.25, 0.1, 0.25, 1.0)
+    solver = per_element(lambda xs: [solve_cubic_bezier(0.25, 0.1, 0.25, 1.0, x) for x in xs], scalars, 3)
+    error = max(abs(bezier(x) - solve_cubic_bezier(0.25, 0.1, 0.25, 1.0, x)) for x in scalars[:1000])
+    print(f"{'bezier迭代求解':<20}{solver:>12.1f}{per_element(bezier, values, 50):>12.1f}    查找表最大误差 {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
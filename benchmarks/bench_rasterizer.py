@@ -0,0 +1,61 @@
+"""
+Rasterizer benchmark
+比较纯NumPy软件渲染器与ModernGL（离屏）渲染一帧并回读的耗时
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.renderer import Renderer
+from core.software_renderer import SoftwareRenderer
+
+
+def random_triangles(count, rng):
+    """生成分布在画面中的随机三角形"""
+    centers = rng.uniform((-7, -4, 0), (7, 4, 0), size=(count, 1, 3))
+    offsets = rng.uniform(-0.5, 0.5, size=(count, 3, 3))
+    offsets[..., 2] = 0.0
+    colors = rng.uniform(0.0, 1.0, size=(count, 3))
+    return (centers + offsets).astype(np.float32), colors.astype(np.float32)
+
+
+def bench(renderer, vertices, colors, repeats):
+    """返回渲染一帧（清屏+批量绘制+回读）的平均耗时（毫秒）"""
+    frame = np.empty((renderer.height, renderer.width, 3), dtype=np.uint8)
+    renderer.clear_screen()
+    renderer.draw_triangles(vertices, colors)
+    renderer.read_into(frame)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        renderer.clear_screen()
+        renderer.draw_triangles(vertices, colors)
+        renderer.read_into(frame)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    width, height = 1280, 720
+    rng = np.random.default_rng(0)
+    
+    renderers = [('software', SoftwareRenderer(width, height))]
+    try:
+        renderers.append(('moderngl', Renderer(width, height, headless=True)))
+    except Exception as error:
+        print(f"ModernGL不可用，只测试软件渲染器: {error}")
+        
+    print(f"分辨率 {width}x{height}，单位：毫秒/帧")
+    print(f"{'三角形数':>8}" + ''.join(f"{name:>12}" for name, _ in renderers))
+    for count in (10, 100, 1000, 10000):
+        vertices, colors = random_triangles(count, rng)
+        repeats = 20 if count <= 1000 else 5
+        timings = [bench(renderer, vertices, colors, repeats) for _, renderer in renderers]
+        print(f"{count:>8}" + ''.join(f"{timing:>12.2f}" for timing in timings))
+        
+    for _, renderer in renderers:
+        renderer.cleanup()
+
+
+if __name__ == "__main__":
+    main()
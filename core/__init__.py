@@ -4,26 +4,42 @@ Mini Animation Engine - Core Module
 """
 
 from .renderer import Renderer
-from .geometry import Triangle, Transform
+from .software_renderer import SoftwareRenderer
+from .geometry import Triangle, Transform, TransformStore
 from .animation import (
-    Animation, TransformAnimation, ColorAnimation, TimeManager,
-    EaseFunction, move_to, rotate_to, scale_to, color_to, lerp
+    Animation, TransformAnimation, ColorAnimation, MorphAnimation, TimeManager,
+    AnimationGroup, Succession, LaggedStart,
+    EaseFunction, move_to, rotate_to, scale_to, color_to, morph_to, lerp,
+    register_interpolator, AngleInterpolator
 )
 from .scene import Scene, MiniAnimationEngine
+from .timeline import Timeline
+from .gpu_animation import GpuAnimationSet
+from .culling import SpatialGrid
+from .registry import ObjectRegistry
+from .clock import WallClock, FrameClock
+from .scheduler import FrameScheduler
+from .export import FrameExporter
+from .parallel import render_parallel
 
 __all__ = [
     # 渲染器
-    'Renderer',
+    'Renderer', 'SoftwareRenderer',
     
     # 几何对象
-    'Triangle', 'Transform',
+    'Triangle', 'Transform', 'TransformStore',
     
     # 动画系统
-    'Animation', 'TransformAnimation', 'ColorAnimation', 'TimeManager',
-    'EaseFunction', 'move_to', 'rotate_to', 'scale_to', 'color_to', 'lerp',
+    'Animation', 'TransformAnimation', 'ColorAnimation', 'MorphAnimation', 'TimeManager',
+    'AnimationGroup', 'Succession', 'LaggedStart', 'GpuAnimationSet',
+    'EaseFunction', 'move_to', 'rotate_to', 'scale_to', 'color_to', 'morph_to', 'lerp',
+    'register_interpolator', 'AngleInterpolator',
     
     # 场景管理
-    'Scene', 'MiniAnimationEngine'
+    'Scene', 'MiniAnimationEngine', 'ObjectRegistry', 'FrameScheduler', 'Timeline', 'SpatialGrid',
+    
+    # 时钟与导出
+    'WallClock', 'FrameClock', 'FrameExporter', 'render_parallel'
 ]
 
 __version__ = '1.0.0'
@@ -4,45 +4,179 @@ Mini Animation Engine MVP - Animation Module
 """
 import time
 import math
+import numbers
+import functools
+import bisect
+import heapq
+import itertools
 from typing import Callable, Any, List, Optional
-from dataclasses import dataclass
 import numpy as np
+from .clock import WallClock, _TIME_EPSILON
+from .geometry import _as_mesh
+
+
+def array_ease(func: Callable) -> Callable:
+    """标记缓动函数可以对NumPy数组逐元素求值，使用它的动画可被TimeManager批量求值"""
+    func.array_ease = True
+    return func
+
+
+# 缓动判断数组参数用：float先按类型比较，标量分支的开销与不判断时相当
+_ndarray = np.ndarray
 
 
 class EaseFunction:
-    """缓动函数集合"""
+    """缓动函数集合
+    
+    所有缓动既接受单个数值（包括NumPy标量），也接受NumPy数组（逐元素求值）；
+    标量走纯Python分支，避免NumPy调用开销。
+    cubic_bezier、elastic、bounce、steps是带参数的缓动，返回缓动函数；
+    相同参数返回同一个函数对象，使用它们的动画可以被分到同一批量组
+    """
     
     @staticmethod
+    @array_ease
     def linear(t: float) -> float:
         """线性插值"""
         return t
         
     @staticmethod
+    @array_ease
     def ease_in_out(t: float) -> float:
         """缓入缓出（类似ManimGL的smooth函数）"""
         return 3 * t**2 - 2 * t**3
         
     @staticmethod
+    @array_ease
     def ease_in_quad(t: float) -> float:
         """二次缓入"""
         return t * t
         
     @staticmethod
+    @array_ease
     def ease_out_quad(t: float) -> float:
         """二次缓出"""
         return 1 - (1 - t) * (1 - t)
         
     @staticmethod
+    @array_ease
     def ease_in_out_quad(t: float) -> float:
         """二次缓入缓出"""
+        if type(t) is not float and isinstance(t, _ndarray):
+            return np.where(t < 0.5, 2 * t * t, 1 - 2 * (1 - t) * (1 - t))
         if t < 0.5:
             return 2 * t * t
         else:
             return 1 - 2 * (1 - t) * (1 - t)
+            
+    @staticmethod
+    def lookup_table(func: Callable, resolution: int = 4096) -> Callable:
+        """把缓动函数预采样为查找表，求值时线性插值（用于求值代价高的缓动）"""
+        samples = np.linspace(0.0, 1.0, resolution + 1)
+        values = np.asarray(func(samples), dtype=np.float64)
+        return _interpolated_ease(samples, values)
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def cubic_bezier(x1: float, y1: float, x2: float, y2: float, resolution: int = 4096) -> Callable:
+        """CSS风格的三次贝塞尔缓动，控制点为 (0,0), (x1,y1), (x2,y2), (1,1)
+        
+        由t求曲线参数需要迭代求根，这里预先对曲线参数均匀采样得到 (x, y) 查找表，
+        求值时对x插值
+        """
+        if not (0.0 <= x1 <= 1.0 and 0.0 <= x2 <= 1.0):
+            raise ValueError("cubic_bezier的x1、x2必须在[0, 1]内")
+        s = np.linspace(0.0, 1.0, resolution + 1)
+        u = 1.0 - s
+        xs = 3 * u * u * s * x1 + 3 * u * s * s * x2 + s ** 3
+        ys = 3 * u * u * s * y1 + 3 * u * s * s * y2 + s ** 3
+        return _interpolated_ease(xs, ys)
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def elastic(amplitude: float = 1.0, period: float = 0.3) -> Callable:
+        """弹性缓出：越过终点后衰减振荡"""
+        amplitude = max(amplitude, 1.0)
+        shift = period / (2 * math.pi) * math.asin(1.0 / amplitude)
+        
+        @array_ease
+        def ease(t):
+            if type(t) is float or not isinstance(t, _ndarray):
+                return 1.0 if t >= 1.0 else amplitude * 2.0 ** (-10 * t) * math.sin((t - shift) * 2 * math.pi / period) + 1
+            t = np.asarray(t, dtype=np.float64)
+            value = amplitude * 2.0 ** (-10 * t) * np.sin((t - shift) * 2 * math.pi / period) + 1
+            return np.where(t >= 1.0, 1.0, value)
+        return ease
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def bounce(bounces: int = 4) -> Callable:
+        """弹跳缓出：到达终点后以递减的高度反弹bounces-1次"""
+        # 每次反弹的时长按0.5递减，高度按0.25递减；第一段是从起点下落到终点
+        durations = np.array([1.0] + [0.5 ** i for i in range(bounces - 1)])
+        durations = durations / durations.sum()
+        ends = np.cumsum(durations)
+        # 第一段是半个抛物线，其后每段是完整的抛物线
+        heights = np.array([1.0] + [0.25 ** (i + 1) for i in range(bounces - 1)])
+        
+        # 第一段的抛物线顶点在t=0，其余段的顶点在段中点
+        halves = np.where(np.arange(bounces) == 0, durations, durations / 2)
+        centers = ends - durations + np.where(np.arange(bounces) == 0, 0.0, halves)
+        segments = list(zip(ends.tolist(), centers.tolist(), halves.tolist(), heights.tolist()))
+        
+        @array_ease
+        def ease(t):
+            if type(t) is float or not isinstance(t, _ndarray):
+                t = min(max(t, 0.0), 1.0)
+                for end, center, half, height in segments:
+                    if t <= end:
+                        break
+                x = (t - center) / half
+                return 1.0 - height * (1.0 - x * x)
+            t = np.clip(np.asarray(t, dtype=np.float64), 0.0, 1.0)
+            index = np.minimum(np.searchsorted(ends, t), bounces - 1)
+            x = (t - centers[index]) / halves[index]
+            return 1.0 - heights[index] * (1.0 - x * x)
+        return ease
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def steps(count: int, jump_start: bool = False) -> Callable:
+        """阶梯缓动：把进度量化为count级（jump_start为True时在每段开始跳变）"""
+        @array_ease
+        def ease(t):
+            if type(t) is float or not isinstance(t, _ndarray):
+                level = math.ceil(t * count) if jump_start else math.floor(t * count)
+                return min(max(level / count, 0.0), 1.0)
+            t = np.asarray(t, dtype=np.float64)
+            level = np.ceil(t * count) if jump_start else np.floor(t * count)
+            return np.clip(level / count, 0.0, 1.0)
+        return ease
+
+
+def _interpolated_ease(xs: np.ndarray, ys: np.ndarray) -> Callable:
+    """由采样点构造的缓动函数：对 [0,1] 内的t线性插值（xs单调递增）"""
+    x_list = xs.tolist()
+    y_list = ys.tolist()
+    last = len(x_list) - 1
+    
+    @array_ease
+    def ease(t):
+        if type(t) is float or not isinstance(t, _ndarray):
+            index = min(max(bisect.bisect_right(x_list, t), 1), last)
+            x0, x1 = x_list[index - 1], x_list[index]
+            y0, y1 = y_list[index - 1], y_list[index]
+            if t >= x1:
+                return y1
+            if t <= x0:
+                return y0
+            return y0 + (y1 - y0) * (t - x0) / (x1 - x0)
+        return np.interp(t, xs, ys)
+    return ease
 
 
 def lerp(start: Any, end: Any, t: float) -> Any:
-    """线性插值函数，支持数值、向量、颜色等"""
+    """线性插值函数，支持数值、向量、颜色等（动画使用开始时选定的插值器，见resolve_interpolator）"""
     if isinstance(start, (int, float)):
         return start + (end - start) * t
     elif isinstance(start, np.ndarray):
@@ -58,6 +192,111 @@ def lerp(start: Any, end: Any, t: float) -> Any:
             return end if t >= 1.0 else start
 
 
+class ScalarInterpolator:
+    """标量插值器"""
+    
+    # 线性插值器：值为 start + (end - start) * t，可被TimeManager批量求值
+    linear = True
+    
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.delta = end - start
+        
+    def __call__(self, t: float):
+        return self.start + self.delta * t
+
+
+class AngleInterpolator(ScalarInterpolator):
+    """角度插值器：沿最短方向旋转（终点角度按2π取模到与起点相差不超过π）"""
+    
+    def __init__(self, start, end):
+        delta = math.remainder(float(end) - float(start), 2.0 * math.pi)
+        super().__init__(float(start), float(start) + delta)
+
+
+class ArrayInterpolator:
+    """数组插值器（位置、缩放等向量和顶点数组）
+    
+    按起止值的公共精度计算（float32向量仍为float32）。调用时返回新的值，类型与起始值一致
+    （元组、列表或数组），可以安全地保存在任意对象上；evaluate把结果写入预先分配的缓冲，
+    每帧不分配新数组，返回的缓冲在下一次求值时被覆盖，只用于会复制数值的目标（TransformStore）
+    """
+    
+    linear = True
+    
+    def __init__(self, start, end):
+        # 元组、列表起始值的结果转换回原来的类型
+        self.kind = type(start) if isinstance(start, (tuple, list)) else None
+        start = np.asarray(start)
+        end = np.asarray(end)
+        dtype = np.result_type(start, end, np.float32)
+        self.start = start.astype(dtype)
+        self.end = end.astype(dtype)
+        if self.start.shape != self.end.shape:
+            raise ValueError(f"起止值形状不一致: {self.start.shape} 与 {self.end.shape}")
+        self.delta = self.end - self.start
+        self.out = np.empty_like(self.start)
+        
+    def evaluate(self, t: float) -> np.ndarray:
+        np.multiply(self.delta, t, out=self.out)
+        np.add(self.start, self.out, out=self.out)
+        return self.out
+        
+    def __call__(self, t: float):
+        value = self.evaluate(t)
+        return self.kind(value.tolist()) if self.kind is not None else value.copy()
+
+
+class ColorInterpolator(ArrayInterpolator):
+    """RGB/RGBA颜色插值器：元组按双精度插值（与逐分量的Python运算结果一致），结果与起始值同类型"""
+    
+    def __init__(self, start, end):
+        kind = type(start) if isinstance(start, (tuple, list)) else None
+        super().__init__(np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64))
+        self.kind = kind
+
+
+def _is_number_sequence(value) -> bool:
+    return isinstance(value, (tuple, list)) and all(isinstance(x, numbers.Real) for x in value)
+
+
+def _is_color(value) -> bool:
+    return _is_number_sequence(value) and len(value) in (3, 4)
+
+
+# 插值器注册表：(类型或判断函数, 插值器工厂)，靠前的优先
+_INTERPOLATORS = [
+    (numbers.Real, ScalarInterpolator),
+    (np.ndarray, ArrayInterpolator),
+    (_is_color, ColorInterpolator),
+    (_is_number_sequence, ArrayInterpolator),
+]
+
+
+def register_interpolator(kind, factory: Callable):
+    """注册插值器
+    
+    Args:
+        kind: 起始值的类型，或接受起始值、返回是否适用的函数
+        factory: factory(start, end) 返回插值器，插值器以缓动后的进度t调用，返回当前值
+        
+    后注册的插值器优先于已有的（包括内置的）
+    """
+    _INTERPOLATORS.insert(0, (kind, factory))
+
+
+def resolve_interpolator(start, end):
+    """为起止值选择插值器（在动画开始时调用一次）"""
+    for kind, factory in _INTERPOLATORS:
+        if isinstance(kind, type):
+            if isinstance(start, kind):
+                return factory(start, end)
+        elif kind(start):
+            return factory(start, end)
+    raise TypeError(f"没有适用于 {type(start).__name__} 的插值器，可用register_interpolator注册")
+
+
 class Animation:
     """基础动画类"""
     
@@ -68,7 +307,8 @@ class Animation:
         start_value: Any,  # 起始值
         end_value: Any,  # 结束值
         duration: float,  # 持续时间（秒）
-        ease_func: Callable[[float], float] = EaseFunction.ease_in_out
+        ease_func: Callable[[float], float] = EaseFunction.ease_in_out,
+        interpolator: Optional[Callable] = None  # 插值器工厂，为None时按起始值的类型从注册表选择
     ):
         self.target = target
         self.attribute = attribute
@@ -76,16 +316,24 @@ class Animation:
         self.end_value = end_value
         self.duration = duration
         self.ease_func = ease_func
+        self.interpolator = interpolator
+        # 开始时选定的插值器，以及seek实际调用的求值函数
+        self._interpolate = None
+        self._evaluate = None
         
         # 动画状态
         self.start_time = None
         self.is_finished = False
         self.is_started = False
         
-    def start(self):
-        """开始动画"""
+    def start(self, current_time: Optional[float] = None):
+        """开始动画
+        
+        Args:
+            current_time: 开始时刻（秒），为None时读取实时时钟
+        """
         if not self.is_started:
-            self.start_time = time.time()
+            self.start_time = time.perf_counter() if current_time is None else current_time
             self.is_started = True
             # 如果起始值为None，则获取当前值
             if self.start_value is None:
@@ -93,37 +341,59 @@ class Animation:
                 # 对于numpy数组，创建副本
                 if hasattr(self.start_value, 'copy'):
                     self.start_value = self.start_value.copy()
+            self._resolve_interpolator()
+            
+    def _resolve_interpolator(self):
+        """按起止值选定插值器，之后每帧直接调用"""
+        factory = self.interpolator or resolve_interpolator
+        self._interpolate = factory(self.start_value, self.end_value)
+        # TransformStore的属性赋值会复制数值，可以直接传入插值器的缓冲；其他目标保存独立的值
+        self._evaluate = self._interpolate
+        view = _store_view(self)
+        if self.attribute in _STORE_COLUMNS and getattr(view, '_store', None) is not None and hasattr(self._interpolate, 'evaluate'):
+            self._evaluate = self._interpolate.evaluate
             
-    def update(self) -> bool:
-        """更新动画，返回是否完成"""
+    def update(self, current_time: Optional[float] = None) -> bool:
+        """更新动画，返回是否完成
+        
+        Args:
+            current_time: 当前时刻（秒），需与start使用同一时钟，为None时读取实时时钟
+        """
         if not self.is_started or self.is_finished:
             return self.is_finished
             
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.perf_counter()
+        if current_time - self.start_time >= self.duration:
+            # 动画完成
+            self.is_finished = True
+        self.seek(current_time)
+        
+        return self.is_finished
+        
+    def seek(self, current_time: float):
+        """把目标设为动画在current_time时刻的值，不改变动画状态（用于时间线随机访问）"""
         elapsed_time = current_time - self.start_time
         
         # 计算进度
         if elapsed_time >= self.duration:
-            # 动画完成
             progress = 1.0
-            self.is_finished = True
         else:
-            progress = elapsed_time / self.duration
+            progress = max(elapsed_time / self.duration, 0.0)
             
         # 应用缓动函数
         eased_progress = self.ease_func(progress)
         
         # 插值并设置值
-        current_value = lerp(self.start_value, self.end_value, eased_progress)
-        setattr(self.target, self.attribute, current_value)
-        
-        return self.is_finished
+        setattr(self.target, self.attribute, self._evaluate(eased_progress))
         
     def reset(self):
         """重置动画"""
         self.start_time = None
         self.is_finished = False
         self.is_started = False
+        self._interpolate = None
+        self._evaluate = None
 
 
 class TransformAnimation(Animation):
@@ -136,16 +406,17 @@ class TransformAnimation(Animation):
         start_value: Any,
         end_value: Any,
         duration: float,
-        ease_func: Callable[[float], float] = EaseFunction.ease_in_out
+        ease_func: Callable[[float], float] = EaseFunction.ease_in_out,
+        interpolator: Optional[Callable] = None
     ):
         self.target_object = target_object
         self.transform_type = transform_type
-        super().__init__(target_object.transform, transform_type, start_value, end_value, duration, ease_func)
+        super().__init__(target_object.transform, transform_type, start_value, end_value, duration, ease_func, interpolator)
         
-    def start(self):
+    def start(self, current_time: Optional[float] = None):
         """开始动画 - 重写以确保正确获取起始值"""
         if not self.is_started:
-            self.start_time = time.time()
+            self.start_time = time.perf_counter() if current_time is None else current_time
             self.is_started = True
             # 确保起始值类型正确
             current_value = getattr(self.target, self.attribute)
@@ -155,6 +426,7 @@ class TransformAnimation(Animation):
             else:
                 # position和scale是向量
                 self.start_value = current_value.copy() if hasattr(current_value, 'copy') else current_value
+            self._resolve_interpolator()
 
 
 class ColorAnimation(Animation):
@@ -166,43 +438,428 @@ class ColorAnimation(Animation):
         start_color: tuple,
         end_color: tuple,
         duration: float,
-        ease_func: Callable[[float], float] = EaseFunction.ease_in_out
+        ease_func: Callable[[float], float] = EaseFunction.ease_in_out,
+        interpolator: Optional[Callable] = None
     ):
-        super().__init__(target, 'color', start_color, end_color, duration, ease_func)
+        super().__init__(target, 'color', start_color, end_color, duration, ease_func, interpolator)
+
+
+class MorphAnimation(Animation):
+    """顶点变形动画 - 把三角形变为目标形状（类似ManimGL的Transform）
+    
+    一个动画可以同时变形任意多个三角形，所有对象共享同一个进度。起止顶点相同的对象分为一组：
+    CPU路径每组每帧只插值一次，组内对象共享结果；Scene.play在实例化渲染路径下把起止顶点
+    只上传一次，每组一次实例化绘制，由着色器按进度uniform混合，变形期间不写回顶点
+    """
+    
+    def __init__(self, targets, target_vertices, duration: float = 1.0, ease_func: Callable[[float], float] = EaseFunction.ease_in_out):
+        """
+        Args:
+            targets: 三角形或三角形列表
+            target_vertices: 目标形状：(3,3)顶点或三角形（所有对象变为同一形状），或与targets等长的列表
+        """
+        self.targets = list(targets) if isinstance(targets, (list, tuple)) else [targets]
+        super().__init__(self.targets, 'original_vertices', None, _morph_meshes(target_vertices, len(self.targets)), duration, ease_func)
+        # 缓动后的当前进度；gpu为True时只更新进度，由渲染器混合顶点
+        self.progress = 0.0
+        self.gpu = False
+        self.sources: List[np.ndarray] = []
+        self.groups = []
+        
+    def start(self, current_time: Optional[float] = None):
+        """开始变形：记录各对象当前的顶点，按起止顶点分组"""
+        if not self.is_started:
+            self.start_time = time.perf_counter() if current_time is None else current_time
+            self.is_started = True
+            # 顶点数组是只读共享的，直接记录引用
+            self.sources = [target.original_vertices for target in self.targets]
+            # 逐个指定的目标形状按内容分组，相同形状的对象共享一次混合和一次绘制
+            groups = {}
+            destination_keys = {}
+            for index, (source, destination) in enumerate(zip(self.sources, self.end_value)):
+                destination_key = destination_keys.get(id(destination))
+                if destination_key is None:
+                    destination_key = destination_keys[id(destination)] = destination.tobytes()
+                group = groups.get((id(source), destination_key))
+                if group is None:
+                    groups[id(source), destination_key] = group = (source, destination, [])
+                group[2].append(index)
+            self.groups = list(groups.values())
+            
+    def seek(self, current_time: float):
+        """设为current_time时刻的形状（GPU混合时只更新进度，结束时写回目标顶点）"""
+        elapsed_time = current_time - self.start_time
+        progress = 1.0 if elapsed_time >= self.duration else max(elapsed_time / self.duration, 0.0)
+        self.progress = self.ease_func(progress)
+        if not self.gpu or self.is_finished:
+            self.apply(self.progress)
+            
+    def apply(self, progress: float):
+        """在CPU上把各组顶点混合到progress并赋给对象"""
+        for source, destination, indices in self.groups:
+            if progress == 1.0:
+                mesh = destination
+            elif progress == 0.0:
+                mesh = source
+            else:
+                mesh = _as_mesh(source + (destination - source) * np.float32(progress))
+            for index in indices:
+                self.targets[index].original_vertices = mesh
+                
+    def reset(self):
+        """重置动画"""
+        super().reset()
+        self.progress = 0.0
+        self.gpu = False
+
+
+def _morph_meshes(target_vertices, count: int) -> List[np.ndarray]:
+    """变形目标：每个对象一个只读顶点数组，同一形状共享同一个数组"""
+    vertices = getattr(target_vertices, 'original_vertices', target_vertices)
+    if isinstance(vertices, np.ndarray) and vertices.ndim == 3:
+        vertices = list(vertices)
+    if isinstance(vertices, (list, tuple)) and vertices and (hasattr(vertices[0], 'original_vertices') or np.shape(vertices[0]) == (3, 3)):
+        if len(vertices) != count:
+            raise ValueError(f"目标形状数量 {len(vertices)} 与对象数量 {count} 不一致")
+        return [_as_mesh(getattr(mesh, 'original_vertices', mesh)) for mesh in vertices]
+    return [_as_mesh(vertices)] * count
+
+
+class AnimationGroup(Animation):
+    """动画组 - 子动画按lag_ratio错开开始
+    
+    第i+1个子动画在第i个开始后 lag_ratio * 第i个的时长 开始：lag_ratio=0时同时开始，
+    1时依次播放。子动画可以是嵌套的动画组。TimeManager按开始时刻把子动画放入优先队列，
+    到时才启动（此时读取起始值），每帧只更新已开始且未完成的子动画
+    """
+    
+    def __init__(self, *animations: Animation, lag_ratio: float = 0.0):
+        if len(animations) == 1 and isinstance(animations[0], (list, tuple)):
+            animations = animations[0]
+        self.animations: List[Animation] = list(animations)
+        self.lag_ratio = lag_ratio
+        # 各子动画相对于组开始的时刻
+        self.offsets: List[float] = []
+        offset = 0.0
+        duration = 0.0
+        for animation in self.animations:
+            self.offsets.append(offset)
+            duration = max(duration, offset + animation.duration)
+            offset += lag_ratio * animation.duration
+        super().__init__(None, None, None, None, duration, EaseFunction.linear)
+        
+    def start(self, current_time: Optional[float] = None):
+        """开始动画组（子动画到各自的开始时刻才启动）"""
+        if not self.is_started:
+            self.start_time = time.perf_counter() if current_time is None else current_time
+            self.is_started = True
+            
+    def schedule(self, start_time: float):
+        """展开嵌套的动画组，依次产生 (开始时刻, 子动画)"""
+        for offset, animation in zip(self.offsets, self.animations):
+            if isinstance(animation, AnimationGroup):
+                yield from animation.schedule(start_time + offset)
+            else:
+                yield start_time + offset, animation
+                
+    def seek(self, current_time: float):
+        """把已到开始时刻的子动画设为current_time时刻的值（不经过TimeManager单独使用时）"""
+        for start_time, animation in self.schedule(self.start_time):
+            if start_time <= current_time + _TIME_EPSILON:
+                animation.start(start_time)
+                animation.seek(current_time)
+                
+    def finish(self):
+        """标记动画组及嵌套的动画组已完成"""
+        self.is_finished = True
+        for animation in self.animations:
+            if isinstance(animation, AnimationGroup):
+                animation.finish()
+                
+    def reset(self):
+        """重置动画组和所有子动画"""
+        super().reset()
+        for animation in self.animations:
+            animation.reset()
+
+
+class Succession(AnimationGroup):
+    """依次播放：每个子动画在上一个结束时开始"""
+    
+    def __init__(self, *animations: Animation):
+        super().__init__(*animations, lag_ratio=1.0)
+
+
+class LaggedStart(AnimationGroup):
+    """错开开始：每个子动画在上一个开始后 lag_ratio * 其时长 开始"""
+    
+    def __init__(self, *animations: Animation, lag_ratio: float = 0.05):
+        super().__init__(*animations, lag_ratio=lag_ratio)
+
+
+# 可批量求值的属性：属性名 -> (TransformStore中的列, 每个值的分量数，0表示标量)
+_STORE_COLUMNS = {
+    'position': ('positions', 3),
+    'rotation': ('rotations', 0),
+    'scale': ('scales', 3),
+    'color': ('colors', 3),
+}
+
+
+class _AnimationBatch:
+    """一组作用于同一存储、同一属性、同一缓动函数的动画
+    
+    起止值、开始时间和时长打包为数组，每帧一次NumPy运算求出所有进度、缓动和插值，
+    结果直接写入存储的对应列
+    """
+    
+    def __init__(self, store, column: str, size: int, ease_func: Callable, dtype, animations: List[Animation]):
+        self.store = store
+        self.column = column
+        self.ease_func = ease_func
+        self.dtype = dtype
+        self.layout_version = store.layout_version
+        self.animations = animations
+        shape = (len(animations), size) if size else (len(animations),)
+        self.rows = np.fromiter((_store_view(animation)._row for animation in animations), dtype=np.intp, count=len(animations))
+        self.start_values = np.array([animation._interpolate.start for animation in animations], dtype=dtype).reshape(shape)
+        self.deltas = np.array([animation._interpolate.end for animation in animations], dtype=dtype).reshape(shape) - self.start_values
+        self.start_times = np.array([animation.start_time for animation in animations], dtype=np.float64)
+        self.durations = np.array([animation.duration for animation in animations], dtype=np.float64)
+        
+    def __len__(self) -> int:
+        return len(self.animations)
+        
+    def extend(self, other: '_AnimationBatch'):
+        """合并同一分组键的另一批动画"""
+        self.animations = self.animations + other.animations
+        self.rows = np.concatenate([self.rows, other.rows])
+        self.start_values = np.concatenate([self.start_values, other.start_values])
+        self.deltas = np.concatenate([self.deltas, other.deltas])
+        self.start_times = np.concatenate([self.start_times, other.start_times])
+        self.durations = np.concatenate([self.durations, other.durations])
+        
+    def evaluate(self, current_time: float, active: Optional[np.ndarray] = None) -> np.ndarray:
+        """求出current_time时刻的值并写入存储，返回各动画是否已完成
+        
+        active为布尔掩码时只求值选中的动画，其余的行保持不变（返回值也只对应选中的动画）
+        """
+        rows, start_values, deltas = self.rows, self.start_values, self.deltas
+        start_times, durations = self.start_times, self.durations
+        if active is not None:
+            rows, start_values, deltas = rows[active], start_values[active], deltas[active]
+            start_times, durations = start_times[active], durations[active]
+        elapsed = current_time - start_times
+        finished = elapsed >= durations
+        progress = np.where(finished, 1.0, np.maximum(elapsed / np.maximum(durations, 1e-12), 0.0))
+        eased = np.asarray(self.ease_func(progress), dtype=self.dtype)
+        if deltas.ndim == 2:
+            eased = eased[:, None]
+        getattr(self.store, self.column)[rows] = start_values + deltas * eased
+        self.store.touch(rows)
+        return finished
+        
+    def update(self, current_time: float) -> List[Animation]:
+        """求值并写入存储，返回本帧完成的动画"""
+        finished = self.evaluate(current_time)
+        if not finished.any():
+            return []
+        done = [self.animations[i] for i in np.flatnonzero(finished)]
+        for animation in done:
+            animation.is_finished = True
+        keep = ~finished
+        self.animations = [self.animations[i] for i in np.flatnonzero(keep)]
+        self.rows = self.rows[keep]
+        self.start_values = self.start_values[keep]
+        self.deltas = self.deltas[keep]
+        self.start_times = self.start_times[keep]
+        self.durations = self.durations[keep]
+        return done
+
+
+def _store_view(animation: Animation):
+    """动画目标在TransformStore中的行视图（Transform），没有时返回None"""
+    target = animation.target
+    return getattr(target, '_transform', None) if animation.attribute == 'color' else target
+
+
+def _batch_key(animation: Animation):
+    """可批量求值的动画返回分组键 (存储, 属性, 缓动函数, 计算精度)，否则返回None"""
+    if type(animation) not in (TransformAnimation, ColorAnimation) or not getattr(animation.ease_func, 'array_ease', False):
+        return None
+    # 只有线性插值器可以用数组运算代替
+    interpolator = animation._interpolate
+    if not getattr(interpolator, 'linear', False):
+        return None
+    column = _STORE_COLUMNS.get(animation.attribute)
+    view = _store_view(animation)
+    if column is None or getattr(view, '_store', None) is None:
+        return None
+    # 起止值的形状必须与列一致
+    expected = (column[1],) if column[1] else ()
+    if np.shape(interpolator.start) != expected or np.shape(interpolator.end) != expected:
+        return None
+    # 与逐个插值使用相同的精度，结果完全一致
+    dtype = np.result_type(np.asarray(interpolator.start), np.asarray(interpolator.end))
+    return (view._store, animation.attribute, animation.ease_func, dtype)
+
+
+def _group_animations(animations: List[Animation]):
+    """按批量分组键分组，返回 ({键: 动画列表}, 不能批量求值的动画列表)"""
+    groups = {}
+    scalar = []
+    for animation in animations:
+        key = _batch_key(animation)
+        if key is None:
+            scalar.append(animation)
+        else:
+            groups.setdefault(key, []).append(animation)
+    return groups, scalar
+
+
+def _make_batch(key, animations: List[Animation]) -> _AnimationBatch:
+    """由分组键和（已启动的）动画创建批量组"""
+    store, attribute, ease_func, dtype = key
+    column, size = _STORE_COLUMNS[attribute]
+    return _AnimationBatch(store, column, size, ease_func, dtype, animations)
 
 
 class TimeManager:
-    """时间管理器 - 管理所有动画的播放"""
+    """时间管理器 - 管理所有动画的播放
     
-    def __init__(self):
+    作用于TransformStore中对象的位置、旋转、缩放和颜色动画按 (存储, 属性, 缓动) 分组，
+    每组每帧一次数组运算；其余动画逐个更新。动画组的子动画按开始时刻放入优先队列，
+    到时才启动，每帧的开销只与正在播放的动画数量有关。
+    已在播放的动画先于本帧新启动的动画求值，新动画读取的起始值是本帧的状态。
+    """
+    
+    def __init__(self, clock=None):
+        """初始化时间管理器
+        
+        Args:
+            clock: 时钟对象（WallClock或FrameClock），为None时使用实时时钟
+        """
+        self.clock = clock if clock is not None else WallClock()
         self.animations: List[Animation] = []
         self.finished_animations: List[Animation] = []
+        # 尚未启动或需要重新分组的动画、批量求值的分组和逐个更新的动画
+        self._pending: List[Animation] = []
+        self._batches = {}
+        self._scalar: List[Animation] = []
+        # 等待开始的子动画：(开始时刻, 序号, 动画) 的最小堆
+        self._scheduled = []
+        self._sequence = itertools.count()
+        # 子动画 -> 所属的顶层动画组，动画组 -> 未完成的子动画数
+        self._owners = {}
+        self._remaining = {}
         
     def add_animation(self, animation: Animation):
-        """添加动画到队列"""
+        """添加动画（或动画组）到队列"""
         self.animations.append(animation)
+        self._pending.append(animation)
         
     def start_all(self):
         """启动所有动画"""
+        current_time = self.clock.time()
         for animation in self.animations:
-            animation.start()
+            animation.start(current_time)
             
     def update(self):
-        """更新所有动画"""
-        active_animations = []
-        
-        for animation in self.animations:
-            if not animation.is_started:
-                animation.start()
+        """更新所有动画（每帧只采样一次时钟）"""
+        current_time = self.clock.time()
+        for key, batch in list(self._batches.items()):
+            # 成员迁出存储或存储被整理后行号失效，重新分组
+            if batch.layout_version != batch.store.layout_version:
+                del self._batches[key]
+                self._pending.extend(batch.animations)
                 
-            finished = animation.update()
-            
-            if finished:
-                self.finished_animations.append(animation)
-            else:
-                active_animations.append(animation)
+        finished = []
+        for key, batch in list(self._batches.items()):
+            finished.extend(batch.update(current_time))
+            if not batch:
+                del self._batches[key]
                 
-        self.animations = active_animations
+        if self._scalar:
+            active = []
+            for animation in self._scalar:
+                if animation.update(current_time):
+                    finished.append(animation)
+                else:
+                    active.append(animation)
+            self._scalar = active
+            
+        self._release(current_time)
+        if self._pending:
+            finished.extend(self._start_pending(current_time))
+        if finished:
+            self._finish(finished)
+            
+    def _release(self, current_time: float):
+        """启动已到开始时刻的子动画"""
+        scheduled = self._scheduled
+        while scheduled and scheduled[0][0] <= current_time + _TIME_EPSILON:
+            start_time, _, animation = heapq.heappop(scheduled)
+            animation.start(start_time)
+            self._pending.append(animation)
+            
+    def _start_pending(self, current_time: float) -> List[Animation]:
+        """启动新动画，求出本帧的值并分配到批量分组或逐个更新的列表，返回已完成的动画"""
+        finished = []
+        while self._pending:
+            pending, self._pending = self._pending, []
+            animations = []
+            for animation in pending:
+                animation.start(current_time)
+                if isinstance(animation, AnimationGroup):
+                    self._schedule(animation)
+                else:
+                    animations.append(animation)
+            # 偏移为0的子动画在本帧启动
+            self._release(current_time)
+            
+            groups, scalar = _group_animations(animations)
+            for key, animations in groups.items():
+                batch = _make_batch(key, animations)
+                finished.extend(batch.update(current_time))
+                if not batch:
+                    continue
+                existing = self._batches.get(key)
+                if existing is None:
+                    self._batches[key] = batch
+                else:
+                    existing.extend(batch)
+            for animation in scalar:
+                if animation.update(current_time):
+                    finished.append(animation)
+                else:
+                    self._scalar.append(animation)
+        return finished
+        
+    def _schedule(self, group: 'AnimationGroup'):
+        """把动画组的子动画按开始时刻放入优先队列"""
+        count = 0
+        for start_time, animation in group.schedule(group.start_time):
+            heapq.heappush(self._scheduled, (start_time, next(self._sequence), animation))
+            self._owners[animation] = group
+            count += 1
+        if count:
+            self._remaining[group] = count
+        else:
+            group.finish()
+            
+    def _finish(self, finished: List[Animation]):
+        """记录完成的动画，所有子动画都完成时动画组完成"""
+        for animation in list(finished):
+            group = self._owners.pop(animation, None)
+            if group is None:
+                continue
+            self._remaining[group] -= 1
+            if not self._remaining[group]:
+                del self._remaining[group]
+                group.finish()
+                finished.append(group)
+        self.finished_animations.extend(finished)
+        self.animations = [animation for animation in self.animations if not animation.is_finished]
         
     def is_all_finished(self) -> bool:
         """检查是否所有动画都完成了"""
@@ -212,10 +869,20 @@ class TimeManager:
         """清空所有动画"""
         self.animations.clear()
         self.finished_animations.clear()
+        self._pending.clear()
+        self._batches.clear()
+        self._scalar.clear()
+        self._scheduled.clear()
+        self._owners.clear()
+        self._remaining.clear()
         
     def get_active_count(self) -> int:
         """获取活跃动画数量"""
         return len(self.animations)
+        
+    def get_playing_count(self) -> int:
+        """获取正在播放（已开始、未完成）的动画数量"""
+        return sum(len(batch) for batch in self._batches.values()) + len(self._scalar)
 
 
 # 便捷的动画创建函数
@@ -227,10 +894,11 @@ def move_to(target, end_pos: tuple, duration: float = 1.0, ease_func: Callable =
     return TransformAnimation(target, 'position', None, end_pos_array, duration, ease_func)
 
 
-def rotate_to(target, end_rotation: float, duration: float = 1.0, ease_func: Callable = EaseFunction.ease_in_out):
-    """旋转动画"""
+def rotate_to(target, end_rotation: float, duration: float = 1.0, ease_func: Callable = EaseFunction.ease_in_out, shortest_path: bool = False):
+    """旋转动画（shortest_path为True时沿最短方向转到等价角度）"""
     # 起始值将在动画开始时自动获取
-    return TransformAnimation(target, 'rotation', None, float(end_rotation), duration, ease_func)
+    interpolator = AngleInterpolator if shortest_path else None
+    return TransformAnimation(target, 'rotation', None, float(end_rotation), duration, ease_func, interpolator)
 
 
 def scale_to(target, end_scale: float, duration: float = 1.0, ease_func: Callable = EaseFunction.ease_in_out):
@@ -246,6 +914,11 @@ def color_to(target, end_color: tuple, duration: float = 1.0, ease_func: Callabl
     return ColorAnimation(target, start_color, end_color, duration, ease_func)
 
 
+def morph_to(targets, target_vertices, duration: float = 1.0, ease_func: Callable = EaseFunction.ease_in_out):
+    """顶点变形动画（targets可以是三角形列表，批量变形）"""
+    return MorphAnimation(targets, target_vertices, duration, ease_func)
+
+
 if __name__ == "__main__":
     # 测试代码
     print("动画系统测试:")
@@ -255,7 +928,7 @@ if __name__ == "__main__":
         def __init__(self):
             self.value = 0.0
             self.color = (1.0, 0.0, 0.0)
-    
+            
     test_obj = TestObject()
     
     # 创建动画
@@ -276,6 +949,6 @@ if __name__ == "__main__":
         elapsed = time.time() - start_time
         print(f"时间: {elapsed:.2f}s, 值: {test_obj.value:.2f}, 颜色: ({test_obj.color[0]:.2f}, {test_obj.color[1]:.2f}, {test_obj.color[2]:.2f})")
         time.sleep(0.1)
-    
+        
     print(f"最终值: {test_obj.value}, 最终颜色: {test_obj.color}")
     print("动画系统测试完成!")
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Mini Animation Engine MVP - Clock Module
+时钟系统，包括实时预览时钟和离线导出用的逐帧虚拟时钟
+"""
+import time
+
+# 时间比较的容差，避免逐帧时钟的浮点误差多渲染一帧
+_TIME_EPSILON = 1e-9
+
+
+class WallClock:
+    """实时时钟 - 预览时使用，读取系统单调时钟"""
+    
+    # 是否与真实时间同步（决定是否需要帧率限制）
+    realtime = True
+    
+    def time(self) -> float:
+        """当前时间（秒）"""
+        return time.perf_counter()
+        
+    def tick(self):
+        """推进一帧（实时时钟由真实时间驱动，无需操作）"""
+        pass
+
+
+class FrameClock:
+    """逐帧虚拟时钟 - 每帧精确前进1/fps秒，与真实耗时无关
+    
+    用于离线导出：动画时序完全确定，渲染速度只受硬件限制
+    """
+    
+    realtime = False
+    
+    def __init__(self, fps: float = 60.0):
+        self.fps = fps
+        self.frame = 0
+        
+    def time(self) -> float:
+        """当前时间（秒）"""
+        return self.frame / self.fps
+        
+    def tick(self):
+        """推进一帧"""
+        self.frame += 1
+        
+    def reset(self):
+        """回到第0帧"""
+        self.frame = 0
+        
+    def seek(self, t: float):
+        """定位到t时刻（时间线随机访问）；t不在帧边界上时frame为小数"""
+        frame = round(t * self.fps)
+        self.frame = frame if abs(frame - t * self.fps) < 1e-6 else t * self.fps
+
+
+if __name__ == "__main__":
+    # 测试代码
+    print("时钟系统测试:")
+    
+    clock = FrameClock(fps=30)
+    for _ in range(30):
+        clock.tick()
+    print(f"30帧后的虚拟时间: {clock.time():.3f}s")
+    
+    wall_clock = WallClock()
+    start = wall_clock.time()
+    time.sleep(0.1)
+    print(f"实时时钟经过: {wall_clock.time() - start:.3f}s")
+    
+    print("时钟系统测试完成!")
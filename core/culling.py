@@ -0,0 +1,149 @@
+"""
+Mini Animation Engine MVP - Culling Module
+视锥剔除：对象包围盒的均匀网格空间索引，只绘制与画面相交的对象
+"""
+from typing import Dict, Tuple
+import numpy as np
+
+
+def frame_bounds(projection_matrix: np.ndarray) -> Tuple[float, float, float, float]:
+    """正交投影下画面在世界坐标中的范围 (xmin, ymin, xmax, ymax)"""
+    inverse = np.linalg.inv(np.asarray(projection_matrix, dtype=np.float64))
+    corners = inverse @ np.array([[-1, -1, 0, 1], [1, -1, 0, 1], [-1, 1, 0, 1], [1, 1, 0, 1]], dtype=np.float64).T
+    xy = corners[:2] / corners[3]
+    return (float(xy[0].min()), float(xy[1].min()), float(xy[0].max()), float(xy[1].max()))
+
+
+def vertex_bounds(vertices: np.ndarray) -> np.ndarray:
+    """(N,3,3)变换后顶点的二维包围盒 (N,4)：[xmin, ymin, xmax, ymax]"""
+    a, b, c = vertices[:, 0, :2], vertices[:, 1, :2], vertices[:, 2, :2]
+    # 逐个顶点比较比沿顶点轴的min/max归约快得多
+    return np.concatenate([np.minimum(np.minimum(a, b), c), np.maximum(np.maximum(a, b), c)], axis=1)
+
+
+class SpatialGrid:
+    """包围盒的均匀网格索引
+    
+    每个槽位（场景绘制顺序中的下标）按包围盒登记到覆盖的格子中，跨越格子过多的大对象单独记录、
+    总是作为候选。update只重新登记格子范围发生变化的槽位：在格子内移动的对象不修改网格。
+    query先取出与矩形相交的格子中的候选，再用包围盒精确判断；矩形覆盖大部分对象时直接判断全部包围盒。
+    一次更新大部分槽位时（几乎所有对象都在运动）不逐个重新登记，索引标记为失效，查询直接判断
+    全部包围盒，之后回到少量更新时重建一次。
+    """
+    
+    # 单个对象最多登记的格子数，超过时作为大对象
+    MAX_CELLS = 16
+    # 一次更新的槽位超过该比例时使索引失效
+    BULK_FRACTION = 0.25
+    
+    def __init__(self, cell_size: float = 1.0):
+        self.cell_size = cell_size
+        # 格子键 -> 槽位集合
+        self._cells: Dict[int, set] = {}
+        self._large = set()
+        # 各槽位的包围盒，以及登记的格子范围 [x0, y0, x1, y1]
+        self.bounds = np.zeros((0, 4), dtype=np.float32)
+        self._ranges = np.zeros((0, 4), dtype=np.int64)
+        self._stale = False
+        # 包围盒的修改计数，查询结果据此缓存
+        self.version = 0
+        
+    def __len__(self) -> int:
+        return len(self.bounds)
+        
+    def _cell_ranges(self, bounds: np.ndarray) -> np.ndarray:
+        ranges = np.floor(np.asarray(bounds, dtype=np.float64) / self.cell_size)
+        return np.clip(ranges, -(1 << 30), (1 << 30) - 1).astype(np.int64)
+        
+    @staticmethod
+    def _key(x, y):
+        return (x << 32) + (y + (1 << 31))
+        
+    def rebuild(self, bounds: np.ndarray):
+        """按包围盒 (N,4) 重新建立索引，槽位为0..N-1"""
+        self.bounds = np.array(bounds, dtype=np.float32).reshape(-1, 4)
+        ranges = self._ranges = self._cell_ranges(self.bounds)
+        self._cells = {}
+        self._large = set()
+        self._stale = False
+        # 只占一个格子的对象（通常是大多数）按格子键排序后整段登记
+        single = (ranges[:, 0] == ranges[:, 2]) & (ranges[:, 1] == ranges[:, 3])
+        slots = np.flatnonzero(single)
+        keys = self._key(ranges[slots, 0], ranges[slots, 1])
+        order = np.argsort(keys, kind='stable')
+        keys, slots = keys[order], slots[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else keys
+        for key, group in zip(keys[starts].tolist(), np.split(slots, starts[1:])):
+            self._cells[key] = set(group.tolist())
+        for slot in np.flatnonzero(~single).tolist():
+            self._insert(slot, ranges[slot])
+        self.version += 1
+        
+    def update(self, slots: np.ndarray, bounds: np.ndarray):
+        """更新部分槽位的包围盒"""
+        slots = np.asarray(slots, dtype=np.intp)
+        if not len(slots):
+            return
+        self.bounds[slots] = bounds
+        self.version += 1
+        if len(slots) > self.BULK_FRACTION * len(self.bounds):
+            self._stale = True
+            return
+        if self._stale:
+            self.rebuild(self.bounds)
+            return
+        ranges = self._cell_ranges(self.bounds[slots])
+        moved = np.flatnonzero(np.any(ranges != self._ranges[slots], axis=1))
+        for index in moved.tolist():
+            slot = int(slots[index])
+            self._discard(slot, self._ranges[slot])
+            self._insert(slot, ranges[index])
+        self._ranges[slots] = ranges
+        
+    def _cells_of(self, cell_range):
+        x0, y0, x1, y1 = (int(value) for value in cell_range)
+        return [self._key(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+        
+    def _insert(self, slot: int, cell_range):
+        x0, y0, x1, y1 = cell_range
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS:
+            self._large.add(slot)
+            return
+        cells = self._cells
+        for key in self._cells_of(cell_range):
+            group = cells.get(key)
+            if group is None:
+                cells[key] = group = set()
+            group.add(slot)
+            
+    def _discard(self, slot: int, cell_range):
+        x0, y0, x1, y1 = cell_range
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS:
+            self._large.discard(slot)
+            return
+        cells = self._cells
+        for key in self._cells_of(cell_range):
+            group = cells.get(key)
+            if group is not None:
+                group.discard(slot)
+                if not group:
+                    del cells[key]
+                    
+    def query(self, rect: Tuple[float, float, float, float]) -> np.ndarray:
+        """包围盒与矩形 (xmin, ymin, xmax, ymax) 相交的槽位（升序）"""
+        x0, y0, x1, y1 = self._cell_ranges(rect).tolist()
+        cells = self._cells
+        # 矩形覆盖的格子数达到已占用格子数的一半时，索引不再明显减少候选，直接向量化判断所有包围盒
+        if self._stale or 2 * (x1 - x0 + 1) * (y1 - y0 + 1) >= len(cells):
+            slots = np.arange(len(self.bounds))
+        else:
+            candidates = set(self._large)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    group = cells.get(self._key(x, y))
+                    if group:
+                        candidates.update(group)
+            slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        bounds = self.bounds[slots]
+        hit = (bounds[:, 0] <= rect[2]) & (bounds[:, 2] >= rect[0]) & (bounds[:, 1] <= rect[3]) & (bounds[:, 3] >= rect[1])
+        return np.sort(slots[hit])
@@ -0,0 +1,250 @@
+"""
+Mini Animation Engine MVP - Export Module
+视频导出，包括异步帧回读和后台写入线程
+"""
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import zlib
+from typing import Optional
+import numpy as np
+
+
+# 交给ffmpeg编码的视频格式
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.mkv', '.webm', '.avi', '.gif')
+
+# 写线程队列中表示“重复上一帧”的标记
+_DUPLICATE = object()
+
+
+def write_png(path: str, frame: np.ndarray):
+    """将(H,W,3)的uint8数组写为PNG文件（仅依赖zlib）"""
+    height, width = frame.shape[:2]
+    # 每行前加过滤类型字节0（不过滤）
+    raw = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = frame.reshape(height, width * 3)
+    
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+        
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 3)))
+        f.write(chunk(b'IEND', b''))
+
+
+class _FFmpegWriter:
+    """通过管道将原始RGB帧交给本地ffmpeg进程编码"""
+    
+    def __init__(self, output: str, width: int, height: int, fps: float):
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("导出视频需要ffmpeg，请安装ffmpeg或改用PNG序列/原始帧格式")
+        self.process = subprocess.Popen(
+            [
+                ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                '-s', f'{width}x{height}', '-r', str(fps),
+                '-i', '-',
+                '-vf', 'vflip',  # OpenGL帧缓冲的第一行在底部
+                '-pix_fmt', 'yuv420p',
+                output,
+            ],
+            stdin=subprocess.PIPE,
+        )
+        
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(memoryview(frame).cast('B'))
+        
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg退出码: {self.process.returncode}")
+
+
+class _ImageSequenceWriter:
+    """写出PNG图片序列，output为包含帧号格式的路径，如 frames/frame_%05d.png"""
+    
+    def __init__(self, output: str):
+        self.pattern = output
+        self.index = 0
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+    def write(self, frame: np.ndarray):
+        write_png(self.pattern % self.index, frame[::-1])
+        self.index += 1
+        
+    def close(self):
+        pass
+
+
+class _RawWriter:
+    """将原始RGB帧（从上到下）依次写入单个文件"""
+    
+    def __init__(self, output: str):
+        self.file = open(output, 'wb')
+        
+    def write(self, frame: np.ndarray):
+        self.file.write(np.ascontiguousarray(frame[::-1]))
+        
+    def close(self):
+        self.file.close()
+
+
+def open_writer(output: str, width: int, height: int, fps: float):
+    """根据输出路径选择写出方式
+    
+    视频扩展名（.mp4等）使用ffmpeg编码；包含帧号格式（如 %05d）时写出PNG序列；
+    其他路径写出原始RGB帧。写入的帧均为OpenGL顺序（第一行在底部）
+    """
+    if output.lower().endswith(VIDEO_EXTENSIONS):
+        return _FFmpegWriter(output, width, height, fps)
+    if '%' in output:
+        return _ImageSequenceWriter(output)
+    return _RawWriter(output)
+
+
+class FrameExporter:
+    """帧导出器 - 将渲染结果流式写出
+    
+    每帧先异步回读到GPU端像素缓冲（双缓冲，下一帧渲染时上一帧的回读在进行），
+    再拷贝到预分配的NumPy缓冲，经有界队列交给写线程写入ffmpeg/PNG/原始帧文件。
+    写线程落后时capture会阻塞等待空闲缓冲，内存占用保持恒定。
+    """
+    
+    def __init__(self, renderer, output: str, fps: float = 60.0, queue_size: int = 8):
+        """初始化导出器
+        
+        Args:
+            renderer: 渲染器，从其帧缓冲读取画面
+            output: 输出路径。视频扩展名（.mp4等）使用ffmpeg编码；
+                    包含帧号格式（如 %05d）时写出PNG序列；其他路径写出原始RGB帧
+            fps: 帧率
+            queue_size: 等待写入的最大帧数
+        """
+        self.renderer = renderer
+        self.output = output
+        self.fps = fps
+        width, height = renderer.width, renderer.height
+        self.frame_shape = (height, width, 3)
+        self.frame_bytes = width * height * 3
+        
+        self._writer = open_writer(output, width, height, fps)
+        
+        # 预分配的帧缓冲池：写线程用完后归还
+        self._free_frames = queue.Queue()
+        for _ in range(queue_size + 1):
+            self._free_frames.put(np.empty(self.frame_shape, dtype=np.uint8))
+        self._pending_frames = queue.Queue(maxsize=queue_size)
+        
+        # 双缓冲的GPU像素缓冲（软件渲染器没有GPU上下文，直接同步回读）
+        if hasattr(renderer, 'ctx'):
+            self._pbos = [renderer.ctx.buffer(reserve=self.frame_bytes) for _ in range(2)]
+        else:
+            self._pbos = None
+        self._pending_pbo = None
+        
+        self.frame_count = 0
+        self.duplicate_count = 0
+        self._error: Optional[BaseException] = None
+        self._start_time = time.perf_counter()
+        self._elapsed = None
+        self._thread = threading.Thread(target=self._write_loop, name='FrameExporter', daemon=True)
+        self._thread.start()
+        
+    def _write_loop(self):
+        """写线程：从队列取帧写出，并把缓冲归还到空闲池
+        
+        最近写出的一帧暂不归还，以便重复写出未变化的画面
+        """
+        last_frame = None
+        while True:
+            frame = self._pending_frames.get()
+            if frame is None:
+                break
+            if frame is _DUPLICATE:
+                frame = last_frame
+            elif last_frame is not None:
+                self._free_frames.put(last_frame)
+            last_frame = frame
+            try:
+                if self._error is None:
+                    self._writer.write(frame)
+            except BaseException as error:
+                self._error = error
+        if last_frame is not None:
+            self._free_frames.put(last_frame)
+            
+    def _check_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"帧写入失败: {self._error}") from self._error
+            
+    def _submit(self, pbo):
+        """将像素缓冲中的帧拷贝到空闲NumPy缓冲并排队写出"""
+        frame = self._free_frames.get()
+        pbo.read_into(frame)
+        self._pending_frames.put(frame)
+        
+    def capture(self):
+        """捕获当前帧缓冲中的画面（需在present之前调用）"""
+        self._check_error()
+        if self._pbos is None:
+            frame = self._free_frames.get()
+            self.renderer.read_into(frame)
+            self._pending_frames.put(frame)
+            self.frame_count += 1
+            return
+            
+        pbo = self._pbos[self.frame_count % 2]
+        self.renderer.fbo.read_into(pbo, components=3, alignment=1)
+        
+        # 上一帧的回读此时已完成，交给写线程
+        if self._pending_pbo is not None:
+            self._submit(self._pending_pbo)
+        self._pending_pbo = pbo
+        self.frame_count += 1
+        
+    def duplicate(self):
+        """重复输出上一帧（画面未变化时无需重新渲染和回读）"""
+        self._check_error()
+        if self.frame_count == 0:
+            raise RuntimeError("还没有可重复的帧，请先调用capture")
+        if self._pending_pbo is not None:
+            self._submit(self._pending_pbo)
+            self._pending_pbo = None
+        self._pending_frames.put(_DUPLICATE)
+        self.frame_count += 1
+        self.duplicate_count += 1
+        
+    def close(self) -> dict:
+        """写出剩余帧并结束导出，返回统计信息"""
+        if self._elapsed is None:
+            if self._pending_pbo is not None:
+                self._submit(self._pending_pbo)
+                self._pending_pbo = None
+            self._pending_frames.put(None)
+            self._thread.join()
+            for pbo in self._pbos or ():
+                pbo.release()
+            self._writer.close()
+            self._elapsed = time.perf_counter() - self._start_time
+            self._check_error()
+        return self.stats()
+        
+    def stats(self) -> dict:
+        """导出统计：帧数、重复帧数、耗时和吞吐量（帧/秒）"""
+        elapsed = self._elapsed if self._elapsed is not None else time.perf_counter() - self._start_time
+        return {
+            'frames': self.frame_count,
+            'duplicates': self.duplicate_count,
+            'seconds': elapsed,
+            'fps': self.frame_count / elapsed if elapsed > 0 else 0.0,
+        }
@@ -4,47 +4,313 @@ Mini Animation Engine MVP - Geometry Module
 """
 import numpy as np
 import math
+import itertools
 from typing import Tuple, List
-from dataclasses import dataclass
 
 
-@dataclass
+# 全局单调递增的修改戳：任何对象的任何修改都得到比之前所有修改更大的戳，
+# 因此一组对象的最大戳变化当且仅当其中某个对象被修改过
+_next_version = itertools.count(1).__next__
+
+
+def transform_matrices(positions: np.ndarray, rotations: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """批量计算变换矩阵：(N,3)位置、(N,)旋转、(N,3)缩放 -> (N,4,4)，与Transform.get_matrix结果一致"""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1)
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    cos_r = np.cos(rotations)
+    sin_r = np.sin(rotations)
+    matrices = np.zeros((len(rotations), 4, 4), dtype=np.float32)
+    matrices[:, 0, 0] = cos_r * scales[:, 0]
+    matrices[:, 0, 1] = -sin_r * scales[:, 1]
+    matrices[:, 1, 0] = sin_r * scales[:, 0]
+    matrices[:, 1, 1] = cos_r * scales[:, 1]
+    matrices[:, 2, 2] = scales[:, 2]
+    matrices[:, :3, 3] = positions
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def transform_vertices(vertices: np.ndarray, matrices: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """批量变换顶点：(N,V,3)顶点和(N,4,4)矩阵 -> (N,V,3)的float32数组，可写入预分配的out"""
+    vertices = np.asarray(vertices, dtype=np.float32)
+    matrices = np.asarray(matrices, dtype=np.float32)
+    if out is None:
+        out = np.empty(vertices.shape, dtype=np.float32)
+    np.matmul(vertices, matrices[:, :3, :3].transpose(0, 2, 1), out=out)
+    out += matrices[:, None, :3, 3]
+    return out
+
+
+class TransformStore:
+    """变换存储 - 以结构数组（SoA）保存一组对象的位置、旋转、缩放和颜色
+    
+    每个对象占一行，Transform和Triangle只是指向某一行的视图。场景把成员集中在
+    同一个存储中，整体平移、动画写入和GPU上传都可以对整列做一次数组运算。
+    直接改写数组后需调用touch()，否则画面不会被判定为已修改。
+    """
+    
+    def __init__(self, capacity: int = 1):
+        capacity = max(1, capacity)
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        # 旋转和颜色按双精度保存，读回的值与赋值相等（如rotation == 0.1）；上传GPU时再转换为float32
+        self.rotations = np.zeros(capacity, dtype=np.float64)  # Z轴旋转角度（弧度）
+        self.scales = np.ones((capacity, 3), dtype=np.float32)
+        self.colors = np.zeros((capacity, 3), dtype=np.float64)
+        # 每行的修改戳，以及整个存储的最大修改戳
+        self.versions = np.zeros(capacity, dtype=np.int64)
+        self.version = 0
+        # 最近一次替换三角形顶点时的修改戳，用于缓存顶点数据
+        self.mesh_version = 0
+        # 行的迁出或重排计数，按行号缓存数据的一方据此判断行号是否失效
+        self.layout_version = 0
+        # 已分配过的行数，以及被释放、可复用的行
+        self._size = 0
+        self._free: List[int] = []
+        
+    @property
+    def capacity(self) -> int:
+        return len(self.rotations)
+        
+    def __len__(self) -> int:
+        """正在使用的行数"""
+        return self._size - len(self._free)
+        
+    def allocate(self) -> int:
+        """分配一行（初始为单位变换、黑色）"""
+        row = self._take_row()
+        self.positions[row] = 0.0
+        self.rotations[row] = 0.0
+        self.scales[row] = 1.0
+        self.colors[row] = 0.0
+        self.touch(row)
+        return row
+        
+    def allocate_many(self, count: int) -> np.ndarray:
+        """在末尾连续分配count行（初始为单位变换、黑色），返回行号数组"""
+        start = self._size
+        if start + count > self.capacity:
+            self._grow(max(start + count, self.capacity * 2))
+        rows = np.arange(start, start + count)
+        self._size += count
+        self.positions[rows] = 0.0
+        self.rotations[rows] = 0.0
+        self.scales[rows] = 1.0
+        self.colors[rows] = 0.0
+        self.touch(rows)
+        return rows
+        
+    def release(self, row: int):
+        """释放一行，之后可被重新分配"""
+        self._free.append(row)
+        
+    def release_many(self, rows):
+        """释放多行"""
+        self._free.extend(np.asarray(rows).tolist())
+        
+    def adopt(self, transform: 'Transform'):
+        """把变换（连同所在行的颜色）迁移到本存储的新行，原来的行被释放"""
+        source, source_row = transform._store, transform._row
+        if source is self:
+            return
+        row = self._take_row()
+        self.positions[row] = source.positions[source_row]
+        self.rotations[row] = source.rotations[source_row]
+        self.scales[row] = source.scales[source_row]
+        self.colors[row] = source.colors[source_row]
+        self.touch(row)
+        source.release(source_row)
+        source.layout_version += 1
+        transform._bind(self, row)
+        
+    def adopt_many(self, transforms: List['Transform']):
+        """批量迁移：按来源存储分组，每组各列一次数组复制"""
+        transforms = [transform for transform in transforms if transform._store is not self]
+        if not transforms:
+            return
+        rows = self._take_rows(len(transforms))
+        groups = {}
+        for row, transform in zip(rows, transforms):
+            group = groups.get(id(transform._store))
+            if group is None:
+                groups[id(transform._store)] = group = (transform._store, [], [])
+            group[1].append(transform._row)
+            group[2].append(row)
+            transform._bind(self, row)
+        for source, source_rows, target_rows in groups.values():
+            # 单独创建的对象各自一个存储，逐行复制比花式索引快
+            source_index, target_index = (source_rows[0], target_rows[0]) if len(source_rows) == 1 else (source_rows, target_rows)
+            for name in ('positions', 'rotations', 'scales', 'colors'):
+                getattr(self, name)[target_index] = getattr(source, name)[source_index]
+            source.release_many(source_rows)
+            source.layout_version += 1
+        self.touch(rows)
+        
+    def compact(self, transforms: List['Transform']):
+        """整理碎片：把这些（存活的）变换按给定顺序移到前len行，丢弃所有空闲行
+        
+        行号改变但数据和修改戳不变，矩阵缓存仍然有效
+        """
+        rows = np.fromiter((transform._row for transform in transforms), dtype=np.intp, count=len(transforms))
+        for name in ('positions', 'rotations', 'scales', 'colors', 'versions'):
+            column = getattr(self, name)
+            column[:len(rows)] = column[rows]
+        for row, transform in enumerate(transforms):
+            transform._row = row
+        self._size = len(rows)
+        self._free = []
+        self.layout_version += 1
+        
+    def touch(self, rows=None):
+        """标记行已修改（rows为None时标记所有行）"""
+        stamp = _next_version()
+        if rows is None:
+            self.versions[:self._size] = stamp
+        else:
+            self.versions[rows] = stamp
+        self.version = stamp
+        
+    def matrices(self, rows=None) -> np.ndarray:
+        """批量计算各行的4x4变换矩阵，返回(N,4,4)"""
+        if rows is None:
+            rows = slice(0, self._size)
+        return transform_matrices(self.positions[rows], self.rotations[rows], self.scales[rows])
+        
+    def instance_data(self, rows: np.ndarray) -> np.ndarray:
+        """按行收集实例数据：(N,10)的 [位置xyz, 旋转, 缩放xyz, 颜色rgb]"""
+        data = np.empty((len(rows), 10), dtype=np.float32)
+        data[:, 0:3] = self.positions[rows]
+        data[:, 3] = self.rotations[rows]
+        data[:, 4:7] = self.scales[rows]
+        data[:, 7:10] = self.colors[rows]
+        return data
+        
+    def _take_row(self) -> int:
+        """取一个空闲行，优先复用被释放的行，容量不足时翻倍扩容"""
+        if self._free:
+            return self._free.pop()
+        if self._size == self.capacity:
+            self._grow(self.capacity * 2)
+        row = self._size
+        self._size += 1
+        return row
+        
+    def _take_rows(self, count: int) -> List[int]:
+        """取count个空闲行，优先复用被释放的行"""
+        reused = min(count, len(self._free))
+        rows = self._free[len(self._free) - reused:]
+        del self._free[len(self._free) - reused:]
+        appended = count - reused
+        if appended:
+            if self._size + appended > self.capacity:
+                self._grow(max(self._size + appended, self.capacity * 2))
+            rows.extend(range(self._size, self._size + appended))
+            self._size += appended
+        return rows
+        
+    def _grow(self, capacity: int):
+        """扩容：分配更大的数组并复制已有数据（之前取得的行视图不再指向存储）"""
+        size = self._size
+        for name in ('positions', 'rotations', 'scales', 'colors', 'versions'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+
+
 class Transform:
-    """变换类 - 管理位置、旋转、缩放"""
-    position: np.ndarray = None
-    rotation: float = 0.0  # Z轴旋转角度（弧度）
-    scale: np.ndarray = None
+    """变换类 - 管理位置、旋转、缩放
     
-    def __post_init__(self):
-        if self.position is None:
-            self.position = np.array([0.0, 0.0, 0.0], dtype=np.float32)
-        if self.scale is None:
-            self.scale = np.array([1.0, 1.0, 1.0], dtype=np.float32)
+    数据保存在TransformStore的一行中：单独创建时使用自己的单行存储，
+    对象加入场景后迁移到场景的存储
+    """
+    
+    __slots__ = ('_store', '_row', '_matrix', '_matrix_version')
+    
+    def __init__(self, position=None, rotation: float = 0.0, scale=None):
+        store = TransformStore()
+        self._bind(store, store.allocate())
+        if position is not None:
+            self.position = position
+        if rotation:
+            self.rotation = rotation
+        if scale is not None:
+            self.scale = scale
             
+    @classmethod
+    def _view(cls, store: TransformStore, row: int) -> 'Transform':
+        """创建指向已分配行的视图"""
+        transform = cls.__new__(cls)
+        transform._bind(store, row)
+        return transform
+        
+    def _bind(self, store: TransformStore, row: int):
+        """指向存储中的某一行，并清空矩阵缓存"""
+        self._store = store
+        self._row = row
+        self._matrix = None
+        self._matrix_version = 0
+        
+    def __repr__(self) -> str:
+        return f"Transform(position={self.position!r}, rotation={self.rotation!r}, scale={self.scale!r})"
+        
+    @property
+    def position(self) -> np.ndarray:
+        """位置，存储中该行的(3,)视图"""
+        return self._store.positions[self._row]
+        
+    @position.setter
+    def position(self, value):
+        # 赋值（包括+=等原地运算和动画的setattr）会更新修改戳
+        self._store.positions[self._row] = value
+        self._store.touch(self._row)
+        
+    @property
+    def rotation(self) -> float:
+        """Z轴旋转角度（弧度）"""
+        return float(self._store.rotations[self._row])
+        
+    @rotation.setter
+    def rotation(self, value: float):
+        self._store.rotations[self._row] = value
+        self._store.touch(self._row)
+        
+    @property
+    def scale(self) -> np.ndarray:
+        """缩放，存储中该行的(3,)视图"""
+        return self._store.scales[self._row]
+        
+    @scale.setter
+    def scale(self, value):
+        self._store.scales[self._row] = value
+        self._store.touch(self._row)
+        
+    @property
+    def version(self) -> int:
+        """修改戳，变换被修改后增大（直接修改数组元素如 position[0] = 1 不会被追踪）"""
+        return int(self._store.versions[self._row])
+        
     def get_matrix(self) -> np.ndarray:
-        """获取4x4变换矩阵"""
-        # 平移矩阵
-        translation = np.eye(4, dtype=np.float32)
-        translation[:3, 3] = self.position
-        
-        # 旋转矩阵（绕Z轴）
-        cos_r = math.cos(self.rotation)
-        sin_r = math.sin(self.rotation)
-        rotation = np.array([
-            [cos_r, -sin_r, 0, 0],
-            [sin_r, cos_r, 0, 0],
-            [0, 0, 1, 0],
-            [0, 0, 0, 1]
-        ], dtype=np.float32)
-        
-        # 缩放矩阵
-        scale_matrix = np.eye(4, dtype=np.float32)
-        scale_matrix[0, 0] = self.scale[0]
-        scale_matrix[1, 1] = self.scale[1]
-        scale_matrix[2, 2] = self.scale[2]
-        
-        # 组合变换：先缩放，再旋转，最后平移
-        return translation @ rotation @ scale_matrix
+        """获取4x4变换矩阵（闭式计算，变换未被修改时直接返回缓存，结果只读）"""
+        store, row = self._store, self._row
+        version = store.versions[row]
+        if self._matrix_version != version:
+            x, y, z = store.positions[row].tolist()
+            sx, sy, sz = store.scales[row].tolist()
+            rotation = float(store.rotations[row])
+            cos_r = math.cos(rotation)
+            sin_r = math.sin(rotation)
+            # 平移 @ 旋转 @ 缩放 展开后的结果
+            matrix = np.array([
+                [cos_r * sx, -sin_r * sy, 0, x],
+                [sin_r * sx, cos_r * sy, 0, y],
+                [0, 0, sz, z],
+                [0, 0, 0, 1]
+            ], dtype=np.float32)
+            matrix.flags.writeable = False
+            self._matrix = matrix
+            self._matrix_version = version
+        return self._matrix
         
     def translate(self, dx: float, dy: float, dz: float = 0.0):
         """平移变换"""
@@ -85,8 +351,30 @@ class Transform:
         return self
 
 
+def _as_mesh(vertices) -> np.ndarray:
+    """转换为只读的(3,3) float32顶点数组；已是只读float32数组时直接共享，不复制"""
+    if isinstance(vertices, np.ndarray) and vertices.dtype == np.float32 and not vertices.flags.writeable and vertices.shape == (3, 3):
+        return vertices
+    mesh = np.array(vertices, dtype=np.float32).reshape(3, 3)
+    mesh.flags.writeable = False
+    return mesh
+
+
+# 默认单位三角形（指向上方），所有默认三角形共享
+_DEFAULT_MESH = _as_mesh([
+    [0.0,  1.0, 0.0],   # 顶点
+    [-1.0, -1.0, 0.0],  # 左下
+    [1.0, -1.0, 0.0]    # 右下
+])
+
+
 class Triangle:
-    """三角形几何对象"""
+    """三角形几何对象
+    
+    顶点数据只读并在副本之间共享，set_vertices时才替换为新数组（写时复制）
+    """
+    
+    __slots__ = ('_transform', 'original_vertices')
     
     def __init__(self, vertices: List[List[float]] = None, color: Tuple[float, float, float] = (1.0, 0.0, 0.0)):
         """初始化三角形
@@ -95,40 +383,58 @@ class Triangle:
             vertices: 3x3顶点列表 [[x1,y1,z1], [x2,y2,z2], [x3,y3,z3]]
             color: RGB颜色值
         """
-        if vertices is None:
-            # 默认单位三角形（指向上方）
-            vertices = [
-                [0.0,  1.0, 0.0],   # 顶点
-                [-1.0, -1.0, 0.0],  # 左下
-                [1.0, -1.0, 0.0]    # 右下
-            ]
-            
-        self.original_vertices = np.array(vertices, dtype=np.float32)
+        # 变换和颜色保存在存储的同一行中
+        self._transform = Transform()
+        self.original_vertices = _DEFAULT_MESH if vertices is None else _as_mesh(vertices)
         self.color = color
-        self.transform = Transform()
         
-        # 用于动画的目标值
-        self._target_color = None
-        self._target_transform = None
+    def __setattr__(self, name, value):
+        # 颜色、顶点或变换被替换时更新所在行的修改戳
+        object.__setattr__(self, name, value)
+        transform = getattr(self, '_transform', None)
+        if transform is not None:
+            store = transform._store
+            store.touch(transform._row)
+            if name == 'original_vertices':
+                store.mesh_version = store.version
+                
+    @property
+    def transform(self) -> Transform:
+        """变换（存储中该行的视图）"""
+        return self._transform
         
-    def get_vertices(self) -> np.ndarray:
-        """获取经过变换的顶点数据"""
-        # 将3D顶点转换为齐次坐标
-        homogeneous_vertices = np.column_stack([
-            self.original_vertices, 
-            np.ones(len(self.original_vertices))
-        ])
+    @transform.setter
+    def transform(self, transform: Transform):
+        # 复制给定变换的值，三角形始终使用自己的行
+        target = self._transform
+        target.position = transform.position
+        target.rotation = transform.rotation
+        target.scale = transform.scale
+        
+    @property
+    def color(self) -> Tuple[float, float, float]:
+        """RGB颜色"""
+        transform = self._transform
+        return tuple(transform._store.colors[transform._row].tolist())
         
-        # 应用变换矩阵
-        transform_matrix = self.transform.get_matrix()
-        transformed = homogeneous_vertices @ transform_matrix.T
+    @color.setter
+    def color(self, color: Tuple[float, float, float]):
+        transform = self._transform
+        transform._store.colors[transform._row] = color
+        transform._store.touch(transform._row)
         
-        # 返回3D坐标
-        return transformed[:, :3]
+    @property
+    def version(self) -> int:
+        """修改戳：颜色、顶点或变换任一被修改后增大，用于判断是否需要重新渲染"""
+        return self._transform.version
+        
+    def get_vertices(self) -> np.ndarray:
+        """获取经过变换的顶点数据（整个场景的批量版本见Scene.get_transformed_vertices）"""
+        return transform_vertices(self.original_vertices[None], self.transform.get_matrix()[None])[0]
         
     def set_vertices(self, vertices: List[List[float]]):
-        """设置新的顶点"""
-        self.original_vertices = np.array(vertices, dtype=np.float32)
+        """设置新的顶点（替换为新数组，不影响共享原顶点的副本）"""
+        self.original_vertices = _as_mesh(vertices)
         return self
         
     def set_color(self, color: Tuple[float, float, float]):
@@ -157,15 +463,52 @@ class Triangle:
         return self
         
     def copy(self):
-        """创建副本"""
-        new_triangle = Triangle(self.original_vertices.tolist(), self.color)
-        new_triangle.transform = Transform(
-            position=self.transform.position.copy(),
-            rotation=self.transform.rotation,
-            scale=self.transform.scale.copy()
-        )
+        """创建副本（与原三角形共享顶点数据）"""
+        new_triangle = Triangle(self.original_vertices, self.color)
+        new_triangle.transform = self.transform
         return new_triangle
         
+    @staticmethod
+    def create_many(count: int, vertices=None, positions=None, rotations=None, scales=None, colors=None) -> List['Triangle']:
+        """一次创建count个三角形，所有变换和颜色位于同一个存储的连续行中
+        
+        Args:
+            count: 三角形数量
+            vertices: (3,3)的共享顶点，或(count,3,3)的逐个顶点；默认单位三角形
+            positions: (count,3)位置（也可为(count,2)）
+            rotations: (count,)旋转角度（弧度）
+            scales: (count,3)缩放，或(count,)的统一缩放
+            colors: (count,3)颜色，或单个RGB颜色；默认红色
+        """
+        store = TransformStore(count)
+        rows = store.allocate_many(count)
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.float32)
+            store.positions[:count, :positions.shape[-1]] = positions
+        if rotations is not None:
+            store.rotations[:count] = rotations
+        if scales is not None:
+            scales = np.asarray(scales, dtype=np.float32)
+            store.scales[:count] = scales[:, None] if scales.ndim == 1 else scales
+        store.colors[:count] = (1.0, 0.0, 0.0) if colors is None else colors
+        store.touch(rows)
+        
+        if vertices is None:
+            meshes = itertools.repeat(_DEFAULT_MESH, count)
+        else:
+            vertices = np.array(vertices, dtype=np.float32)
+            vertices.flags.writeable = False
+            meshes = itertools.repeat(_as_mesh(vertices), count) if vertices.ndim == 2 else iter(vertices.reshape(count, 3, 3))
+            
+        triangles = []
+        new = Triangle.__new__
+        for row, mesh in zip(rows.tolist(), meshes):
+            triangle = new(Triangle)
+            object.__setattr__(triangle, '_transform', Transform._view(store, row))
+            object.__setattr__(triangle, 'original_vertices', mesh)
+            triangles.append(triangle)
+        return triangles
+        
     @staticmethod
     def create_equilateral(side_length: float = 2.0, color: Tuple[float, float, float] = (1.0, 0.0, 0.0)):
         """创建等边三角形"""
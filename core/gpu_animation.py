@@ -0,0 +1,287 @@
+"""
+Mini Animation Engine MVP - GPU Animation Module
+GPU求值的动画：关键帧参数只上传一次，由顶点着色器根据时间uniform求出当前的变换和颜色
+"""
+import heapq
+import itertools
+from typing import Dict, List
+import numpy as np
+from .animation import Animation, EaseFunction, TransformAnimation, ColorAnimation, _STORE_COLUMNS, _store_view
+
+
+# 可在着色器中求值的缓动及其编号（与GLSL_EASING一致）
+GPU_EASE_IDS = {
+    EaseFunction.linear: 0,
+    EaseFunction.ease_in_out: 1,
+    EaseFunction.ease_in_quad: 2,
+    EaseFunction.ease_out_quad: 3,
+    EaseFunction.ease_in_out_quad: 4,
+}
+
+# 循环方式：播放一次、重复、往返
+LOOP_MODES = {'once': 0, 'repeat': 1, 'pingpong': 2}
+
+# 逐实例参数：起始值(10) + 结束值(10) + 四个通道的 [开始时刻, 时长, 缓动编号, 循环方式](16)
+# 起止值的布局与TransformStore.instance_data一致：位置xyz, 旋转, 缩放xyz, 颜色rgb
+PARAM_SIZE = 36
+
+# 通道 -> (在实例数据中的列, 时序参数的起始列)
+_CHANNELS = {
+    'position': (slice(0, 3), 20),
+    'rotation': (slice(3, 4), 24),
+    'scale': (slice(4, 7), 28),
+    'color': (slice(7, 10), 32),
+}
+_CHANNEL_NAMES = ('position', 'rotation', 'scale', 'color')
+# 实例数据每列所属的通道
+_COLUMN_CHANNELS = np.array([0, 0, 0, 1, 2, 2, 2, 3, 3, 3])
+
+# 与evaluate_params一致的GLSL实现
+GLSL_EASING = """
+uniform float time;
+
+float ease(float id, float t) {
+    if (id < 0.5) return t;
+    if (id < 1.5) return 3.0 * t * t - 2.0 * t * t * t;
+    if (id < 2.5) return t * t;
+    if (id < 3.5) return 1.0 - (1.0 - t) * (1.0 - t);
+    return t < 0.5 ? 2.0 * t * t : 1.0 - 2.0 * (1.0 - t) * (1.0 - t);
+}
+
+// timing: [开始时刻, 时长, 缓动编号, 循环方式]
+float channel_progress(vec4 timing) {
+    if (timing.y <= 0.0) return 1.0;
+    float p = (time - timing.x) / timing.y;
+    if (timing.w > 1.5) {
+        p = 1.0 - abs(mod(max(p, 0.0), 2.0) - 1.0);
+    } else if (timing.w > 0.5) {
+        p = fract(max(p, 0.0));
+    }
+    return ease(timing.z, clamp(p, 0.0, 1.0));
+}
+"""
+
+_EASES = sorted(GPU_EASE_IDS.items(), key=lambda item: item[1])
+
+
+def evaluate_params(params: np.ndarray, time: float) -> np.ndarray:
+    """在CPU上按着色器的公式求出t时刻的实例数据 (N,10)（无GPU时的回退路径）"""
+    params = np.asarray(params, dtype=np.float32).reshape(-1, PARAM_SIZE)
+    timing = params[:, 20:36].reshape(-1, 4, 4).astype(np.float64)
+    start, duration, ease_id, mode = timing[..., 0], timing[..., 1], timing[..., 2], timing[..., 3]
+    # 时长为0的通道直接取终值
+    p = np.where(duration > 0.0, (time - start) / np.where(duration > 0.0, duration, 1.0), 1.0)
+    p = np.where(mode > 1.5, 1.0 - np.abs(np.mod(np.maximum(p, 0.0), 2.0) - 1.0),
+                 np.where(mode > 0.5, np.mod(np.maximum(p, 0.0), 1.0), p))
+    p = np.clip(np.where(duration > 0.0, p, 1.0), 0.0, 1.0)
+    eased = np.empty_like(p)
+    for ease, index in _EASES:
+        mask = np.abs(ease_id - index) < 0.5
+        if mask.any():
+            eased[mask] = ease(p[mask])
+    eased = eased[:, _COLUMN_CHANNELS].astype(np.float32)
+    return params[:, 0:10] + (params[:, 10:20] - params[:, 0:10]) * eased
+
+
+class GpuAnimationSet:
+    """交给GPU求值的动画集合
+    
+    每个被动画的对象占一行参数，四个通道（位置、旋转、缩放、颜色）各自记录起止值和时序。
+    开始后CPU不再逐帧求值：GPU渲染路径把参数随实例数据上传一次，着色器按time求值；
+    其他渲染路径由update在CPU上向量化求值。播放一次的通道结束时把终值写回存储并移出集合。
+    时刻以第一次添加动画时的时钟为原点，保证float32的时间精度。
+    """
+    
+    def __init__(self):
+        self.epoch = None
+        # 被动画的Transform -> 参数行
+        self._index: Dict[object, int] = {}
+        self._views: List[object] = []
+        self._params = np.zeros((0, PARAM_SIZE), dtype=np.float32)
+        # 各行正在动画的通道
+        self._active = np.zeros((0, 4), dtype=bool)
+        # 播放一次的通道的结束时刻：(结束时刻, 序号, Transform, 通道编号)；
+        # 通道被新的动画覆盖后，旧的结束时刻按序号作废
+        self._endings = []
+        self._sequence = itertools.count()
+        self._tokens = {}
+        # 参数的修改计数，渲染路径据此决定是否重新上传
+        self.version = 0
+        
+    def __len__(self) -> int:
+        return len(self._views)
+        
+    def __contains__(self, view) -> bool:
+        return view in self._index
+        
+    def local_time(self, current_time: float) -> float:
+        """时钟时刻在集合时间轴上的值"""
+        return 0.0 if self.epoch is None else current_time - self.epoch
+        
+    def add(self, animation: Animation, current_time: float, loop: str = 'once'):
+        """从current_time开始在GPU上播放动画（起始值在此时读取）"""
+        if loop not in LOOP_MODES:
+            raise ValueError(f"未知的循环方式: {loop}，可选: {', '.join(LOOP_MODES)}")
+        if not isinstance(animation, (TransformAnimation, ColorAnimation)) or animation.attribute not in _STORE_COLUMNS:
+            raise ValueError("GPU动画只支持位置、旋转、缩放和颜色动画")
+        ease_id = GPU_EASE_IDS.get(animation.ease_func)
+        if ease_id is None:
+            raise ValueError(f"缓动 {getattr(animation.ease_func, '__name__', animation.ease_func)} 不能在GPU上求值，可用: "
+                             + ', '.join(ease.__name__ for ease, _ in _EASES))
+        view = _store_view(animation)
+        if getattr(view, '_store', None) is None:
+            raise ValueError("动画目标没有变换存储")
+        animation.start(current_time)
+        if not getattr(animation._interpolate, 'linear', False):
+            raise ValueError("GPU动画只支持线性插值器")
+        if self.epoch is None:
+            self.epoch = current_time
+            
+        slot = self._index.get(view)
+        if slot is None:
+            slot = self._append(view)
+        columns, timing = _CHANNELS[animation.attribute]
+        channel = _CHANNEL_NAMES.index(animation.attribute)
+        row = self._params[slot]
+        row[columns] = np.ravel(animation._interpolate.start)
+        row[10:20][columns] = np.ravel(animation._interpolate.end)
+        row[timing:timing + 4] = (animation.start_time - self.epoch, animation.duration, ease_id, LOOP_MODES[loop])
+        self._active[slot, channel] = True
+        token = self._tokens[view, channel] = next(self._sequence)
+        if loop == 'once':
+            heapq.heappush(self._endings, (animation.start_time + animation.duration, token, view, channel))
+        self.version += 1
+        
+    def _append(self, view) -> int:
+        slot = len(self._views)
+        if slot == len(self._params):
+            capacity = max(16, 2 * slot)
+            params = np.zeros((capacity, PARAM_SIZE), dtype=np.float32)
+            params[:slot] = self._params
+            active = np.zeros((capacity, 4), dtype=bool)
+            active[:slot] = self._active[:slot]
+            self._params, self._active = params, active
+        self._index[view] = slot
+        self._views.append(view)
+        self._params[slot] = 0.0
+        self._active[slot] = False
+        return slot
+        
+    def discard(self, views):
+        """移除对象的所有GPU动画（对象保持当前存储中的值）"""
+        for view in views:
+            slot = self._index.pop(view, None)
+            if slot is None:
+                continue
+            last = len(self._views) - 1
+            if slot != last:
+                moved = self._views[last]
+                self._views[slot] = moved
+                self._index[moved] = slot
+                self._params[slot] = self._params[last]
+                self._active[slot] = self._active[last]
+            self._views.pop()
+            for channel in range(4):
+                self._tokens.pop((view, channel), None)
+            self.version += 1
+            
+    def clear(self):
+        """移除所有GPU动画"""
+        self.discard(list(self._views))
+        self._endings.clear()
+        self.epoch = None
+        
+    def save(self) -> tuple:
+        """当前状态的副本（时间线快照用）"""
+        count = len(self._views)
+        return (self.epoch, dict(self._index), list(self._views), self._params[:count].copy(), self._active[:count].copy(),
+                list(self._endings), dict(self._tokens))
+                
+    def load(self, state: tuple):
+        """恢复save保存的状态"""
+        epoch, index, views, params, active, endings, tokens = state
+        self.epoch = epoch
+        self._index = dict(index)
+        self._views = list(views)
+        self._params = params.copy()
+        self._active = active.copy()
+        self._endings = list(endings)
+        self._tokens = dict(tokens)
+        self.version += 1
+        
+    def _rows(self, store) -> np.ndarray:
+        """各参数行对应的存储行号，不在store中的对象为-1"""
+        return np.fromiter((view._row if view._store is store else -1 for view in self._views), dtype=np.intp, count=len(self._views))
+        
+    def update(self, store, current_time: float, evaluate: bool = True):
+        """推进一帧：结束的通道写回终值；evaluate为True时在CPU上求出所有通道的当前值写入存储"""
+        local_time = self.local_time(current_time)
+        if evaluate and self._views:
+            count = len(self._views)
+            rows = self._rows(store)
+            values = evaluate_params(self._params[:count], local_time)
+            self._write(store, rows, values, self._active[:count])
+            
+        endings = self._endings
+        finished = []
+        while endings and endings[0][0] <= current_time:
+            _, token, view, channel = heapq.heappop(endings)
+            slot = self._index.get(view)
+            if slot is not None and self._tokens.get((view, channel)) == token:
+                finished.append((slot, channel))
+        if not finished:
+            return
+        # 结束的通道：按终值写回存储，之后由存储中的值绘制
+        slots = np.array([slot for slot, _ in finished], dtype=np.intp)
+        mask = np.zeros((len(slots), 4), dtype=bool)
+        mask[np.arange(len(slots)), [channel for _, channel in finished]] = True
+        self._write(store, self._rows(store)[slots], self._params[slots, 10:20], mask)
+        for slot, channel in finished:
+            self._active[slot, channel] = False
+            del self._tokens[self._views[slot], channel]
+        self.discard([self._views[slot] for slot in set(slots.tolist()) if not self._active[slot].any()])
+        self.version += 1
+        
+    @staticmethod
+    def _write(store, rows, values, active):
+        """把各行正在动画的通道的值写入存储"""
+        valid = rows >= 0
+        if not valid.any():
+            return
+        rows, values, active = rows[valid], values[valid], active[valid]
+        for channel, name in enumerate(_CHANNEL_NAMES):
+            mask = active[:, channel]
+            if mask.any():
+                column, _ = _STORE_COLUMNS[name]
+                columns, _ = _CHANNELS[name]
+                target = getattr(store, column)
+                selected = values[mask, columns]
+                target[rows[mask]] = selected[:, 0] if name == 'rotation' else selected
+        store.touch(rows)
+        
+    def instance_params(self, store, rows: np.ndarray) -> np.ndarray:
+        """按存储行号rows收集 (N,36) 的逐实例参数：未动画的通道取存储中的当前值"""
+        current = store.instance_data(rows)
+        params = np.zeros((len(rows), PARAM_SIZE), dtype=np.float32)
+        params[:, 0:10] = current
+        params[:, 10:20] = current
+        if not self._views or not len(rows):
+            return params
+            
+        count = len(self._views)
+        animated = self._rows(store)
+        order = np.argsort(rows)
+        sorted_rows = rows[order]
+        position = np.minimum(np.searchsorted(sorted_rows, animated), len(rows) - 1)
+        found = sorted_rows[position] == animated
+        targets = order[position[found]]
+        source = self._params[:count][found]
+        active = self._active[:count][found]
+        for channel, name in enumerate(_CHANNEL_NAMES):
+            mask = active[:, channel]
+            if mask.any():
+                columns, timing = _CHANNELS[name]
+                params[targets[mask], columns] = source[mask, columns]
+                params[targets[mask], 10 + columns.start:10 + columns.stop] = source[mask, 10 + columns.start:10 + columns.stop]
+                params[targets[mask], timing:timing + 4] = source[mask, timing:timing + 4]
+        return params
@@ -0,0 +1,144 @@
+"""
+Mini Animation Engine MVP - Parallel Export Module
+多进程并行导出：把construct()的时间线切分为帧区间，由无窗口工作进程分别渲染
+"""
+import math
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+from .clock import FrameClock
+from .export import open_writer
+
+
+def _create_engine(engine_class, engine_kwargs: dict, fps: float):
+    """在工作进程中创建无窗口、逐帧时钟驱动的引擎"""
+    kwargs = dict(engine_kwargs)
+    kwargs['headless'] = True
+    kwargs['clock'] = FrameClock(fps)
+    return engine_class(**kwargs)
+
+
+# 工作进程中已编译的时间线：(引擎类, 引擎参数, 帧率, 引擎, 时间线)
+_compiled = None
+
+
+def _compiled_timeline(engine_class, engine_kwargs: dict, fps: float):
+    """返回工作进程中编译的引擎和时间线；同一进程的后续任务直接复用，construct()只执行一次"""
+    global _compiled
+    if _compiled is not None and _compiled[:3] == (engine_class, engine_kwargs, fps):
+        return _compiled[3], _compiled[4]
+    if _compiled is not None:
+        _compiled[3].cleanup()
+        _compiled = None
+    engine = _create_engine(engine_class, engine_kwargs, fps)
+    timeline = engine.compile_timeline(fps)
+    _compiled = (engine_class, engine_kwargs, fps, engine, timeline)
+    return engine, timeline
+
+
+def _count_frames(engine_class, engine_kwargs: dict, fps: float):
+    """编译时间线（不渲染任何帧），返回总帧数和画面尺寸"""
+    engine, timeline = _compiled_timeline(engine_class, engine_kwargs, fps)
+    return timeline.frame_count, engine.renderer.width, engine.renderer.height
+
+
+def _render_range(engine_class, engine_kwargs: dict, fps: float, start: int, stop: int, shm_name: str):
+    """渲染 [start, stop) 帧并写入共享内存"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # 直接定位到区间内的每一帧，不需要播放区间之前的部分
+        engine, timeline = _compiled_timeline(engine_class, engine_kwargs, fps)
+        renderer = engine.renderer
+        frames = np.ndarray((stop - start, renderer.height, renderer.width, 3), dtype=np.uint8, buffer=shm.buf)
+        rendered = 0
+        # 帧数据直接回读到共享内存中
+        for index in range(start, min(stop, timeline.frame_count)):
+            timeline.seek_frame(index)
+            engine.scene._render_frame()
+            renderer.read_into(frames[rendered])
+            rendered += 1
+        del frames
+        return rendered
+    finally:
+        shm.close()
+
+
+def render_parallel(engine_class, output: str, fps: float = 60.0, workers: int = None, chunk_frames: int = None, **engine_kwargs) -> dict:
+    """多进程并行导出MiniAnimationEngine子类的construct()
+    
+    先编译时间线统计总帧数，再把帧切分为区间交给进程池渲染。每个工作进程
+    创建独立的无窗口引擎，只在第一个任务时编译一次时间线，之后的区间直接定位逐帧渲染，
+    帧数据直接回读到共享内存，主进程按顺序写出。
+    共享内存块循环复用，内存占用与总帧数无关。
+    
+    Args:
+        engine_class: 重写了construct()的MiniAnimationEngine子类（需可被子进程导入）
+        output: 输出路径，同FrameExporter
+        fps: 帧率
+        workers: 工作进程数，默认为CPU核数
+        chunk_frames: 每个任务渲染的帧数，默认按总帧数和进程数自动选择
+        **engine_kwargs: 传给engine_class的参数（如width、height、render_mode）
+        
+    Returns:
+        统计信息：帧数、耗时、帧/秒、进程数
+    """
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    # 使用spawn，避免子进程继承父进程的OpenGL状态
+    context = mp.get_context('spawn')
+    
+    with context.Pool(workers) as pool:
+        total_frames, width, height = pool.apply(_count_frames, (engine_class, engine_kwargs, fps))
+        if total_frames == 0:
+            return {'frames': 0, 'seconds': time.perf_counter() - start_time, 'fps': 0.0, 'workers': workers}
+            
+        # 每个进程分到若干个区间，便于负载均衡；单个区间不超过fps*10帧以限制内存
+        if chunk_frames is None:
+            chunk_frames = max(1, min(math.ceil(total_frames / (workers * 4)), int(fps * 10)))
+        chunks = [(begin, min(begin + chunk_frames, total_frames)) for begin in range(0, total_frames, chunk_frames)]
+        
+        frame_bytes = width * height * 3
+        
+        writer = open_writer(output, width, height, fps)
+        slots = [shared_memory.SharedMemory(create=True, size=chunk_frames * frame_bytes)
+                 for _ in range(min(len(chunks), workers * 2))]
+        free_slots = list(slots)
+        pending = deque()
+        next_chunk = 0
+        
+        try:
+            while next_chunk < len(chunks) or pending:
+                # 保持所有进程忙碌
+                while free_slots and next_chunk < len(chunks):
+                    begin, end = chunks[next_chunk]
+                    slot = free_slots.pop()
+                    result = pool.apply_async(_render_range, (engine_class, engine_kwargs, fps, begin, end, slot.name))
+                    pending.append((slot, begin, end, result))
+                    next_chunk += 1
+                    
+                # 按顺序拼接
+                slot, begin, end, result = pending.popleft()
+                rendered = result.get()
+                if rendered != end - begin:
+                    raise RuntimeError(f"帧区间 [{begin}, {end}) 只渲染了 {rendered} 帧，construct()的时间线应是确定的")
+                frames = np.ndarray((end - begin, height, width, 3), dtype=np.uint8, buffer=slot.buf)
+                for frame in frames:
+                    writer.write(frame)
+                del frames
+                free_slots.append(slot)
+        finally:
+            writer.close()
+            for slot in slots:
+                slot.close()
+                slot.unlink()
+                
+    elapsed = time.perf_counter() - start_time
+    return {
+        'frames': total_frames,
+        'seconds': elapsed,
+        'fps': total_frames / elapsed if elapsed > 0 else 0.0,
+        'workers': workers,
+    }
@@ -0,0 +1,110 @@
+"""
+Mini Animation Engine MVP - Registry Module
+场景对象注册表，按添加顺序管理场景成员，支持O(1)的添加、移除和批量操作
+"""
+from typing import Dict, Iterable, Iterator, List
+import numpy as np
+from .geometry import TransformStore
+
+
+class ObjectRegistry:
+    """有序对象注册表
+    
+    成员保存在按插入顺序排列的字典中（即绘制顺序），每个成员有一个在场景中
+    保持不变的整数id，用作GPU常驻缓冲的键。成员的变换迁移到场景的存储中；
+    移除造成的空行超过存活行数时整理存储，使行号保持紧凑并与绘制顺序一致。
+    """
+    
+    # 空闲行少于该值时不整理
+    MIN_COMPACT_ROWS = 64
+    
+    def __init__(self, store: TransformStore):
+        self.store = store
+        self._ids: Dict[object, int] = {}
+        self._next_id = 0
+        # 成员变化计数，以及按绘制顺序排列的行号缓存
+        self.version = 0
+        self._rows = None
+        self._rows_version = -1
+        self._items = []
+        self._items_version = -1
+        
+    def __len__(self) -> int:
+        return len(self._ids)
+        
+    def __iter__(self) -> Iterator:
+        """按绘制顺序迭代成员"""
+        return iter(self._ids)
+        
+    def __contains__(self, obj) -> bool:
+        return obj in self._ids
+        
+    def items(self):
+        """按绘制顺序迭代 (成员, id)"""
+        return self._ids.items()
+        
+    def item_list(self) -> List:
+        """按绘制顺序排列的 (成员, id) 列表（缓存，调用方不应修改）"""
+        if self._items_version != self.version:
+            self._items = list(self._ids.items())
+            self._items_version = self.version
+        return self._items
+        
+    def id_of(self, obj) -> int:
+        """成员的id"""
+        return self._ids[obj]
+        
+    def add(self, objects: Iterable) -> List:
+        """批量添加（重复和已存在的对象被忽略），返回新加入的对象"""
+        ids = self._ids
+        added = [obj for obj in dict.fromkeys(objects) if obj not in ids]
+        if not added:
+            return added
+        next_id = self._next_id
+        for offset, obj in enumerate(added):
+            ids[obj] = next_id + offset
+        self._next_id = next_id + len(added)
+        self.store.adopt_many([obj.transform for obj in added])
+        self.version += 1
+        return added
+        
+    def remove(self, objects: Iterable) -> List:
+        """批量移除（不在注册表中的对象被忽略），返回被移除的对象及其id"""
+        ids = self._ids
+        removed = [(obj, ids.pop(obj)) for obj in dict.fromkeys(objects) if obj in ids]
+        if not removed:
+            return removed
+        self._detach([obj for obj, _ in removed])
+        self.version += 1
+        
+        # 空行过多时整理存储
+        free = len(self.store._free)
+        if free >= self.MIN_COMPACT_ROWS and free > len(ids):
+            self.compact()
+        return removed
+        
+    def clear(self) -> List:
+        """移除所有成员，返回被移除的对象及其id"""
+        removed = list(self._ids.items())
+        self._ids = {}
+        self._detach([obj for obj, _ in removed])
+        self.store.compact([])
+        self.version += 1
+        return removed
+        
+    def compact(self):
+        """整理存储：成员按绘制顺序占据连续的前len行"""
+        self.store.compact([obj.transform for obj in self._ids])
+        self.version += 1
+        
+    def rows(self) -> np.ndarray:
+        """成员在存储中的行号（按绘制顺序）"""
+        if self._rows_version != self.version:
+            self._rows = np.fromiter((obj.transform._row for obj in self._ids), dtype=np.intp, count=len(self._ids))
+            self._rows_version = self.version
+        return self._rows
+        
+    def _detach(self, objects: List):
+        """被移除的对象一起迁移到新的存储，释放场景存储中的行"""
+        if objects:
+            TransformStore(len(objects)).adopt_many([obj.transform for obj in objects])
@@ -3,26 +3,68 @@ Mini Animation Engine MVP - Renderer Module
 基础渲染器，负责创建OpenGL窗口和基础渲染功能
 """
 import moderngl as mgl
-import pygame as pg
 import numpy as np
-from typing import Tuple
+from typing import Tuple, Dict, Hashable
+from .gpu_animation import GLSL_EASING, PARAM_SIZE
+
+
+def orthographic_projection(width: int, height: int, frame_height: float = 8.0) -> np.ndarray:
+    """正交投影矩阵 - 类似ManimGL：屏幕高度为8个单位，中心为原点"""
+    aspect_ratio = width / height
+    frame_width = frame_height * aspect_ratio
+    
+    # 正交投影矩阵
+    left = -frame_width / 2
+    right = frame_width / 2
+    bottom = -frame_height / 2
+    top = frame_height / 2
+    near = -10.0
+    far = 10.0
+    
+    return np.array([
+        [2/(right-left), 0, 0, -(right+left)/(right-left)],
+        [0, 2/(top-bottom), 0, -(top+bottom)/(top-bottom)],
+        [0, 0, -2/(far-near), -(far+near)/(far-near)],
+        [0, 0, 0, 1]
+    ], dtype=np.float32)
 
 
 class Renderer:
     """基础渲染器类 - 管理OpenGL上下文和基础渲染操作"""
     
-    def __init__(self, width: int = 1200, height: int = 800, title: str = "Mini Animation Engine"):
+    # 逐实例数据的float数量：position(3) + rotation(1) + scale(3) + color(3)
+    INSTANCE_SIZE = 10
+    
+    def __init__(self, width: int = 1200, height: int = 800, title: str = "Mini Animation Engine", headless: bool = False):
+        """初始化渲染器
+        
+        Args:
+            width, height: 画面尺寸
+            title: 窗口标题
+            headless: 无窗口模式，使用独立OpenGL上下文渲染到离屏帧缓冲，不导入pygame
+        """
         self.width = width
         self.height = height
         self.title = title
+        self.headless = headless
         
-        # 初始化pygame和OpenGL
-        pg.init()
-        pg.display.set_mode((width, height), pg.OPENGL | pg.DOUBLEBUF)
-        pg.display.set_caption(title)
-        
-        # 创建ModernGL上下文
-        self.ctx = mgl.create_context()
+        if headless:
+            # 独立上下文 + 离屏帧缓冲
+            self.ctx = self._create_standalone_context()
+            self.fbo = self.ctx.simple_framebuffer((width, height))
+            self.fbo.use()
+        else:
+            # 初始化pygame和OpenGL（pygame只在有窗口时才导入）
+            import pygame as pg
+            self._pg = pg
+            pg.init()
+            pg.display.set_mode((width, height), pg.OPENGL | pg.DOUBLEBUF)
+            pg.display.set_caption(title)
+            
+            # 创建ModernGL上下文
+            self.ctx = mgl.create_context()
+            self.fbo = self.ctx.screen
+            
         self.ctx.enable(mgl.DEPTH_TEST)
         self.ctx.enable(mgl.BLEND)
         self.ctx.blend_func = mgl.SRC_ALPHA, mgl.ONE_MINUS_SRC_ALPHA
@@ -61,45 +103,278 @@ class Renderer:
             fragment_shader=self.fragment_shader
         )
         
+        # 批量渲染着色器（顶点已在CPU端变换，颜色作为逐顶点属性）
+        self.batch_vertex_shader = """
+        #version 330 core
+        
+        layout(location = 0) in vec3 position;
+        layout(location = 1) in vec3 color;
+        
+        uniform mat4 projection_matrix;
+        
+        out vec3 v_color;
+        
+        void main() {
+            v_color = color;
+            gl_Position = projection_matrix * vec4(position, 1.0);
+        }
+        """
+        
+        self.batch_fragment_shader = """
+        #version 330 core
+        
+        in vec3 v_color;
+        out vec4 fragColor;
+        
+        void main() {
+            fragColor = vec4(v_color, 1.0);
+        }
+        """
+        
+        self.batch_program = self.ctx.program(
+            vertex_shader=self.batch_vertex_shader,
+            fragment_shader=self.batch_fragment_shader
+        )
+        
+        # 实例化渲染着色器：基础网格只上传一次，变换和颜色作为逐实例属性在GPU上应用
+        self.instance_vertex_shader = """
+        #version 330 core
+        
+        layout(location = 0) in vec3 position;
+        in vec3 inst_position;
+        in float inst_rotation;
+        in vec3 inst_scale;
+        in vec3 inst_color;
+        
+        uniform mat4 projection_matrix;
+        
+        out vec3 v_color;
+        
+        void main() {
+            // 先缩放，再绕Z轴旋转，最后平移（与Transform.get_matrix一致）
+            vec3 p = position * inst_scale;
+            float c = cos(inst_rotation);
+            float s = sin(inst_rotation);
+            p = vec3(c * p.x - s * p.y, s * p.x + c * p.y, p.z) + inst_position;
+            v_color = inst_color;
+            gl_Position = projection_matrix * vec4(p, 1.0);
+        }
+        """
+        
+        self.instance_program = self.ctx.program(
+            vertex_shader=self.instance_vertex_shader,
+            fragment_shader=self.batch_fragment_shader
+        )
+        
+        # 变形着色器：起止顶点作为两个顶点属性，按progress uniform混合后再应用逐实例变换
+        self.morph_vertex_shader = """
+        #version 330 core
+        
+        layout(location = 0) in vec3 position;
+        in vec3 target_position;
+        in vec3 inst_position;
+        in float inst_rotation;
+        in vec3 inst_scale;
+        in vec3 inst_color;
+        
+        uniform mat4 projection_matrix;
+        uniform float progress;
+        
+        out vec3 v_color;
+        
+        void main() {
+            // 与CPU路径相同的混合公式
+            vec3 p = (position + (target_position - position) * progress) * inst_scale;
+            float c = cos(inst_rotation);
+            float s = sin(inst_rotation);
+            p = vec3(c * p.x - s * p.y, s * p.x + c * p.y, p.z) + inst_position;
+            v_color = inst_color;
+            gl_Position = projection_matrix * vec4(p, 1.0);
+        }
+        """
+        
+        self.morph_program = self.ctx.program(
+            vertex_shader=self.morph_vertex_shader,
+            fragment_shader=self.batch_fragment_shader
+        )
+        
+        # GPU动画着色器：逐实例上传起止值和时序，按time uniform求出当前的变换和颜色
+        self.animated_vertex_shader = """
+        #version 330 core
+        
+        layout(location = 0) in vec3 position;
+        in vec3 a_position0;
+        in float a_rotation0;
+        in vec3 a_scale0;
+        in vec3 a_color0;
+        in vec3 a_position1;
+        in float a_rotation1;
+        in vec3 a_scale1;
+        in vec3 a_color1;
+        in vec4 a_position_timing;
+        in vec4 a_rotation_timing;
+        in vec4 a_scale_timing;
+        in vec4 a_color_timing;
+        
+        uniform mat4 projection_matrix;
+        
+        out vec3 v_color;
+        """ + GLSL_EASING + """
+        void main() {
+            vec3 inst_position = mix(a_position0, a_position1, channel_progress(a_position_timing));
+            float inst_rotation = mix(a_rotation0, a_rotation1, channel_progress(a_rotation_timing));
+            vec3 inst_scale = mix(a_scale0, a_scale1, channel_progress(a_scale_timing));
+            v_color = mix(a_color0, a_color1, channel_progress(a_color_timing));
+            
+            vec3 p = position * inst_scale;
+            float c = cos(inst_rotation);
+            float s = sin(inst_rotation);
+            p = vec3(c * p.x - s * p.y, s * p.x + c * p.y, p.z) + inst_position;
+            gl_Position = projection_matrix * vec4(p, 1.0);
+        }
+        """
+        
+        self.animated_program = self.ctx.program(
+            vertex_shader=self.animated_vertex_shader,
+            fragment_shader=self.batch_fragment_shader
+        )
+        
+        # 静态层合成着色器：全屏四边形按像素取回烘焙的颜色和深度
+        self.layer_program = self.ctx.program(
+            vertex_shader="""
+            #version 330 core
+            
+            in vec2 position;
+            
+            void main() {
+                gl_Position = vec4(position, 0.0, 1.0);
+            }
+            """,
+            fragment_shader="""
+            #version 330 core
+            
+            uniform sampler2D layer_color;
+            uniform sampler2D layer_depth;
+            
+            out vec4 fragColor;
+            
+            void main() {
+                ivec2 pixel = ivec2(gl_FragCoord.xy);
+                fragColor = vec4(texelFetch(layer_color, pixel, 0).rgb, 1.0);
+                gl_FragDepth = texelFetch(layer_depth, pixel, 0).r;
+            }
+            """
+        )
+        self.layer_program['layer_color'].value = 0
+        self.layer_program['layer_depth'].value = 1
+        self._layer_quad = self.ctx.buffer(np.array([-1, -1, 1, -1, -1, 1, 1, 1], dtype=np.float32).tobytes())
+        self._layer_vao = self.ctx.vertex_array(self.layer_program, [(self._layer_quad, '2f', 'position')])
+        # 静态层的离屏颜色和深度纹理，第一次烘焙时创建
+        self._layer_fbo = None
+        
+        # 实例化网格缓存：mesh_key -> [mesh_vbo, instance_vbo, vao, 网格字节, 实例容量]
+        self._mesh_cache: Dict[Hashable, list] = {}
+        # 变形网格缓存：mesh_key -> [source_vbo, target_vbo, instance_vbo, vao, 起止顶点字节, 实例容量]
+        self._morph_cache: Dict[Hashable, list] = {}
+        # GPU动画网格缓存：mesh_key -> [mesh_vbo, param_vbo, vao, 网格字节, 实例容量, 已上传的参数版本]
+        self._animated_cache: Dict[Hashable, list] = {}
+        
+        # 批量渲染的交错缓冲（position + color），容量按需倍增
+        self._batch_capacity = 0
+        self._batch_data = np.empty((0, 3, 6), dtype=np.float32)
+        self._batch_vbo = None
+        self._batch_vao = None
+        
         # 设置投影矩阵（正交投影，类似ManimGL的坐标系统）
         self.setup_projection()
         
+        self._identity = np.eye(4, dtype=np.float32)
+        
+        # 常驻GPU缓冲池：key -> [vbo, vao, 上次上传的顶点字节]
+        # 跨帧复用，只在顶点数据变化时重写，由Scene.add/Scene.remove管理生命周期
+        self._buffer_cache: Dict[Hashable, list] = {}
+        
+    @staticmethod
+    def _create_standalone_context() -> mgl.Context:
+        """创建独立OpenGL上下文
+        
+        优先使用EGL（无需显示设备，可配合Mesa llvmpipe软件渲染），
+        不可用时回退到平台默认后端
+        """
+        try:
+            return mgl.create_standalone_context(backend='egl')
+        except Exception:
+            return mgl.create_standalone_context()
+            
     def setup_projection(self):
         """设置投影矩阵 - 使用类似ManimGL的坐标系统"""
-        # 类似ManimGL：屏幕高度为8个单位，中心为原点
-        frame_height = 8.0
-        aspect_ratio = self.width / self.height
-        frame_width = frame_height * aspect_ratio
-        
-        # 正交投影矩阵
-        left = -frame_width / 2
-        right = frame_width / 2
-        bottom = -frame_height / 2
-        top = frame_height / 2
-        near = -10.0
-        far = 10.0
-        
-        projection_matrix = np.array([
-            [2/(right-left), 0, 0, -(right+left)/(right-left)],
-            [0, 2/(top-bottom), 0, -(top+bottom)/(top-bottom)],
-            [0, 0, -2/(far-near), -(far+near)/(far-near)],
-            [0, 0, 0, 1]
-        ], dtype=np.float32)
-        
-        self.program['projection_matrix'] = projection_matrix.flatten()
+        projection_matrix = self.projection_matrix = orthographic_projection(self.width, self.height)
+        
+        # GLSL的mat4按列主序读取，上传转置后的数据
+        projection_data = np.ascontiguousarray(projection_matrix.T).tobytes()
+        self.program['projection_matrix'].write(projection_data)
+        self.batch_program['projection_matrix'].write(projection_data)
+        self.instance_program['projection_matrix'].write(projection_data)
+        self.animated_program['projection_matrix'].write(projection_data)
+        self.morph_program['projection_matrix'].write(projection_data)
         
     def clear_screen(self):
         """清空屏幕"""
         self.ctx.clear(*self.clear_color)
         
-    def draw_triangle(self, vertices: np.ndarray, color: Tuple[float, float, float] = (1.0, 0.0, 0.0), transform_matrix: np.ndarray = None):
+    def create_buffer(self, key: Hashable, vertices: np.ndarray):
+        """为key分配常驻的顶点缓冲（已存在时仅在数据变化时更新）"""
+        data = np.ascontiguousarray(vertices, dtype=np.float32).tobytes()
+        entry = self._buffer_cache.get(key)
+        
+        if entry is not None and len(entry[2]) == len(data):
+            # 数据未变化时不做任何GPU操作
+            if entry[2] != data:
+                entry[0].write(data)
+                entry[2] = data
+            return entry[1]
+            
+        # 首次分配，或顶点数量变化需要重新分配
+        if entry is not None:
+            self.release_buffer(key)
+        vbo = self.ctx.buffer(data)
+        vao = self.ctx.vertex_array(self.program, [(vbo, '3f', 'position')])
+        self._buffer_cache[key] = [vbo, vao, data]
+        return vao
+        
+    def release_buffer(self, key: Hashable):
+        """释放key对应的常驻缓冲"""
+        entry = self._buffer_cache.pop(key, None)
+        if entry is not None:
+            entry[1].release()
+            entry[0].release()
+            
+    def release_all_buffers(self):
+        """释放所有常驻缓冲"""
+        for key in list(self._buffer_cache):
+            self.release_buffer(key)
+            
+    def draw_triangle(self, vertices: np.ndarray, color: Tuple[float, float, float] = (1.0, 0.0, 0.0), transform_matrix: np.ndarray = None, key: Hashable = None):
         """绘制三角形
         
         Args:
             vertices: 3x3的顶点数组 [[x1,y1,z1], [x2,y2,z2], [x3,y3,z3]]
             color: RGB颜色值
             transform_matrix: 4x4变换矩阵，如果为None则使用单位矩阵
+            key: 常驻缓冲的键（通常是几何对象本身），为None时使用一次性缓冲
         """
+        # 设置变换矩阵（转置为GLSL的列主序）
+        if transform_matrix is None:
+            transform_matrix = self._identity
+            
+        self.program['transform_matrix'].write(np.ascontiguousarray(transform_matrix.T, dtype=np.float32))
+        self.program['color'] = color
+        
+        if key is not None:
+            # 复用常驻缓冲，数据变化时才重新上传
+            self.create_buffer(key, vertices).render()
+            return
+            
         # 确保顶点数据是正确的格式
         vertices = np.array(vertices, dtype=np.float32).flatten()
         
@@ -107,13 +382,6 @@ class Renderer:
         vbo = self.ctx.buffer(vertices)
         vao = self.ctx.vertex_array(self.program, [(vbo, '3f', 'position')])
         
-        # 设置变换矩阵
-        if transform_matrix is None:
-            transform_matrix = np.eye(4, dtype=np.float32)
-        
-        self.program['transform_matrix'] = transform_matrix.flatten()
-        self.program['color'] = color
-        
         # 渲染三角形
         vao.render()
         
@@ -121,12 +389,220 @@ class Renderer:
         vbo.release()
         vao.release()
         
+    def _reserve_batch(self, count: int) -> np.ndarray:
+        """确保批量缓冲至少能容纳count个三角形，返回对应的CPU端视图"""
+        if count > self._batch_capacity:
+            capacity = max(count, self._batch_capacity * 2, 64)
+            if self._batch_vbo is not None:
+                self._batch_vao.release()
+                self._batch_vbo.release()
+            self._batch_vbo = self.ctx.buffer(reserve=capacity * 3 * 6 * 4, dynamic=True)
+            self._batch_vao = self.ctx.vertex_array(
+                self.batch_program, [(self._batch_vbo, '3f 3f', 'position', 'color')]
+            )
+            self._batch_data = np.empty((capacity, 3, 6), dtype=np.float32)
+            self._batch_capacity = capacity
+        return self._batch_data[:count]
+        
+    def draw_triangles(self, vertices: np.ndarray, colors: np.ndarray):
+        """批量绘制三角形 - 一次上传、一次draw call
+        
+        Args:
+            vertices: (N,3,3)的已变换顶点数组
+            colors: (N,3)的RGB颜色数组
+        """
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3, 3)
+        count = len(vertices)
+        if count == 0:
+            return
+            
+        # 打包为交错格式：每个顶点 [x, y, z, r, g, b]
+        data = self._reserve_batch(count)
+        data[:, :, :3] = vertices
+        data[:, :, 3:] = np.asarray(colors, dtype=np.float32).reshape(-1, 1, 3)
+        
+        self._batch_vbo.write(data)
+        self._batch_vao.render(vertices=count * 3)
+        
+    def draw_instanced(self, mesh_key: Hashable, base_vertices: np.ndarray, instances: np.ndarray):
+        """实例化绘制同一网格的多个副本
+        
+        Args:
+            mesh_key: 网格的键，同一键的基础顶点只上传一次
+            base_vertices: 未变换的基础顶点 (3,3)
+            instances: (N,10)的逐实例数据 [position(3), rotation(1), scale(3), color(3)]
+        """
+        instances = np.ascontiguousarray(instances, dtype=np.float32).reshape(-1, self.INSTANCE_SIZE)
+        count = len(instances)
+        if count == 0:
+            return
+            
+        mesh_data = np.ascontiguousarray(base_vertices, dtype=np.float32).tobytes()
+        entry = self._mesh_cache.get(mesh_key)
+        if entry is not None and (entry[3] != mesh_data or entry[4] < count):
+            # 网格变化或实例缓冲不足时重新分配
+            capacity = max(count, entry[4] * 2) if entry[4] < count else entry[4]
+            self.release_mesh(mesh_key)
+            entry = None
+        else:
+            capacity = max(count, 64)
+            
+        if entry is None:
+            mesh_vbo = self.ctx.buffer(mesh_data)
+            instance_vbo = self.ctx.buffer(reserve=capacity * self.INSTANCE_SIZE * 4, dynamic=True)
+            vao = self.ctx.vertex_array(self.instance_program, [
+                (mesh_vbo, '3f', 'position'),
+                (instance_vbo, '3f 1f 3f 3f/i', 'inst_position', 'inst_rotation', 'inst_scale', 'inst_color'),
+            ])
+            entry = [mesh_vbo, instance_vbo, vao, mesh_data, capacity]
+            self._mesh_cache[mesh_key] = entry
+            
+        entry[1].write(instances)
+        entry[2].render(vertices=len(mesh_data) // 12, instances=count)
+        
+    def draw_morph(self, mesh_key: Hashable, source_vertices: np.ndarray, target_vertices: np.ndarray, instances: np.ndarray, progress: float):
+        """实例化绘制变形中的网格：起止顶点只上传一次，每帧只更新实例数据和进度
+        
+        Args:
+            mesh_key: 变形组的键
+            source_vertices, target_vertices: 起止顶点 (3,3)
+            instances: (N,10)的逐实例数据，同draw_instanced
+            progress: 缓动后的变形进度
+        """
+        instances = np.ascontiguousarray(instances, dtype=np.float32).reshape(-1, self.INSTANCE_SIZE)
+        count = len(instances)
+        if count == 0:
+            return
+        source = np.ascontiguousarray(source_vertices, dtype=np.float32).tobytes()
+        target = np.ascontiguousarray(target_vertices, dtype=np.float32).tobytes()
+        entry = self._morph_cache.get(mesh_key)
+        if entry is not None and (entry[4] != source + target or entry[5] < count):
+            capacity = max(count, entry[5] * 2) if entry[5] < count else entry[5]
+            self.release_mesh(mesh_key)
+            entry = None
+        else:
+            capacity = max(count, 64)
+            
+        if entry is None:
+            source_vbo = self.ctx.buffer(source)
+            target_vbo = self.ctx.buffer(target)
+            instance_vbo = self.ctx.buffer(reserve=capacity * self.INSTANCE_SIZE * 4, dynamic=True)
+            vao = self.ctx.vertex_array(self.morph_program, [
+                (source_vbo, '3f', 'position'),
+                (target_vbo, '3f', 'target_position'),
+                (instance_vbo, '3f 1f 3f 3f/i', 'inst_position', 'inst_rotation', 'inst_scale', 'inst_color'),
+            ])
+            entry = [source_vbo, target_vbo, instance_vbo, vao, source + target, capacity]
+            self._morph_cache[mesh_key] = entry
+            
+        entry[2].write(instances)
+        self.morph_program['progress'].value = progress
+        entry[3].render(vertices=len(source) // 12, instances=count)
+        
+    def draw_animated(self, mesh_key: Hashable, base_vertices: np.ndarray, params: np.ndarray, time: float, version: Hashable):
+        """绘制由GPU求值动画的实例
+        
+        Args:
+            mesh_key: 网格的键
+            base_vertices: 未变换的基础顶点 (3,3)
+            params: (N,36)的逐实例动画参数，见gpu_animation.PARAM_SIZE
+            time: 动画时间轴上的当前时刻
+            version: 参数的版本，与上次上传的相同时不再上传（每帧只设置time）
+        """
+        count = len(params)
+        if count == 0:
+            return
+        mesh_data = np.ascontiguousarray(base_vertices, dtype=np.float32).tobytes()
+        entry = self._animated_cache.get(mesh_key)
+        if entry is not None and (entry[3] != mesh_data or entry[4] < count):
+            capacity = max(count, entry[4] * 2) if entry[4] < count else entry[4]
+            self.release_animated(mesh_key)
+            entry = None
+        else:
+            capacity = max(count, 64)
+            
+        if entry is None:
+            mesh_vbo = self.ctx.buffer(mesh_data)
+            param_vbo = self.ctx.buffer(reserve=capacity * PARAM_SIZE * 4, dynamic=True)
+            vao = self.ctx.vertex_array(self.animated_program, [
+                (mesh_vbo, '3f', 'position'),
+                (param_vbo, '3f 1f 3f 3f 3f 1f 3f 3f 4f 4f 4f 4f/i',
+                 'a_position0', 'a_rotation0', 'a_scale0', 'a_color0',
+                 'a_position1', 'a_rotation1', 'a_scale1', 'a_color1',
+                 'a_position_timing', 'a_rotation_timing', 'a_scale_timing', 'a_color_timing'),
+            ])
+            entry = [mesh_vbo, param_vbo, vao, mesh_data, capacity, None]
+            self._animated_cache[mesh_key] = entry
+            
+        if entry[5] != version:
+            entry[1].write(np.ascontiguousarray(params, dtype=np.float32))
+            entry[5] = version
+        self.animated_program['time'].value = time
+        entry[2].render(vertices=len(mesh_data) // 12, instances=count)
+        
+    def release_animated(self, mesh_key: Hashable):
+        """释放GPU动画网格及其参数缓冲"""
+        entry = self._animated_cache.pop(mesh_key, None)
+        if entry is not None:
+            entry[2].release()
+            entry[1].release()
+            entry[0].release()
+            
+    def release_mesh(self, mesh_key: Hashable):
+        """释放实例化网格（或变形网格）及其实例缓冲"""
+        entry = self._mesh_cache.pop(mesh_key, None)
+        if entry is not None:
+            entry[2].release()
+            entry[1].release()
+            entry[0].release()
+        entry = self._morph_cache.pop(mesh_key, None)
+        if entry is not None:
+            for resource in entry[3::-1]:
+                resource.release()
+                
+    def begin_layer(self):
+        """开始烘焙静态层：清空离屏纹理，之后的绘制都写入其中，直到end_layer"""
+        if self._layer_fbo is None:
+            self._layer_color = self.ctx.texture((self.width, self.height), 4)
+            self._layer_depth = self.ctx.depth_texture((self.width, self.height))
+            # texelFetch直接读取深度值，不做比较
+            self._layer_depth.compare_func = ''
+            self._layer_fbo = self.ctx.framebuffer(self._layer_color, self._layer_depth)
+        self._layer_fbo.use()
+        self.clear_screen()
+        
+    def end_layer(self):
+        """结束烘焙，恢复绘制到画面"""
+        self.fbo.use()
+        
+    def draw_layer(self):
+        """用一个全屏四边形把静态层的颜色和深度写入画面（代替clear_screen）"""
+        self._layer_color.use(0)
+        self._layer_depth.use(1)
+        # 深度按纹理原样写入，不与画面中已有的深度比较
+        self.ctx.depth_func = '1'
+        self._layer_vao.render(mgl.TRIANGLE_STRIP)
+        self.ctx.depth_func = '<'
+        
     def present(self):
-        """将渲染结果显示到屏幕"""
-        pg.display.flip()
+        """将渲染结果显示到屏幕（无窗口模式下结果保留在离屏帧缓冲中）"""
+        if not self.headless:
+            self._pg.display.flip()
+            
+    def read_pixels(self) -> np.ndarray:
+        """读取当前帧为(H,W,3)的uint8数组，第一行为画面顶部"""
+        data = self.fbo.read(components=3, alignment=1)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)[::-1]
+        
+    def read_into(self, buffer: np.ndarray):
+        """将当前帧同步读入(H,W,3)的uint8缓冲（OpenGL顺序，第一行为画面底部）"""
+        self.fbo.read_into(buffer, components=3, alignment=1)
         
     def should_quit(self) -> bool:
         """检查是否应该退出程序"""
+        if self.headless:
+            return False
+        pg = self._pg
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 return True
@@ -136,10 +612,34 @@ class Renderer:
         
     def cleanup(self):
         """清理资源"""
-        pg.quit()
+        self.release_all_buffers()
+        for mesh_key in list(self._mesh_cache) + list(self._morph_cache):
+            self.release_mesh(mesh_key)
+        for mesh_key in list(self._animated_cache):
+            self.release_animated(mesh_key)
+        if self._batch_vbo is not None:
+            self._batch_vao.release()
+            self._batch_vbo.release()
+            self._batch_vbo = None
+            self._batch_vao = None
+            self._batch_capacity = 0
+        if self._layer_fbo is not None:
+            self._layer_fbo.release()
+            self._layer_color.release()
+            self._layer_depth.release()
+            self._layer_fbo = None
+        self._layer_vao.release()
+        self._layer_quad.release()
+        if self.headless:
+            self.fbo.release()
+            self.ctx.release()
+        else:
+            self._pg.quit()
 
 
 if __name__ == "__main__":
+    import pygame as pg
+    
     # 测试代码：渲染一个红色三角形
     renderer = Renderer()
     
@@ -2,51 +2,243 @@
 Mini Animation Engine MVP - Scene Module
 场景管理系统，管理多个几何对象和动画
 """
-from typing import List, Optional
-import time
+from typing import Callable, List, Optional
+import numpy as np
 from .renderer import Renderer
-from .geometry import Triangle
-from .animation import TimeManager, Animation
+from .software_renderer import SoftwareRenderer
+from .geometry import Triangle, TransformStore, transform_vertices
+from .registry import ObjectRegistry
+from .animation import TimeManager, Animation, MorphAnimation
+from .clock import WallClock, FrameClock, _TIME_EPSILON
+from .export import FrameExporter
+from .scheduler import FrameScheduler
+from .timeline import Timeline
+from .gpu_animation import GpuAnimationSet
+from .culling import SpatialGrid, frame_bounds, vertex_bounds
 
 
 class Scene:
     """场景类 - 管理多个几何对象和动画播放"""
     
-    def __init__(self, renderer: Renderer):
+    # 支持的渲染路径
+    RENDER_MODES = ('batched', 'immediate', 'instanced', 'gpu_transform', 'gpu_animation')
+    
+    def __init__(self, renderer: Renderer, render_mode: str = 'batched', clock=None, target_fps: float = 60.0):
+        """初始化场景
+        
+        Args:
+            renderer: 渲染器
+            render_mode: 渲染路径，见render_mode属性
+            clock: 时钟对象，默认为实时时钟；离线导出时使用FrameClock
+            target_fps: 实时预览的目标帧率
+        """
         self.renderer = renderer
-        self.objects: List[Triangle] = []
-        self.time_manager = TimeManager()
+        # 所有成员的变换和颜色集中保存在场景的结构数组中，注册表维护成员和绘制顺序
+        self.store = TransformStore(64)
+        self.registry = ObjectRegistry(self.store)
+        # 成员原始顶点的堆叠缓存，以及变换后顶点的复用缓冲
+        self._mesh_stack = np.empty((0, 3, 3), dtype=np.float32)
+        self._mesh_stack_key = None
+        self._vertex_buffer = np.empty((0, 3, 3), dtype=np.float32)
+        self.clock = clock if clock is not None else WallClock()
+        self.time_manager = TimeManager(self.clock)
+        # 帧调度：实时时钟下按目标帧率限速并自适应跳帧
+        self.scheduler = FrameScheduler(target_fps)
+        self.scheduler.pacing = self.clock.realtime
+        # 导出时每帧画面交给exporter写出
+        self.exporter: Optional[FrameExporter] = None
+        # 已渲染的帧数
+        self.frame_index = 0
+        # 编译时间线时play/wait只被记录，不播放
+        self.recorder: Optional[Timeline] = None
+        # 脏标记：场景成员/背景/渲染路径的修改计数，以及上一次渲染时的状态
+        self._scene_version = 0
+        self._rendered_state = None
         self.background_color = (0.2, 0.2, 0.2, 1.0)
+        self.render_mode = render_mode
+        # 实例化渲染时上一帧使用的网格键，用于释放不再使用的网格
+        self._instanced_meshes = set()
+        # 按基础网格分组的成员行号缓存
+        self._mesh_groups = {}
+        self._mesh_groups_key = None
+        # 由GPU求值的动画，以及GPU动画路径按网格分组的逐实例参数缓存
+        self.gpu_animations = GpuAnimationSet()
+        self._animated_params = {}
+        self._animated_key = None
+        self._animated_version = 0
+        self._animated_meshes = set()
+        # 正在由实例化路径在GPU上混合顶点的变形动画，及其分组缓存：网格键 -> (起始顶点, 目标顶点, 动画, 行号)
+        self._gpu_morphs: List[MorphAnimation] = []
+        self._morph_groups = {}
+        # 静态对象烘焙到离屏纹理，每帧用一个全屏四边形合成；记录烘焙时的 (行号, 最大修改戳, 背景, 渲染路径)
+        self._static = set()
+        self._static_mask = None
+        self._static_mask_key = None
+        self._baked_layer = None
+        # 本次绘制的成员在绘制顺序中的下标（None为全部），以及区分不同选择的缓存键
+        self._draw_indices: Optional[np.ndarray] = None
+        self._draw_key = None
+        self._baking = False
+        # 视锥剔除：成员包围盒的空间索引（按修改戳增量更新），只绘制与画面相交的成员
+        self.culling = True
+        self._grid = SpatialGrid()
+        self._grid_key = None
+        self._grid_stamp = 0
+        self._visible_mask = None
+        self._visible_key = None
+        self._visible_version = 0
+        self._culled_count = 0
+        self._unculled_mask = None
+        self._unculled_key = None
+        
+    @property
+    def render_mode(self) -> str:
+        """当前渲染路径
+        
+        - 'batched': 所有对象打包后一次draw call
+        - 'immediate': 逐对象绘制CPU变换后的顶点
+        - 'instanced': 按基础网格分组实例化绘制
+        - 'gpu_transform': 逐对象绘制静态顶点缓冲，变换矩阵作为uniform在GPU上应用
+        - 'gpu_animation': 按基础网格分组实例化绘制，animate_on_gpu的动画由着色器求值，
+          参数只在场景或存储变化时上传
+        """
+        return self._render_mode
+        
+    @render_mode.setter
+    def render_mode(self, mode: str):
+        if mode not in self.RENDER_MODES:
+            raise ValueError(f"未知的渲染模式: {mode}，可选: {', '.join(self.RENDER_MODES)}")
+        self._render_mode = mode
+        self.mark_dirty()
+        
+    def mark_dirty(self):
+        """强制下一帧重新渲染（用于未被自动追踪的修改，如直接改写位置数组元素）"""
+        self._scene_version += 1
+        self._baked_layer = None
+        
+    def set_static(self, *objects, static: bool = True):
+        """把对象标记为静态（也可传入对象列表）
+        
+        静态对象只在被添加、移除或修改时重新烘焙到离屏纹理，其余帧合成一次纹理，
+        每帧的开销只与动态对象的数量有关。静态层连同深度一起合成，相当于静态对象排在绘制顺序的最前面；
+        正在GPU上动画或变形的对象按动态对象绘制。
+        """
+        objects = _flatten(objects)
+        if static:
+            self._static.update(objects)
+        else:
+            self._static.difference_update(objects)
+        self._scene_version += 1
+        return self
+        
+    def _state(self) -> tuple:
+        """当前画面状态：场景修改计数 + 成员存储的最大修改戳（有GPU动画时加上当前时刻）"""
+        state = (self._scene_version, self.store.version)
+        if self._gpu_morphs:
+            state += tuple(morph.progress for morph in self._gpu_morphs)
+        if self.gpu_animations:
+            state += (self.clock.time(),)
+        return state
+        
+    @property
+    def objects(self) -> List[Triangle]:
+        """场景中的对象（按绘制顺序的新列表）"""
+        return list(self.registry)
+        
+    def _rows(self) -> np.ndarray:
+        """成员在存储中的行号（按绘制顺序）"""
+        return self.registry.rows()
+        
+    def get_transformed_vertices(self, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """所有成员变换后的顶点，按绘制顺序排列的(N,3,3) float32数组
+        
+        整个场景的变换是一次矩阵运算，结果写入复用的缓冲，下一次调用时会被覆盖
+        
+        Args:
+            indices: 只变换绘制顺序中这些下标的成员
+        """
+        rows = self._rows()
+        key = (self._scene_version, self.store.mesh_version)
+        if self._mesh_stack_key != key:
+            if self.registry:
+                self._mesh_stack = np.stack([obj.original_vertices for obj in self.registry])
+            else:
+                self._mesh_stack = np.empty((0, 3, 3), dtype=np.float32)
+            self._mesh_stack_key = key
+        meshes = self._mesh_stack
+        if indices is not None:
+            rows = rows[indices]
+            meshes = meshes[indices]
+        count = len(rows)
+        if len(self._vertex_buffer) < count:
+            self._vertex_buffer = np.empty((max(count, 2 * len(self._vertex_buffer)), 3, 3), dtype=np.float32)
+        return transform_vertices(meshes, self.store.matrices(rows), out=self._vertex_buffer[:count])
+        
+    def set_clock(self, clock):
+        """切换时钟（例如导出时切换为逐帧时钟）"""
+        self.clock = clock
+        self.time_manager.clock = clock
+        self.scheduler.pacing = clock.realtime
+        return self
         
     def add(self, *objects):
-        """添加对象到场景"""
-        for obj in objects:
-            if obj not in self.objects:
-                self.objects.append(obj)
+        """添加对象到场景（也可传入对象列表批量添加）"""
+        added = self.registry.add(_flatten(objects))
+        if added:
+            # 逐对象绘制时为对象分配常驻顶点缓冲，以对象id为键
+            if self.render_mode == 'immediate':
+                for obj in added:
+                    self.renderer.create_buffer(self.registry.id_of(obj), obj.get_vertices())
+            elif self.render_mode == 'gpu_transform':
+                for obj in added:
+                    self.renderer.create_buffer(self.registry.id_of(obj), obj.original_vertices)
+            self._scene_version += 1
         return self
         
     def remove(self, *objects):
-        """从场景中移除对象"""
-        for obj in objects:
-            if obj in self.objects:
-                self.objects.remove(obj)
+        """从场景中移除对象（也可传入对象列表批量移除）"""
+        objects = _flatten(objects)
+        if self.gpu_animations:
+            self.gpu_animations.discard([obj.transform for obj in objects])
+        removed = self.registry.remove(objects)
+        if removed:
+            for _, object_id in removed:
+                self.renderer.release_buffer(object_id)
+            self._scene_version += 1
         return self
         
     def clear(self):
         """清空场景中的所有对象"""
-        self.objects.clear()
+        for _, object_id in self.registry.clear():
+            self.renderer.release_buffer(object_id)
         self.time_manager.clear()
+        self.gpu_animations.clear()
+        self._static.clear()
+        self._scene_version += 1
         
     def play(self, *animations: Animation, run_time: Optional[float] = None):
         """播放动画序列"""
-        # 添加动画到时间管理器
+        if self.recorder is not None:
+            self.recorder.record_play(list(animations), run_time)
+            return
+            
+        # 添加动画到时间管理器，并以当前时刻作为动画起点
         for animation in animations:
             self.time_manager.add_animation(animation)
+        # 实例化路径下变形的起止顶点只上传一次，由着色器按进度混合
+        if self.render_mode == 'instanced':
+            self._gpu_morphs = [animation for animation in animations if isinstance(animation, MorphAnimation)]
+            for morph in self._gpu_morphs:
+                morph.gpu = True
+            if self._gpu_morphs:
+                self._scene_version += 1
+        self.time_manager.start_all()
         
         # 如果指定了运行时间，等待指定时间
+        self.scheduler.restart()
         if run_time is not None:
-            start_time = time.time()
-            while time.time() - start_time < run_time:
+            end_time = self.clock.time() + run_time
+            while self.clock.time() < end_time - _TIME_EPSILON:
                 if self.renderer.should_quit():
                     break
                 self._update_and_render()
@@ -57,72 +249,376 @@ class Scene:
                     break
                 self._update_and_render()
                 
+        # 提前结束（指定运行时间或窗口关闭）的变形按当前进度写回顶点
+        if self._gpu_morphs:
+            for morph in self._gpu_morphs:
+                morph.gpu = False
+                if morph.is_started and not morph.is_finished:
+                    morph.apply(morph.progress)
+            self._gpu_morphs = []
+            self._scene_version += 1
+            
         # 清空动画队列
         self.time_manager.clear()
         
+    def animate_on_gpu(self, *animations: Animation, loop: str = 'once'):
+        """在GPU上播放位置、旋转、缩放和颜色动画，立即返回
+        
+        动画从当前时刻开始，与之后的play/wait同时进行。起止值、时序和缓动编号只上传一次，
+        'gpu_animation'渲染路径下由着色器按当前时刻求值，CPU每帧的开销与动画数量无关；
+        其他渲染路径在CPU上向量化求值。缓动限于gpu_animation.GPU_EASE_IDS中的函数。
+        GPU求值期间存储中的值不随动画更新，需要读取时调用sync_gpu_animations()。
+        
+        Args:
+            loop: 'once'（播放一次，结束后终值写回存储）、'repeat'（重复）或 'pingpong'（往返）
+        """
+        current_time = self.clock.time()
+        for animation in _flatten(animations):
+            self.gpu_animations.add(animation, current_time, loop)
+        self.mark_dirty()
+        return self
+        
+    def sync_gpu_animations(self):
+        """把GPU动画在当前时刻的值写入存储"""
+        if self.gpu_animations:
+            self.gpu_animations.update(self.store, self.clock.time())
+        return self
+        
     def wait(self, duration: float = 1.0):
         """等待指定时间（类似ManimGL的wait）"""
-        start_time = time.time()
-        while time.time() - start_time < duration:
+        if self.recorder is not None:
+            self.recorder.record_wait(duration)
+            return
+        end_time = self.clock.time() + duration
+        self.scheduler.restart()
+        while self.clock.time() < end_time - _TIME_EPSILON:
             if self.renderer.should_quit():
                 break
             self._update_and_render()
             
     def render_static(self, duration: float = float('inf')):
         """静态渲染场景（不播放动画）"""
-        start_time = time.time()
-        while time.time() - start_time < duration:
+        if self.recorder is not None:
+            self.recorder.record_wait(duration)
+            return
+        end_time = self.clock.time() + duration
+        self.scheduler.restart()
+        while self.clock.time() < end_time - _TIME_EPSILON:
             if self.renderer.should_quit():
                 break
-            self._render_frame()
+            self._run_frame(update=False)
             
     def _update_and_render(self):
-        """更新动画并渲染一帧"""
-        self.time_manager.update()
-        self._render_frame()
-        
-    def _render_frame(self):
-        """渲染一帧"""
-        # 清空屏幕
-        self.renderer.clear_screen()
-        
-        # 渲染所有对象
-        for obj in self.objects:
-            vertices = obj.get_vertices()
-            self.renderer.draw_triangle(vertices, obj.color)
+        """推进时钟，更新动画并渲染一帧"""
+        self._run_frame(update=True)
+        
+    def _run_frame(self, update: bool):
+        """按帧调度执行一帧：推进时钟、更新动画，未落后时渲染，然后等待下一帧"""
+        scheduler = self.scheduler
+        scheduler.begin_frame()
+        self.clock.tick()
+        if update:
+            self.time_manager.update()
+        if self.gpu_animations:
+            # GPU动画路径只需写回结束的通道，其他路径在CPU上求值
+            self.gpu_animations.update(self.store, self.clock.time(), evaluate=self.render_mode != 'gpu_animation')
+        scheduler.end_update()
+        
+        # 落后时跳过渲染，动画已按当前时间更新，下一帧画面仍然正确
+        rendered = scheduler.should_render()
+        reused = False
+        if rendered:
+            reused = not self._render_frame()
+        scheduler.end_frame(rendered, reused)
+        
+    def _render_frame(self, capture: Optional[Callable[[], None]] = None) -> bool:
+        """渲染一帧，画面未变化、复用上一帧时返回False；capture在绘制完成、显示到屏幕之前调用"""
+        self.frame_index += 1
+        
+        # 没有任何修改时跳过变换和绘制：窗口保持上一帧，导出时重复上一帧
+        state = self._state()
+        if state == self._rendered_state:
+            if self.exporter is not None:
+                self.exporter.duplicate()
+            return False
+            
+        # 视锥剔除：只绘制与画面相交的成员
+        visible = self._get_visible_mask() if self.culling and self.registry else None
+        visible_key = None if visible is None else self._visible_version
+        self.scheduler.objects_culled = 0 if visible is None else self._culled_count
+        
+        # 有静态对象时合成静态层代替清屏，之后只绘制动态对象
+        static = self._get_static_mask() if self._static else None
+        if static is not None and static.any():
+            self._composite_static_layer(static if visible is None else static & visible, visible_key)
+            selected = ~static if visible is None else ~static & visible
+            self._draw_key = ('dynamic', self._static_mask_key, visible_key)
+        else:
+            self.renderer.clear_screen()
+            selected = visible
+            self._draw_key = visible_key
+        self._draw_indices = None if selected is None else np.flatnonzero(selected)
+        self._draw_objects(self.render_mode)
+        
+        # 导出当前帧
+        if self.exporter is not None:
+            self.exporter.capture()
+        if capture is not None:
+            capture()
             
         # 显示到屏幕
         self.renderer.present()
+        self._rendered_state = state
+        return True
+        
+    def _draw_objects(self, render_mode: str):
+        """按渲染路径绘制本次选择的成员"""
+        if render_mode == 'batched':
+            self._draw_batched()
+        elif render_mode == 'instanced':
+            self._draw_instanced()
+        elif render_mode == 'gpu_transform':
+            self._draw_gpu_transform()
+        elif render_mode == 'gpu_animation':
+            self._draw_gpu_animation()
+        else:
+            self._draw_immediate()
+            
+    def _get_static_mask(self) -> np.ndarray:
+        """按绘制顺序标记静态层中的成员（成员或GPU动画变化时重新计算）"""
+        key = (self._scene_version, self.gpu_animations.version)
+        if self._static_mask_key != key:
+            static = self._static
+            gpu_animations = self.gpu_animations
+            morphing = {id(target) for morph in self._gpu_morphs for target in morph.targets}
+            self._static_mask = np.fromiter((obj in static and id(obj) not in morphing and obj.transform not in gpu_animations
+                                             for obj in self.registry), dtype=bool, count=len(self.registry))
+            self._static_mask_key = key
+        return self._static_mask
+        
+    def _get_visible_mask(self) -> np.ndarray:
+        """按绘制顺序标记与画面相交的成员
+        
+        修改戳新于上次索引的成员重新计算包围盒并更新空间索引，成员变化时重建索引；
+        索引、画面范围和GPU动画都未变化时复用上一次的结果
+        """
+        registry = self.registry
+        grid = self._grid
+        if self._grid_key != registry.version:
+            grid.rebuild(vertex_bounds(self.get_transformed_vertices()))
+            self._grid_key = registry.version
+        else:
+            dirty = np.flatnonzero(self.store.versions[self._rows()] > self._grid_stamp)
+            if len(dirty):
+                grid.update(dirty, vertex_bounds(self.get_transformed_vertices(dirty)))
+        self._grid_stamp = self.store.version
+        
+        rect = frame_bounds(self.renderer.projection_matrix)
+        key = (grid.version, rect, self._scene_version, self.gpu_animations.version)
+        if self._visible_key != key:
+            visible = np.zeros(len(registry), dtype=bool)
+            visible[grid.query(rect)] = True
+            # 在GPU上动画或变形的成员，存储中的值不代表画面上的位置，不剔除
+            if self.gpu_animations or self._gpu_morphs:
+                visible |= self._get_unculled_mask()
+            if self._visible_mask is None or not np.array_equal(visible, self._visible_mask):
+                self._visible_mask = visible
+                self._visible_version += 1
+                self._culled_count = len(visible) - int(np.count_nonzero(visible))
+            self._visible_key = key
+        return self._visible_mask
+        
+    def _get_unculled_mask(self) -> np.ndarray:
+        """按绘制顺序标记不参与剔除的成员（GPU动画或GPU变形中的成员）"""
+        key = (self._scene_version, self.gpu_animations.version)
+        if self._unculled_key != key:
+            gpu_animations = self.gpu_animations
+            morphing = {id(target) for morph in self._gpu_morphs for target in morph.targets}
+            self._unculled_mask = np.fromiter((id(obj) in morphing or obj.transform in gpu_animations for obj in self.registry),
+                                              dtype=bool, count=len(self.registry))
+            self._unculled_key = key
+        return self._unculled_mask
+        
+    def _composite_static_layer(self, static: np.ndarray, visible_key=None):
+        """静态层变化时重新烘焙，然后合成到画面（只烘焙static标记的成员）"""
+        rows = self._rows()[static]
+        version = int(self.store.versions[rows].max()) if len(rows) else 0
+        baked = self._baked_layer
+        if (baked is None or version != baked[1] or self.background_color != baked[2]
+                or self.render_mode != baked[3] or not np.array_equal(rows, baked[0])):
+            self.renderer.begin_layer()
+            self._draw_indices = np.flatnonzero(static)
+            self._draw_key = ('static', self._static_mask_key, visible_key)
+            self._baking = True
+            # 静态对象没有GPU动画，按存储中的值实例化绘制
+            self._draw_objects('instanced' if self.render_mode == 'gpu_animation' else self.render_mode)
+            self._baking = False
+            self.renderer.end_layer()
+            self._baked_layer = (rows, version, self.background_color, self.render_mode)
+            self.scheduler.layer_bakes += 1
+        self.renderer.draw_layer()
+        
+    def _selected_items(self):
+        """本次绘制的 (成员, id)，按绘制顺序"""
+        if self._draw_indices is None:
+            return self.registry.items()
+        items = self.registry.item_list()
+        return [items[index] for index in self._draw_indices]
         
-        # 控制帧率
-        import pygame as pg
-        pg.time.Clock().tick(60)
+    def _draw_immediate(self):
+        """逐对象绘制，每个对象使用自己的常驻缓冲"""
+        vertices = self.get_transformed_vertices(self._draw_indices)
+        for (obj, object_id), obj_vertices in zip(self._selected_items(), vertices):
+            self.renderer.draw_triangle(obj_vertices, obj.color, key=object_id)
+            
+    def _draw_gpu_transform(self):
+        """逐对象绘制未变换的静态顶点缓冲，每帧只上传变换矩阵"""
+        for obj, object_id in self._selected_items():
+            self.renderer.draw_triangle(obj.original_vertices, obj.color, obj.transform.get_matrix(), key=object_id)
+            
+    def _draw_batched(self):
+        """将所有对象打包到一个交错缓冲中，一次draw call完成绘制"""
+        indices = self._draw_indices
+        if not self.registry or (indices is not None and not len(indices)):
+            return
+        vertices = self.get_transformed_vertices(indices)
+        rows = self._rows() if indices is None else self._rows()[indices]
+        self.renderer.draw_triangles(vertices, self.store.colors[rows])
+        
+    def _group_by_mesh(self) -> dict:
+        """按基础网格分组：网格键 -> (基础顶点, 存储行号数组)，成员、顶点或行号不变时复用
+        
+        正在GPU变形的对象不在其中，按 (动画, 起止顶点) 分组到self._morph_groups
+        """
+        key = (self._scene_version, self.store.mesh_version, self.store.layout_version, self._draw_key)
+        if self._mesh_groups_key == key:
+            return self._mesh_groups
+        groups = {}
+        # 共享同一顶点数组的对象只计算一次网格键
+        mesh_keys = {}
+        morphing = {}
+        for morph in self._gpu_morphs:
+            for index, (source, destination, indices) in enumerate(morph.groups):
+                for target in indices:
+                    morphing[id(morph.targets[target])] = (('morph', id(morph), index), source, destination, morph)
+        morph_groups = {}
+        for obj, _ in self._selected_items():
+            morph = morphing.get(id(obj))
+            if morph is not None:
+                group = morph_groups.get(morph[0])
+                if group is None:
+                    morph_groups[morph[0]] = group = (morph[1], morph[2], morph[3], [])
+                group[3].append(obj.transform._row)
+                continue
+            mesh = obj.original_vertices
+            mesh_key = mesh_keys.get(id(mesh))
+            if mesh_key is None:
+                mesh_key = mesh_keys[id(mesh)] = mesh.tobytes()
+            group = groups.get(mesh_key)
+            if group is None:
+                groups[mesh_key] = group = (obj.original_vertices, [])
+            group[1].append(obj.transform._row)
+        self._mesh_groups = {mesh_key: (base_vertices, np.array(rows, dtype=np.intp)) for mesh_key, (base_vertices, rows) in groups.items()}
+        self._morph_groups = {mesh_key: (source, destination, morph, np.array(rows, dtype=np.intp))
+                              for mesh_key, (source, destination, morph, rows) in morph_groups.items()}
+        self._mesh_groups_key = key
+        return self._mesh_groups
+        
+    def _draw_instanced(self):
+        """按基础网格分组，每组一次实例化draw call，变换在GPU上完成"""
+        groups = self._group_by_mesh()
+        # 实例数据直接从存储的整列按行收集
+        for mesh_key, (base_vertices, rows) in groups.items():
+            instances = self.store.instance_data(rows)
+            self.renderer.draw_instanced(mesh_key, base_vertices, instances)
+        # 变形中的对象：起止顶点常驻GPU，每帧只更新实例数据和进度
+        morph_groups = self._morph_groups if self._gpu_morphs else {}
+        for mesh_key, (source, destination, morph, rows) in morph_groups.items():
+            self.renderer.draw_morph(mesh_key, source, destination, self.store.instance_data(rows), morph.progress)
+            
+        # 释放本帧不再使用的网格（烘焙静态层时不释放动态对象的网格）
+        if self._baking:
+            return
+        used = set(groups).union(morph_groups)
+        for mesh_key in self._instanced_meshes.difference(used):
+            self.renderer.release_mesh(mesh_key)
+        self._instanced_meshes = used
+        
+    def _draw_gpu_animation(self):
+        """按基础网格分组实例化绘制，动画由着色器按当前时刻求值
+        
+        逐实例参数只在场景、存储或GPU动画变化时重新收集和上传，其余帧只设置时间uniform
+        """
+        groups = self._group_by_mesh()
+        key = (self._scene_version, self.store.version, self.gpu_animations.version, self._draw_key)
+        if self._animated_key != key:
+            self._animated_params = {mesh_key: self.gpu_animations.instance_params(self.store, rows)
+                                     for mesh_key, (_, rows) in groups.items()}
+            self._animated_key = key
+            self._animated_version += 1
+            
+        time = self.gpu_animations.local_time(self.clock.time())
+        for mesh_key, (base_vertices, _) in groups.items():
+            self.renderer.draw_animated(mesh_key, base_vertices, self._animated_params[mesh_key], time, self._animated_version)
+            
+        for mesh_key in self._animated_meshes.difference(groups):
+            self.renderer.release_animated(mesh_key)
+        self._animated_meshes = set(groups)
         
     def set_background_color(self, color):
         """设置背景颜色"""
         self.background_color = color
         self.renderer.clear_color = color
+        self.mark_dirty()
         return self
         
     def get_objects(self) -> List[Triangle]:
         """获取场景中的所有对象"""
-        return self.objects.copy()
+        return self.objects
         
     def get_object_count(self) -> int:
         """获取对象数量"""
-        return len(self.objects)
+        return len(self.registry)
         
     def is_empty(self) -> bool:
         """检查场景是否为空"""
-        return len(self.objects) == 0
+        return len(self.registry) == 0
+
+
+def _flatten(objects) -> list:
+    """展开add/remove的参数：既可以逐个传入对象，也可以传入对象列表"""
+    flat = []
+    for obj in objects:
+        if isinstance(obj, (list, tuple)):
+            flat.extend(obj)
+        else:
+            flat.append(obj)
+    return flat
 
 
 class MiniAnimationEngine:
     """Mini Animation Engine 主类 - 类似ManimGL的Scene基类"""
     
-    def __init__(self, width: int = 1200, height: int = 800, title: str = "Mini Animation Engine"):
-        self.renderer = Renderer(width, height, title)
-        self.scene = Scene(self.renderer)
+    def __init__(self, width: int = 1200, height: int = 800, title: str = "Mini Animation Engine", render_mode: str = 'batched', headless: bool = False, clock=None, backend: str = 'opengl', target_fps: float = 60.0):
+        """初始化引擎
+        
+        Args:
+            width, height, title: 窗口尺寸和标题
+            render_mode: 场景渲染路径，见Scene.render_mode
+            headless: 无窗口离屏渲染
+            clock: 时钟对象，默认实时时钟
+            backend: 'opengl'（ModernGL）或 'software'（纯NumPy光栅化，总是无窗口）
+            target_fps: 实时预览的目标帧率
+        """
+        if backend == 'software':
+            self.renderer = SoftwareRenderer(width, height, title)
+        elif backend == 'opengl':
+            self.renderer = Renderer(width, height, title, headless=headless)
+        else:
+            raise ValueError(f"未知的渲染后端: {backend}，可选: opengl, software")
+        self.scene = Scene(self.renderer, render_mode, clock, target_fps)
+        # compile_timeline()编译的时间线
+        self.timeline: Optional[Timeline] = None
         
     def add(self, *objects):
         """添加对象到场景"""
@@ -140,6 +636,14 @@ class MiniAnimationEngine:
         """等待"""
         return self.scene.wait(duration)
         
+    def set_static(self, *objects, static: bool = True):
+        """把对象标记为静态，烘焙到静态层（见Scene.set_static）"""
+        return self.scene.set_static(*objects, static=static)
+        
+    def animate_on_gpu(self, *animations, loop: str = 'once'):
+        """在GPU上播放动画，立即返回（见Scene.animate_on_gpu）"""
+        return self.scene.animate_on_gpu(*animations, loop=loop)
+        
     def clear(self):
         """清空场景"""
         return self.scene.clear()
@@ -148,8 +652,79 @@ class MiniAnimationEngine:
         """显示静态场景"""
         self.scene.render_static(duration)
         
+    def render_frame(self) -> np.ndarray:
+        """按场景当前状态渲染一帧，返回(H,W,3)的uint8画面（第一行为画面顶部）"""
+        renderer = self.renderer
+        if renderer.headless:
+            # 离屏帧缓冲保留上一帧，画面未变化时直接读回
+            self.scene._render_frame()
+            return renderer.read_pixels().copy()
+        # 窗口模式下交换缓冲后后台缓冲的内容未定义：总是重新绘制，并在显示之前读回
+        frames = []
+        self.scene._rendered_state = None
+        self.scene._render_frame(capture=lambda: frames.append(renderer.read_pixels().copy()))
+        return frames[0]
+        
+    def frame_stats(self) -> dict:
+        """帧计时统计：实际帧率、渲染/跳过的帧数、超出预算次数、每帧耗时等"""
+        return self.scene.scheduler.stats()
+        
+    def construct(self):
+        """场景内容 - 子类重写，在此添加对象并播放动画（类似ManimGL的Scene.construct）"""
+        pass
+        
+    def compile_timeline(self, fps: float = 60.0) -> Timeline:
+        """执行construct()并编译为时间线，不渲染任何帧
+        
+        之后可以用seek/render_at随机访问任意时刻（拖动预览、乱序或并行渲染、生成缩略图）。
+        编译结束时场景处于时间线的最终状态，场景的时钟为时间线的逐帧时钟。
+        """
+        timeline = Timeline(self.scene, fps)
+        self.scene.set_clock(timeline.clock)
+        self.scene.recorder = timeline
+        try:
+            self.construct()
+        finally:
+            self.scene.recorder = None
+        timeline.finish()
+        self.timeline = timeline
+        return timeline
+        
+    def seek(self, t: float):
+        """把场景设为时间线t时刻的状态（首次调用时编译时间线）"""
+        if self.timeline is None:
+            self.compile_timeline()
+        self.timeline.seek(t)
+        
+    def render_at(self, t: float) -> np.ndarray:
+        """渲染时间线t时刻的单帧，返回(H,W,3)的uint8画面（第一行为画面顶部）"""
+        self.seek(t)
+        return self.render_frame()
+        
+    def start_export(self, output: str, fps: float = 60.0, queue_size: int = 8):
+        """开始导出：切换到逐帧时钟，之后渲染的每一帧都写入output
+        
+        Args:
+            output: 视频文件（如 out.mp4，需要ffmpeg）、PNG序列（如 frames/%05d.png）或原始RGB帧文件
+            fps: 导出帧率
+            queue_size: 等待写入的最大帧数
+        """
+        self.scene.set_clock(FrameClock(fps))
+        self.scene.exporter = FrameExporter(self.renderer, output, fps, queue_size)
+        # 导出的第一帧总是完整渲染
+        self.scene.mark_dirty()
+        
+    def finish_export(self) -> dict:
+        """结束导出，恢复实时时钟，返回统计信息（帧数、耗时、帧/秒）"""
+        stats = self.scene.exporter.close()
+        self.scene.exporter = None
+        self.scene.set_clock(WallClock())
+        return stats
+        
     def cleanup(self):
         """清理资源"""
+        if self.scene.exporter is not None:
+            self.finish_export()
         self.renderer.cleanup()
         
     def set_background_color(self, color):
@@ -0,0 +1,127 @@
+"""
+Mini Animation Engine MVP - Scheduler Module
+帧调度器，负责帧率控制、帧预算统计和自适应跳帧
+"""
+import time
+
+
+class FrameScheduler:
+    """帧调度器 - 以目标帧率驱动更新/渲染循环
+    
+    每帧有固定的截止时间（deadline），提前完成时sleep到截止时间；
+    更新+渲染超出预算、落后超过一帧时跳过渲染（动画仍按当前时间更新），
+    连续跳帧不超过max_skip，保证画面持续刷新。
+    非实时时钟（逐帧导出）下不限速也不跳帧。
+    """
+    
+    def __init__(self, target_fps: float = 60.0, max_skip: int = 4):
+        self.target_fps = target_fps
+        self.max_skip = max_skip
+        # 是否按真实时间限速（由场景根据时钟设置）
+        self.pacing = True
+        self.reset_stats()
+        
+    @property
+    def frame_budget(self) -> float:
+        """每帧的时间预算（秒）"""
+        return 1.0 / self.target_fps
+        
+    def reset_stats(self):
+        """重置计时统计"""
+        # 实际绘制的帧数、落后时跳过的帧数、画面未变化而复用上一帧的帧数（三者互不包含）
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.frames_reused = 0
+        # 静态层重新烘焙的次数（由场景统计）
+        self.layer_bakes = 0
+        # 最近一次渲染时被视锥剔除的对象数（由场景统计）
+        self.objects_culled = 0
+        self.overruns = 0
+        self.last_update_time = 0.0
+        self.last_render_time = 0.0
+        self.average_frame_time = 0.0
+        self._deadline = None
+        self._consecutive_skips = 0
+        self._frame_start = 0.0
+        self._update_end = 0.0
+        self._stats_start = time.perf_counter()
+        
+    def restart(self):
+        """从当前时刻重新计时（每次play/wait等逐帧循环开始前调用），之前的空闲时间不算作落后"""
+        self._deadline = None
+        self._consecutive_skips = 0
+        
+    def begin_frame(self):
+        """开始一帧（在更新动画之前调用）"""
+        self._frame_start = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = self._frame_start
+            
+    def end_update(self):
+        """动画更新完成"""
+        self._update_end = time.perf_counter()
+        self.last_update_time = self._update_end - self._frame_start
+        
+    def should_render(self) -> bool:
+        """本帧是否渲染：落后超过一帧预算时跳过，但不连续跳过超过max_skip帧"""
+        if not self.pacing:
+            return True
+        behind = time.perf_counter() - self._deadline
+        if behind > self.frame_budget and self._consecutive_skips < self.max_skip:
+            self._consecutive_skips += 1
+            return False
+        self._consecutive_skips = 0
+        return True
+        
+    def end_frame(self, rendered: bool = True, reused: bool = False):
+        """结束一帧：记录耗时，并sleep到下一帧的截止时间
+        
+        Args:
+            rendered: 本帧是否进入渲染（should_render的结果）
+            reused: 进入渲染但画面未变化，复用了上一帧
+        """
+        now = time.perf_counter()
+        if rendered:
+            if reused:
+                self.frames_reused += 1
+            else:
+                self.frames_rendered += 1
+            self.last_render_time = now - max(self._update_end, self._frame_start)
+        else:
+            self.frames_skipped += 1
+            self.last_render_time = 0.0
+            
+        work = now - self._frame_start
+        if work > self.frame_budget:
+            self.overruns += 1
+        # 指数滑动平均
+        self.average_frame_time = work if self.average_frame_time == 0.0 else self.average_frame_time * 0.9 + work * 0.1
+        
+        if not self.pacing:
+            return
+            
+        self._deadline += self.frame_budget
+        remaining = self._deadline - now
+        if remaining > 0:
+            time.sleep(remaining)
+        elif -remaining > self.frame_budget * (self.max_skip + 1):
+            # 落后太多（例如窗口被拖动），不再追赶，从当前时刻重新计时
+            self._deadline = now
+            
+    def stats(self) -> dict:
+        """帧计时统计（fps只计实际绘制的帧）"""
+        elapsed = time.perf_counter() - self._stats_start
+        return {
+            'target_fps': self.target_fps,
+            'fps': self.frames_rendered / elapsed if elapsed > 0 else 0.0,
+            'frames_rendered': self.frames_rendered,
+            'frames_skipped': self.frames_skipped,
+            'frames_reused': self.frames_reused,
+            'layer_bakes': self.layer_bakes,
+            'objects_culled': self.objects_culled,
+            'overruns': self.overruns,
+            'budget_ms': self.frame_budget * 1000,
+            'average_frame_ms': self.average_frame_time * 1000,
+            'last_update_ms': self.last_update_time * 1000,
+            'last_render_ms': self.last_render_time * 1000,
+        }
@@ -0,0 +1,250 @@
+"""
+Mini Animation Engine MVP - Software Renderer Module
+纯NumPy的CPU光栅化渲染器，不依赖GPU和OpenGL，接口与Renderer一致
+"""
+import numpy as np
+from typing import Tuple, Hashable
+from .renderer import orthographic_projection
+from .gpu_animation import evaluate_params
+
+
+class SoftwareRenderer:
+    """软件渲染器 - 用向量化的边函数在CPU上光栅化三角形
+    
+    与OpenGL渲染器保持相同的约定：像素中心采样、左上填充规则、深度测试（LESS），
+    帧缓冲第一行为画面底部。适合没有GPU的CI和渲染节点，结果完全确定
+    """
+    
+    INSTANCE_SIZE = 10
+    headless = True
+    
+    # 单批光栅化时边函数网格的最大像素数，控制临时内存
+    BATCH_PIXELS = 1 << 21
+    # 顶点吸附到1/256像素，与常见GPU的亚像素精度一致
+    SUBPIXEL = 256.0
+    
+    def __init__(self, width: int = 1200, height: int = 800, title: str = "Mini Animation Engine", headless: bool = True):
+        self.width = width
+        self.height = height
+        self.title = title
+        
+        # 设置清屏颜色（深灰色背景）
+        self.clear_color = (0.2, 0.2, 0.2, 1.0)
+        
+        self.color_buffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self.depth_buffer = np.ones((height, width), dtype=np.float32)
+        self.setup_projection()
+        
+    def setup_projection(self):
+        """设置投影矩阵 - 使用类似ManimGL的坐标系统"""
+        self.projection_matrix = orthographic_projection(self.width, self.height)
+        
+    def clear_screen(self):
+        """清空屏幕"""
+        # 先填充一行再按行广播，比直接按像素广播3个分量快得多
+        row = np.broadcast_to(_to_unorm8(self.clear_color[:3]), (self.width, 3)).copy()
+        self.color_buffer[:] = row
+        self.depth_buffer.fill(1.0)
+        
+    # 软件渲染没有GPU缓冲，以下接口仅为与Renderer保持一致
+    def create_buffer(self, key: Hashable, vertices: np.ndarray):
+        pass
+        
+    def release_buffer(self, key: Hashable):
+        pass
+        
+    def release_all_buffers(self):
+        pass
+        
+    def release_mesh(self, mesh_key: Hashable):
+        pass
+        
+    def release_animated(self, mesh_key: Hashable):
+        pass
+        
+    def draw_triangle(self, vertices: np.ndarray, color: Tuple[float, float, float] = (1.0, 0.0, 0.0), transform_matrix: np.ndarray = None, key: Hashable = None):
+        """绘制三角形，参数同Renderer.draw_triangle"""
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(3, 3)
+        if transform_matrix is not None:
+            vertices = vertices @ transform_matrix[:3, :3].T + transform_matrix[:3, 3]
+        self.draw_triangles(vertices[None], np.asarray(color, dtype=np.float32)[None])
+        
+    def draw_instanced(self, mesh_key: Hashable, base_vertices: np.ndarray, instances: np.ndarray):
+        """实例化绘制，参数同Renderer.draw_instanced（在CPU上展开为批量绘制）"""
+        instances = np.asarray(instances, dtype=np.float32).reshape(-1, self.INSTANCE_SIZE)
+        base = np.asarray(base_vertices, dtype=np.float32).reshape(1, -1, 3)
+        scaled = base * instances[:, None, 4:7]
+        cos_r = np.cos(instances[:, 3])[:, None]
+        sin_r = np.sin(instances[:, 3])[:, None]
+        vertices = np.empty_like(scaled)
+        vertices[..., 0] = cos_r * scaled[..., 0] - sin_r * scaled[..., 1]
+        vertices[..., 1] = sin_r * scaled[..., 0] + cos_r * scaled[..., 1]
+        vertices[..., 2] = scaled[..., 2]
+        vertices += instances[:, None, 0:3]
+        self.draw_triangles(vertices, instances[:, 7:10])
+        
+    def draw_morph(self, mesh_key: Hashable, source_vertices: np.ndarray, target_vertices: np.ndarray, instances: np.ndarray, progress: float):
+        """变形绘制，参数同Renderer.draw_morph（在CPU上混合顶点）"""
+        source = np.asarray(source_vertices, dtype=np.float32)
+        target = np.asarray(target_vertices, dtype=np.float32)
+        self.draw_instanced(mesh_key, source + (target - source) * np.float32(progress), instances)
+        
+    def draw_animated(self, mesh_key: Hashable, base_vertices: np.ndarray, params: np.ndarray, time: float, version: Hashable = None):
+        """GPU动画绘制，参数同Renderer.draw_animated（在CPU上按相同公式求值）"""
+        self.draw_instanced(mesh_key, base_vertices, evaluate_params(params, time))
+        
+    def draw_triangles(self, vertices: np.ndarray, colors: np.ndarray):
+        """批量光栅化三角形
+        
+        Args:
+            vertices: (N,3,3)的已变换顶点数组
+            colors: (N,3)的RGB颜色数组
+        """
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3, 3)
+        if len(vertices) == 0:
+            return
+        colors = _to_unorm8(np.asarray(colors, dtype=np.float32).reshape(-1, 3))
+        
+        # 投影到窗口坐标（y轴向上，第0行为画面底部）
+        projection = self.projection_matrix
+        window = vertices @ projection[:3, :3].T + projection[:3, 3]
+        window = window.astype(np.float64)
+        window[..., 0] = (window[..., 0] + 1.0) * 0.5 * self.width
+        window[..., 1] = (window[..., 1] + 1.0) * 0.5 * self.height
+        window[..., 2] = (window[..., 2] + 1.0) * 0.5
+        window[..., :2] = np.round(window[..., :2] * self.SUBPIXEL) / self.SUBPIXEL
+        
+        # 统一为逆时针方向，丢弃退化三角形
+        area = _edge(window[:, 0], window[:, 1], window[:, 2, 0], window[:, 2, 1])
+        clockwise = area < 0
+        window[clockwise, 1], window[clockwise, 2] = window[clockwise, 2].copy(), window[clockwise, 1].copy()
+        area = np.abs(area)
+        
+        # 包围盒（像素中心在 [min, max] 内的像素），裁剪到屏幕
+        x0 = np.clip(np.ceil(window[..., 0].min(axis=1) - 0.5), 0, self.width).astype(np.int64)
+        x1 = np.clip(np.floor(window[..., 0].max(axis=1) - 0.5) + 1, 0, self.width).astype(np.int64)
+        y0 = np.clip(np.ceil(window[..., 1].min(axis=1) - 0.5), 0, self.height).astype(np.int64)
+        y1 = np.clip(np.floor(window[..., 1].max(axis=1) - 0.5) + 1, 0, self.height).astype(np.int64)
+        visible = np.flatnonzero((area > 0) & (x1 > x0) & (y1 > y0))
+        if len(visible) == 0:
+            return
+            
+        # 按绘制顺序切分批次，使每批的边函数网格不超过BATCH_PIXELS
+        box_w = x1 - x0
+        box_h = y1 - y0
+        start = 0
+        while start < len(visible):
+            stop = start + 1
+            max_w, max_h = box_w[visible[start]], box_h[visible[start]]
+            while stop < len(visible):
+                index = visible[stop]
+                next_w = max(max_w, box_w[index])
+                next_h = max(max_h, box_h[index])
+                if (stop - start + 1) * next_w * next_h > self.BATCH_PIXELS:
+                    break
+                max_w, max_h = next_w, next_h
+                stop += 1
+            batch = visible[start:stop]
+            self._rasterize(window[batch], colors[batch], x0[batch], y0[batch], box_w[batch], box_h[batch], max_w, max_h)
+            start = stop
+            
+    def _rasterize(self, window, colors, x0, y0, box_w, box_h, max_w, max_h):
+        """光栅化一批三角形：边函数在 (n, max_h, max_w) 的网格上一次求值"""
+        xs = np.arange(max_w)
+        ys = np.arange(max_h)
+        px = (x0[:, None, None] + xs[None, None, :]) + 0.5
+        py = (y0[:, None, None] + ys[None, :, None]) + 0.5
+        
+        a, b, c = window[:, 0], window[:, 1], window[:, 2]
+        shape = (len(window), max_h, max_w)
+        w = np.empty(shape, dtype=np.float64)
+        covered = np.empty(shape, dtype=bool)
+        inside = np.ones(shape, dtype=bool)
+        for start, end in ((b, c), (c, a), (a, b)):
+            dx = (end[:, 0] - start[:, 0])[:, None, None]
+            dy = (end[:, 1] - start[:, 1])[:, None, None]
+            # 边函数拆成只依赖行、只依赖列的两部分，只有相减时才产生完整网格
+            np.subtract(dx * (py - start[:, 1, None, None]), dy * (px - start[:, 0, None, None]), out=w)
+            # 左上填充规则：恰好落在边上的像素只属于左边或上边。
+            # 顶点已吸附到亚像素网格，w是2^-17的整数倍，用半个单位的阈值代替相等判断
+            threshold = np.where((dy < 0) | ((dy == 0) & (dx < 0)), -2.0 ** -18, 0.0)
+            np.greater(w, threshold, out=covered)
+            inside &= covered
+            
+        tri, row, col = np.nonzero(inside)
+        # 去掉超出包围盒（即超出屏幕）的像素
+        keep = (col < box_w[tri]) & (row < box_h[tri])
+        tri, row, col = tri[keep], row[keep], col[keep]
+        if len(tri) == 0:
+            return
+            
+        # 深度在三角形平面上线性变化：z = z_a + dz/dx * (x - x_a) + dz/dy * (y - y_a)
+        ab = b - a
+        ac = c - a
+        cross = ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]
+        dz_dx = (ab[:, 2] * ac[:, 1] - ac[:, 2] * ab[:, 1]) / cross
+        dz_dy = (ac[:, 2] * ab[:, 0] - ab[:, 2] * ac[:, 0]) / cross
+        x = (x0[tri] + col) + 0.5
+        y = (y0[tri] + row) + 0.5
+        depth = a[tri, 2] + dz_dx[tri] * (x - a[tri, 0]) + dz_dy[tri] * (y - a[tri, 1])
+        depth = depth.astype(np.float32)
+        pixel = (y0[tri] + row) * self.width + (x0[tri] + col)
+        
+        # 深度测试（LESS）：每个像素取深度最小的片元，深度相同时先绘制的胜出
+        order = np.lexsort((depth, pixel))
+        pixel = pixel[order]
+        first = np.empty(len(pixel), dtype=bool)
+        first[0] = True
+        np.not_equal(pixel[1:], pixel[:-1], out=first[1:])
+        winners = order[first]
+        pixel = pixel[first]
+        depth = depth[winners]
+        
+        depth_flat = self.depth_buffer.reshape(-1)
+        passed = (depth < depth_flat[pixel]) & (depth >= 0.0) & (depth <= 1.0)
+        pixel = pixel[passed]
+        depth_flat[pixel] = depth[passed]
+        self.color_buffer.reshape(-1, 3)[pixel] = colors[tri[winners[passed]]]
+        
+    def begin_layer(self):
+        """开始烘焙静态层（接口同Renderer）：在清空的缓冲中绘制，end_layer时保存"""
+        self.clear_screen()
+        
+    def end_layer(self):
+        """结束烘焙，保存静态层的颜色和深度"""
+        self._layer = (self.color_buffer.copy(), self.depth_buffer.copy())
+        
+    def draw_layer(self):
+        """把静态层的颜色和深度复制到缓冲中（代替clear_screen）"""
+        self.color_buffer[:] = self._layer[0]
+        self.depth_buffer[:] = self._layer[1]
+        
+    def present(self):
+        """软件渲染没有窗口，结果保留在color_buffer中"""
+        pass
+        
+    def read_pixels(self) -> np.ndarray:
+        """读取当前帧为(H,W,3)的uint8数组，第一行为画面顶部"""
+        return self.color_buffer[::-1]
+        
+    def read_into(self, buffer: np.ndarray):
+        """将当前帧读入(H,W,3)的uint8缓冲（OpenGL顺序，第一行为画面底部）"""
+        buffer[...] = self.color_buffer
+        
+    def should_quit(self) -> bool:
+        """无窗口，永不请求退出"""
+        return False
+        
+    def cleanup(self):
+        """清理资源"""
+        pass
+
+
+def _to_unorm8(color) -> np.ndarray:
+    """将[0,1]的浮点颜色转换为8位定点值（与OpenGL的转换规则一致）"""
+    return np.round(np.clip(np.asarray(color, dtype=np.float32), 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def _edge(a: np.ndarray, b: np.ndarray, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """边函数：点(px, py)相对于有向边a->b的有向面积（逆时针内侧为正）"""
+    return (b[..., 0] - a[..., 0]) * (py - a[..., 1]) - (b[..., 1] - a[..., 1]) * (px - a[..., 0])
@@ -0,0 +1,415 @@
+"""
+Mini Animation Engine MVP - Timeline Module
+时间线编译：把construct()中的play/wait记录为片段，任意时刻的画面可以直接求出
+"""
+import bisect
+import math
+from typing import List, Optional
+import numpy as np
+from .animation import Animation, AnimationGroup, _STORE_COLUMNS, _group_animations, _make_batch, _store_view
+from .clock import FrameClock, _TIME_EPSILON
+
+
+# 快照保存的存储列
+_COLUMNS = ('positions', 'rotations', 'scales', 'colors')
+
+
+class _Snapshot:
+    """片段开始时的场景状态：成员（绘制顺序）、顶点、变换和颜色、背景色、GPU动画
+    
+    变换和颜色按增量保存：关键快照保存所有成员的值（slots为None），其余快照只保存自上一个快照以来
+    被修改的成员（slots为成员在绘制顺序中的下标）及其值，完整的值由关键快照依次应用增量得到。
+    """
+    
+    __slots__ = ('objects', 'meshes', 'background_color', 'gpu_state', 'previous', 'slots', 'positions', 'rotations', 'scales', 'colors')
+    
+    def __init__(self, objects, meshes, background_color, gpu_state, previous, slots, columns):
+        self.objects = objects
+        self.meshes = meshes
+        self.background_color = background_color
+        # GpuAnimationSet.save()的结果，没有GPU动画时为None
+        self.gpu_state = gpu_state
+        self.previous = previous
+        self.slots = slots
+        self.positions, self.rotations, self.scales, self.colors = columns
+
+
+class _Segment:
+    """一次play或wait：(start_time, end_time] 内只有本片段的动画在改变场景状态
+    
+    动画组的子动画在各自的启动时刻才开始生效，之前的时刻保持快照或其他动画的值。
+    同一属性上先结束的动画在后一个动画启动后不再求值，避免不同批量组之间的写入顺序覆盖后者。
+    """
+    
+    def __init__(self, start_time: float, end_time: float, snapshot: _Snapshot, animations: List[Animation],
+                 release_times: Optional[List[float]] = None):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.snapshot = snapshot
+        self.animations = animations
+        if release_times is None:
+            release_times = [start_time] * len(animations)
+        # 动画 -> (启动时刻, 停止求值的时刻)
+        self._windows = dict(zip(animations, zip(release_times, _retire_times(animations, release_times))))
+        self._batches = None
+        self._batch_windows = None
+        self._scalar = None
+        
+    def apply(self, current_time: float):
+        """把本片段的动画在current_time时刻的值写入目标"""
+        # 行号失效（成员迁移或存储整理）时重新分组
+        if self._batches is None or any(batch.layout_version != batch.store.layout_version for batch in self._batches):
+            groups, self._scalar = _group_animations(self.animations)
+            self._batches = [_make_batch(key, animations) for key, animations in groups.items()]
+            self._batch_windows = [np.array([self._windows[animation] for animation in batch.animations], dtype=np.float64).reshape(-1, 2)
+                                   for batch in self._batches]
+        for batch, windows in zip(self._batches, self._batch_windows):
+            active = (windows[:, 0] <= current_time + _TIME_EPSILON) & (current_time < windows[:, 1])
+            if active.all():
+                batch.evaluate(current_time)
+            elif active.any():
+                batch.evaluate(current_time, active)
+        for animation in self._scalar:
+            release_time, retire_time = self._windows[animation]
+            if release_time <= current_time + _TIME_EPSILON and current_time < retire_time:
+                animation.seek(current_time)
+
+
+def _retire_times(animations: List[Animation], release_times: List[float]) -> List[float]:
+    """各动画停止求值的时刻：同一对象同一属性上的后一个动画启动时，已结束的动画不再求值"""
+    retire_times = [math.inf] * len(animations)
+    previous = {}
+    for index, (animation, release_time) in enumerate(zip(animations, release_times)):
+        key = (id(_store_view(animation)), animation.attribute)
+        waiting = previous.setdefault(key, [])
+        remaining = []
+        for earlier in waiting:
+            if animations[earlier].start_time + animations[earlier].duration <= release_time + _TIME_EPSILON:
+                retire_times[earlier] = release_time
+            else:
+                remaining.append(earlier)
+        remaining.append(index)
+        previous[key] = remaining
+    return retire_times
+
+
+def _in_store(animation: Animation) -> bool:
+    """动画是否作用于TransformStore中的变换或颜色（这些状态由快照恢复）"""
+    return animation.attribute in _STORE_COLUMNS and getattr(_store_view(animation), '_store', None) is not None
+
+
+def _first_frame(low: int, estimate: int, reached) -> int:
+    """不小于low、使reached(frame)成立的最小帧号（reached随帧号单调）"""
+    frame = max(low, estimate)
+    while frame > low and reached(frame - 1):
+        frame -= 1
+    while not reached(frame):
+        frame += 1
+    return frame
+
+
+class Timeline:
+    """预编译的时间线
+    
+    由MiniAnimationEngine.compile_timeline()执行construct()生成：每次play/wait成为一个片段，
+    记录片段开始时的场景快照和片段内的动画（绝对起止时刻，动画组的子动画另记启动时刻）。seek(t)二分查找t所在的片段，
+    恢复快照后直接求出片段内动画在t时刻的值，不需要从头播放。
+    作用于其他属性的动画按 (对象, 属性) 记录为轨道，同样二分查找。
+    片段边界按帧率对齐，第i帧与逐帧时钟下播放的第i帧完全一致。
+    快照按增量保存，每隔若干个增量快照保存一个关键快照，内存和定位时恢复的开销都与片段数无关。
+    animate_on_gpu的动画（起始时刻、循环方式）随快照保存；编译和定位时场景使用时间线的逐帧时钟，
+    seek把时钟设为t，GPU动画按t求值。
+    """
+    
+    # 两个关键快照之间最多的增量快照数
+    KEYFRAME_INTERVAL = 32
+    
+    def __init__(self, scene, fps: float = 60.0):
+        self.scene = scene
+        self.fps = fps
+        # 编译和定位时场景使用的时钟
+        self.clock = FrameClock(fps)
+        self.segments: List[_Segment] = []
+        self._end_times: List[float] = []
+        # (id(对象), 属性) -> (开始时刻列表, 动画列表)
+        self._tracks = {}
+        self._frame = 0
+        self._last_snapshot: Optional[_Snapshot] = None
+        self._final: Optional[_Snapshot] = None
+        # 上一个快照时的成员变化计数和存储修改戳，以及自上一个关键快照以来的增量快照数和累计的增量成员数
+        self._registry_version = -1
+        self._stamp = 0
+        self._delta_count = 0
+        self._delta_size = 0
+        # 上一个快照时GPU动画的修改计数
+        self._gpu_version = -1
+        # 当前场景中已恢复的成员和顶点，未变化时跳过
+        self._applied_objects = None
+        self._applied_meshes = None
+        # 最近一次恢复的快照及其完整的列值，之后的增量快照在此基础上应用
+        self._assembled: Optional[_Snapshot] = None
+        self._assembled_columns = None
+        # 已恢复的GPU动画状态及恢复后的修改计数
+        self._applied_gpu = None
+        self._applied_gpu_version = -1
+        
+    @property
+    def frame_count(self) -> int:
+        """总帧数"""
+        return self._frame
+        
+    @property
+    def duration(self) -> float:
+        """总时长（秒）"""
+        return self._frame / self.fps
+        
+    def frame_time(self, index: int) -> float:
+        """第index帧（从0开始）的时刻：与逐帧播放一致，每帧先推进时钟再更新动画"""
+        return (index + 1) / self.fps
+        
+    # 编译：由Scene在编译模式下调用
+    
+    def record_play(self, animations: List[Animation], run_time: Optional[float] = None):
+        """记录一次play
+        
+        动画组展开为子动画，每个子动画在第一个不早于其开始时刻的帧启动（与TimeManager一致），
+        启动时读取起始值；整个play是一个片段，子动画按启动时刻生效
+        """
+        fps = self.fps
+        start_frame = self._frame
+        start_time = start_frame / fps
+        snapshot = self._snapshot()
+        # 顶层的普通动画立即开始；动画组的子动画记为 (启动帧, 开始时刻, 动画)
+        active = []
+        releases = []
+        for animation in animations:
+            animation.start(start_time)
+            if isinstance(animation, AnimationGroup):
+                for child_start, child in animation.schedule(start_time):
+                    frame = _first_frame(start_frame + 1, math.floor(child_start * fps),
+                                         lambda frame: child_start <= frame / fps + _TIME_EPSILON)
+                    releases.append((frame, child_start, child))
+            else:
+                active.append(animation)
+                self._add_track(animation)
+        releases.sort(key=lambda release: release[:2])
+        
+        if run_time is not None:
+            end_frame = start_frame + self._frames_until(start_frame, start_time + run_time)
+        else:
+            # 逐帧播放直到所有动画完成（每个动画至少更新一帧）
+            end_frame = start_frame
+            for frame, child_start, animation in [(start_frame + 1, start_time, animation) for animation in active] + releases:
+                duration = animation.duration
+                end = _first_frame(frame, math.floor((child_start + duration) * fps),
+                                   lambda frame: frame / fps - child_start >= duration)
+                end_frame = max(end_frame, end)
+                
+        recorded = list(active)
+        release_times = [start_time] * len(active)
+        seeked_frame = None
+        for frame, child_start, animation in releases:
+            if frame > end_frame:
+                break
+            if seeked_frame != frame:
+                # 先把已在播放的动画推进到启动帧，再读取起始值；已结束的动画写入终值后不再推进
+                release_time = frame / fps
+                for playing in active:
+                    playing.seek(release_time)
+                active = [playing for playing in active if release_time - playing.start_time < playing.duration]
+                seeked_frame = frame
+            animation.start(child_start)
+            active.append(animation)
+            recorded.append(animation)
+            release_times.append(frame / fps)
+            self._add_track(animation)
+        self._add_segment(start_frame, end_frame, snapshot, recorded, release_times)
+        self._frame = end_frame
+        
+    def record_wait(self, duration: float):
+        """记录一次wait"""
+        if math.isinf(duration):
+            return
+        start_frame = self._frame
+        end_frame = start_frame + self._frames_until(start_frame, start_frame / self.fps + duration)
+        self._add_segment(start_frame, end_frame, self._snapshot(), [])
+        self._frame = end_frame
+        
+    def finish(self):
+        """编译结束，记录最终状态"""
+        self._final = self._snapshot()
+        
+    def _frames_until(self, start_frame: int, end_time: float) -> int:
+        """逐帧时钟从start_frame推进到end_time需要的帧数"""
+        end = _first_frame(start_frame, math.floor(end_time * self.fps),
+                           lambda frame: frame / self.fps >= end_time - _TIME_EPSILON)
+        return end - start_frame
+        
+    def _add_track(self, animation: Animation):
+        """作用于TransformStore之外的属性的动画按 (对象, 属性) 记入轨道"""
+        if not _in_store(animation):
+            times, track = self._tracks.setdefault((id(animation.target), animation.attribute), ([], []))
+            times.append(animation.start_time)
+            track.append(animation)
+            
+    def _add_segment(self, start_frame: int, end_frame: int, snapshot: _Snapshot, animations: List[Animation],
+                     release_times: Optional[List[float]] = None):
+        """记录 (start_frame, end_frame] 的片段，并把场景推进到片段结束时的状态"""
+        if end_frame <= start_frame:
+            return
+        start_time = start_frame / self.fps
+        end_time = end_frame / self.fps
+        self.clock.frame = end_frame
+        if release_times is None:
+            release_times = [start_time] * len(animations)
+        stored = [(animation, release_time) for animation, release_time in zip(animations, release_times) if _in_store(animation)]
+        segment = _Segment(start_time, end_time, snapshot, [animation for animation, _ in stored],
+                           [release_time for _, release_time in stored])
+        self.segments.append(segment)
+        self._end_times.append(end_time)
+        for animation in animations:
+            if not _in_store(animation):
+                animation.seek(end_time)
+        # construct()后续的代码看到的与逐帧播放一致
+        segment.apply(end_time)
+        self._update_gpu(end_time)
+        
+    def _update_gpu(self, t: float):
+        """与逐帧播放相同，在CPU动画之后推进GPU动画"""
+        scene = self.scene
+        if scene.gpu_animations:
+            scene.gpu_animations.update(scene.store, t, evaluate=scene.render_mode != 'gpu_animation')
+            
+    def _snapshot(self) -> _Snapshot:
+        scene = self.scene
+        registry = scene.registry
+        store = scene.store
+        previous = self._last_snapshot
+        rows = registry.rows()
+        # 成员和顶点未变化时与上一个快照共享同一个列表，恢复时可以直接跳过
+        if previous is not None and self._registry_version == registry.version and store.mesh_version <= self._stamp:
+            objects, meshes = previous.objects, previous.meshes
+        else:
+            objects = list(registry)
+            meshes = [obj.original_vertices for obj in objects]
+            if previous is not None and previous.objects == objects:
+                objects = previous.objects
+                if all(mesh is old for mesh, old in zip(meshes, previous.meshes)):
+                    meshes = previous.meshes
+                    
+        slots = None
+        if previous is not None and objects is previous.objects:
+            # 只保存自上一个快照以来被修改（touch）的成员；累计的增量超过成员数或连续的增量过多时改存关键快照
+            slots = np.flatnonzero(store.versions[rows] > self._stamp)
+            self._delta_size += len(slots)
+            self._delta_count += 1
+            if self._delta_size > len(objects) or self._delta_count > self.KEYFRAME_INTERVAL:
+                slots = None
+        if slots is None:
+            self._delta_size = 0
+            self._delta_count = 0
+            columns = [getattr(store, column)[rows] for column in _COLUMNS]
+            previous = None
+        else:
+            columns = [getattr(store, column)[rows[slots]] for column in _COLUMNS]
+        # GPU动画未变化时与上一个快照共享状态
+        gpu = scene.gpu_animations
+        if self._last_snapshot is not None and self._gpu_version == gpu.version:
+            gpu_state = self._last_snapshot.gpu_state
+        else:
+            gpu_state = gpu.save() if gpu else None
+        snapshot = _Snapshot(objects, meshes, scene.background_color, gpu_state, previous, slots, columns)
+        self._last_snapshot = snapshot
+        self._gpu_version = gpu.version
+        self._registry_version = registry.version
+        self._stamp = store.version
+        return snapshot
+        
+    # 随机访问
+    
+    def seek(self, t: float):
+        """把场景设为t时刻（从时间线开始的秒数）的状态，场景的时钟设为t"""
+        scene = self.scene
+        if scene.clock is not self.clock:
+            scene.set_clock(self.clock)
+        self.clock.seek(t)
+        if self._tracks:
+            # 轨道（如顶点变形）可能改写了快照中的顶点
+            self._applied_meshes = None
+        index = bisect.bisect_left(self._end_times, t)
+        if index < len(self.segments):
+            segment = self.segments[index]
+            self._restore(segment.snapshot)
+            segment.apply(t)
+        else:
+            self._restore(self._final)
+            
+        for times, track in self._tracks.values():
+            position = bisect.bisect_right(times, t) - 1
+            if position >= 0:
+                track[position].seek(t)
+        self._update_gpu(t)
+        
+    def seek_frame(self, index: int):
+        """把场景设为第index帧的状态"""
+        self.seek(self.frame_time(index))
+        
+    def _restore(self, snapshot: _Snapshot):
+        scene = self.scene
+        if self._applied_objects is not snapshot.objects:
+            if scene.objects != snapshot.objects:
+                scene.remove(scene.objects)
+                scene.add(snapshot.objects)
+            self._applied_objects = snapshot.objects
+            self._applied_meshes = None
+        if self._applied_meshes is not snapshot.meshes:
+            for obj, mesh in zip(snapshot.objects, snapshot.meshes):
+                if obj.original_vertices is not mesh:
+                    obj.original_vertices = mesh
+            self._applied_meshes = snapshot.meshes
+            
+        store = scene.store
+        rows = scene.registry.rows()
+        changed = np.zeros(len(rows), dtype=bool)
+        for column, values in zip(_COLUMNS, self._columns(snapshot)):
+            array = getattr(store, column)
+            differs = array[rows] != values
+            if differs.ndim == 2:
+                differs = differs.any(axis=1)
+            if differs.any():
+                array[rows[differs]] = values[differs]
+                changed |= differs
+        if changed.any():
+            store.touch(rows[changed])
+            
+        if scene.background_color != snapshot.background_color:
+            scene.set_background_color(snapshot.background_color)
+            
+        # GPU动画在上次恢复后被推进（结束的通道移出集合）时重新恢复
+        gpu = scene.gpu_animations
+        if self._applied_gpu is not snapshot.gpu_state or gpu.version != self._applied_gpu_version:
+            if snapshot.gpu_state is None:
+                if gpu:
+                    gpu.clear()
+            else:
+                gpu.load(snapshot.gpu_state)
+            self._applied_gpu = snapshot.gpu_state
+            self._applied_gpu_version = gpu.version
+            
+    def _columns(self, snapshot: _Snapshot) -> List[np.ndarray]:
+        """快照时所有成员的变换和颜色：从关键快照（或最近恢复的同一链上的快照）依次应用增量"""
+        chain = []
+        base = snapshot
+        while base is not self._assembled and base.slots is not None:
+            chain.append(base)
+            base = base.previous
+        if base is self._assembled and base is not None:
+            columns = self._assembled_columns
+        else:
+            columns = [getattr(base, column).copy() for column in _COLUMNS]
+        for delta in reversed(chain):
+            for values, column in zip(columns, _COLUMNS):
+                values[delta.slots] = getattr(delta, column)
+        self._assembled = snapshot
+        self._assembled_columns = columns
+        return columns
@@ -0,0 +1,29 @@
+"""
+Frame helpers for tests
+测试共用：导出或逐帧运行场景，读回每一帧画面
+"""
+import os
+import tempfile
+from typing import Callable
+
+import numpy as np
+
+
+def export_frames(engine, play: Callable[[], None], fps: float = 30) -> np.ndarray:
+    """在engine上开始导出（临时原始RGB文件），执行play()后结束导出，返回(F,H,W,3)的逐帧画面"""
+    width, height = engine.renderer.width, engine.renderer.height
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'frames.rgb')
+        engine.start_export(path, fps=fps)
+        play()
+        engine.finish_export()
+        return np.fromfile(path, dtype=np.uint8).reshape(-1, height, width, 3)
+
+
+def run_frames(engine, count: int) -> np.ndarray:
+    """按场景的帧循环更新并渲染count帧，返回(count,H,W,3)的逐帧画面"""
+    images = []
+    for _ in range(count):
+        engine.scene._run_frame(update=True)
+        images.append(engine.renderer.read_pixels().copy())
+    return np.array(images)
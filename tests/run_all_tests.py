@@ -53,6 +53,18 @@ def main():
     tests = [
         ("快速功能测试", "quick_test.py", 8),
         ("基础动画测试", "test_basic.py", 8),
+        ("无窗口渲染测试", "test_headless.py", 8),
+        ("离线导出测试", "test_export.py", 8),
+        ("帧调度测试", "test_scheduler.py", 8),
+        ("并行导出测试", "test_parallel.py", 15),
+        ("软件渲染测试", "test_software_renderer.py", 15),
+        ("变换存储测试", "test_transform_store.py", 8),
+        ("批量动画测试", "test_batch_animation.py", 8),
+        ("时间线测试", "test_timeline.py", 10),
+        ("GPU动画测试", "test_gpu_animation.py", 10),
+        ("变形动画测试", "test_morph.py", 10),
+        ("静态层测试", "test_static_layer.py", 15),
+        ("视锥剔除测试", "test_culling.py", 15),
         # 注意: 交互测试和完整动画测试需要人工交互，这里跳过
         # ("交互测试", "test_interactive.py", 15),
         # ("动画序列测试", "test_animation.py", 30),
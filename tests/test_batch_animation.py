@@ -0,0 +1,195 @@
+"""
+Batch animation test
+批量动画测试：分组求值的结果应与逐个更新的动画完全一致
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.geometry import Triangle
+from core.animation import (
+    Animation, move_to, rotate_to, scale_to, color_to, EaseFunction, TimeManager, Succession, LaggedStart,
+    register_interpolator
+)
+from core.clock import FrameClock
+from core.scene import MiniAnimationEngine
+
+
+def build_scene(count=300):
+    """创建一组三角形和作用于它们的动画"""
+    engine = MiniAnimationEngine(64, 64, "Batch Animation Test", backend='software', clock=FrameClock(30))
+    positions = np.random.default_rng(0).uniform(-3, 3, (count, 2))
+    triangles = Triangle.create_many(count, positions=positions)
+    engine.add(triangles)
+    animations = []
+    for i, triangle in enumerate(triangles):
+        animations.append(move_to(triangle, (i % 7 - 3, 1), 0.5 + (i % 3) * 0.25))
+        animations.append(color_to(triangle, (0.0, 1.0, 0.0), 1.0, EaseFunction.linear))
+        animations.append(rotate_to(triangle, i * 0.1, 0.8, EaseFunction.ease_out_quad))
+        animations.append(scale_to(triangle, 0.5, 0.6, EaseFunction.ease_in_out_quad))
+        if i % 2:
+            animations.append(move_to(triangle, (0, -1), 0.9, EaseFunction.cubic_bezier(0.25, 0.1, 0.25, 1.0)))
+    return engine, animations
+
+
+def check_easings():
+    """所有缓动都可以对数组求值，结果与逐个标量求值一致，且从0到1"""
+    easings = [
+        EaseFunction.linear, EaseFunction.ease_in_out, EaseFunction.ease_in_quad,
+        EaseFunction.ease_out_quad, EaseFunction.ease_in_out_quad,
+        EaseFunction.cubic_bezier(0.42, 0.0, 0.58, 1.0), EaseFunction.elastic(),
+        EaseFunction.bounce(), EaseFunction.steps(5),
+        EaseFunction.lookup_table(EaseFunction.ease_in_out),
+    ]
+    t = np.linspace(0.0, 1.0, 101)
+    for ease in easings:
+        values = ease(t)
+        assert np.allclose(values, [ease(float(x)) for x in t])
+        assert isinstance(ease(0.5), float)
+        # NumPy标量走标量分支，不得到0维数组
+        for scalar in (np.float32(0.7), np.float64(0.3)):
+            assert not isinstance(ease(scalar), np.ndarray) and np.isclose(ease(scalar), ease(float(scalar)), atol=1e-6)
+        assert abs(values[0]) < 1e-9 and abs(values[-1] - 1.0) < 1e-9
+    assert np.allclose(EaseFunction.lookup_table(EaseFunction.ease_in_out)(t), EaseFunction.ease_in_out(t), atol=1e-6)
+    # 相同参数返回同一个缓动函数，动画才能被分到同一组
+    assert EaseFunction.cubic_bezier(0.42, 0.0, 0.58, 1.0) is EaseFunction.cubic_bezier(0.42, 0.0, 0.58, 1.0)
+
+
+def check_groups():
+    """动画组：子动画到开始时刻才启动并读取起始值，每帧只更新正在播放的子动画"""
+    clock = FrameClock(30)
+    time_manager = TimeManager(clock)
+    triangles = Triangle.create_many(10)
+    lagged = LaggedStart(*[move_to(triangle, (1, 0), 0.5, EaseFunction.linear) for triangle in triangles[1:]], lag_ratio=0.5)
+    succession = Succession(move_to(triangles[0], (2, 0), 0.5), move_to(triangles[0], (2, 2), 0.5))
+    assert lagged.duration == 8 * 0.25 + 0.5 and succession.duration == 1.0
+    time_manager.add_animation(lagged)
+    time_manager.add_animation(succession)
+    time_manager.start_all()
+    frames = 0
+    while not time_manager.is_all_finished():
+        clock.tick()
+        time_manager.update()
+        frames += 1
+        if frames == 12:
+            # t=0.4：lagged的第1、2个子动画和succession的第1个子动画在播放
+            assert time_manager.get_playing_count() == 3
+            assert np.allclose(triangles[2].transform.position, (0.3, 0, 0))
+            assert np.array_equal(triangles[5].transform.position, (0, 0, 0)), "未开始的子动画不应改变目标"
+    assert frames == 75
+    assert lagged.is_finished and succession.is_finished
+    assert lagged in time_manager.finished_animations
+    assert np.array_equal(triangles[0].transform.position, (2, 2, 0)), "第二个子动画应从第一个的终点开始"
+    assert all(np.array_equal(triangle.transform.position, (1, 0, 0)) for triangle in triangles[1:])
+
+
+def check_interpolators():
+    """插值器在动画开始时选定：写入存储时复用输出缓冲，普通对象得到独立且类型不变的值，
+    最短路径旋转可批量求值，可注册自定义类型"""
+    triangle = Triangle()
+    animation = move_to(triangle, (2, 0), 1.0)
+    animation.start(0.0)
+    interpolate = animation._interpolate
+    assert interpolate.evaluate(0.25) is interpolate.evaluate(0.75), "应复用同一个输出缓冲"
+    assert animation._evaluate == interpolate.evaluate
+    
+    class Plain:
+        def __init__(self):
+            self.offset = (0.0, 0.0)
+            self.tint = [0.0, 0.0, 0.0]
+            self.weights = np.zeros(4)
+            
+    plain = Plain()
+    animations = [Animation(plain, 'offset', None, (1.0, 2.0), 1.0, EaseFunction.linear),
+                  Animation(plain, 'tint', None, [1.0, 0.5, 0.25], 1.0, EaseFunction.linear),
+                  Animation(plain, 'weights', None, np.ones(4), 1.0, EaseFunction.linear)]
+    for animation in animations:
+        animation.start(0.0)
+        animation.update(1.0)
+    final = (plain.offset, plain.tint, plain.weights)
+    assert type(plain.offset) is tuple and type(plain.tint) is list and isinstance(plain.weights, np.ndarray)
+    # 之后继续求值（同一插值器或时间线重新定位）不应改写已设置的最终值
+    for animation in animations:
+        animation.seek(0.5)
+    assert plain.offset == (0.5, 1.0) and type(plain.tint) is list
+    assert final[0] == (1.0, 2.0) and final[1] == [1.0, 0.5, 0.25] and np.array_equal(final[2], np.ones(4)), "最终值不应随后续求值改变"
+    
+    clock = FrameClock(30)
+    time_manager = TimeManager(clock)
+    triangles = Triangle.create_many(4, rotations=[3.0, -3.0, 0.5, 6.0])
+    for triangle in triangles:
+        time_manager.add_animation(rotate_to(triangle, -3.0, 0.5, shortest_path=True))
+    time_manager.start_all()
+    clock.tick()
+    time_manager.update()
+    assert len(time_manager._batches) == 1 and not time_manager._scalar
+    while not time_manager.is_all_finished():
+        clock.tick()
+        time_manager.update()
+    rotations = np.array([triangle.transform.rotation for triangle in triangles])
+    # 终点与-3等价（相差2π的整数倍），且转过的角度不超过π
+    assert np.allclose(np.cos(rotations), np.cos(-3.0), atol=1e-5) and np.allclose(np.sin(rotations), np.sin(-3.0), atol=1e-5)
+    assert np.all(np.abs(rotations - [3.0, -3.0, 0.5, 6.0]) <= np.pi + 1e-6)
+    
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+            
+    class Target:
+        point = Point(0.0, 0.0)
+        
+    register_interpolator(Point, lambda start, end: lambda t: Point(start.x + (end.x - start.x) * t, start.y + (end.y - start.y) * t))
+    target = Target()
+    animation = Animation(target, 'point', None, Point(2.0, 4.0), 1.0, EaseFunction.linear)
+    animation.start(0.0)
+    animation.update(0.25)
+    assert (target.point.x, target.point.y) == (0.5, 1.0)
+
+
+def main():
+    print("Mini Animation Engine - Batch Animation Test")
+    
+    check_easings()
+    check_groups()
+    check_interpolators()
+    
+    # 通过TimeManager分组求值
+    engine, animations = build_scene()
+    time_manager = engine.scene.time_manager
+    for animation in animations:
+        time_manager.add_animation(animation)
+    time_manager.start_all()
+    frames = 0
+    while not time_manager.is_all_finished():
+        engine.scene.clock.tick()
+        time_manager.update()
+        frames += 1
+        if frames == 1:
+            assert len(time_manager._batches) == 5 and not time_manager._scalar, "所有动画都应被批量求值"
+    assert frames == 30, "最长的动画为1秒"
+    assert len(time_manager.finished_animations) == len(animations)
+    assert all(animation.is_finished for animation in animations)
+    
+    # 逐个更新同样的动画作为参照
+    reference, reference_animations = build_scene()
+    clock = reference.scene.clock
+    for animation in reference_animations:
+        animation.start(clock.time())
+    for _ in range(frames):
+        clock.tick()
+        for animation in reference_animations:
+            animation.update(clock.time())
+            
+    store, reference_store = engine.scene.store, reference.scene.store
+    for column in ('positions', 'rotations', 'scales', 'colors'):
+        assert np.array_equal(getattr(store, column)[:len(store)], getattr(reference_store, column)[:len(reference_store)]), f"{column} 不一致"
+    print(f"  {len(animations)} 个动画，{len(time_manager._batches)} 个分组剩余")
+    
+    engine.cleanup()
+    reference.cleanup()
+    print("Batch animation test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Culling test
+视锥剔除测试：空间索引的查询与逐个判断一致，剔除后的画面与绘制所有对象一致
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.clock import FrameClock
+from core.geometry import Triangle
+from core.culling import SpatialGrid, frame_bounds
+from core.animation import move_to, rotate_to, scale_to
+from frame_helpers import export_frames, run_frames
+
+
+def brute_force(bounds: np.ndarray, rect) -> np.ndarray:
+    return np.flatnonzero((bounds[:, 0] <= rect[2]) & (bounds[:, 2] >= rect[0]) & (bounds[:, 1] <= rect[3]) & (bounds[:, 3] >= rect[1]))
+
+
+def check_grid():
+    """增量更新、批量更新和大对象下查询结果都与逐个判断一致"""
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-50, 50, (3000, 2))
+    extents = rng.uniform(0.05, 1.5, (3000, 2))
+    extents[:10] *= 30
+    bounds = np.concatenate([centers - extents, centers + extents], axis=1)
+    grid = SpatialGrid()
+    grid.rebuild(bounds)
+    for step in range(60):
+        x, y = rng.uniform(-55, 55, 2)
+        rect = (x, y, x + rng.uniform(1, 20), y + rng.uniform(1, 12))
+        assert np.array_equal(grid.query(rect), brute_force(grid.bounds, rect)), f"第 {step} 次查询不一致"
+        # 多数步骤少量移动，偶尔几乎全部移动
+        count = 2000 if step % 10 == 9 else 100
+        slots = rng.choice(len(bounds), count, replace=False)
+        grid.update(slots, grid.bounds[slots] + np.repeat(rng.normal(0, 1.0, (count, 2)), 2, axis=0).reshape(count, 4))
+
+
+def play_scene(render_mode: str, culling: bool, backend: str = 'opengl'):
+    """大部分对象在画面外，部分对象移入、移出画面；返回逐帧画面和剔除数"""
+    rng = np.random.default_rng(1)
+    triangles = Triangle.create_many(600, positions=rng.uniform(-20, 20, (600, 2)), colors=rng.uniform(0, 1, (600, 3)))
+    engine = MiniAnimationEngine(160, 120, "Culling Test", render_mode=render_mode, headless=True, backend=backend)
+    engine.scene.culling = culling
+    engine.add(triangles)
+    
+    def play():
+        engine.play(*[move_to(triangle, (0, 0), 0.5) for triangle in triangles[:10]],
+                    *[move_to(triangle, (-15, 15), 0.5) for triangle in triangles[300:310]],
+                    scale_to(triangles[10], 30.0, 0.5), rotate_to(triangles[11], 3.0, 0.5))
+        triangles[20].move_to(1, 1)
+        engine.remove(triangles[100:200])
+        engine.wait(0.1)
+        
+    frames = export_frames(engine, play)
+    culled = engine.frame_stats()['objects_culled']
+    expected = len(engine.scene.objects) - len(brute_force(_bounds(engine), frame_bounds(engine.renderer.projection_matrix)))
+    engine.cleanup()
+    return frames, culled, expected
+
+
+def _bounds(engine) -> np.ndarray:
+    vertices = engine.scene.get_transformed_vertices()
+    return np.concatenate([vertices[:, :, :2].min(axis=1), vertices[:, :, :2].max(axis=1)], axis=1)
+
+
+def check_gpu_animation():
+    """GPU动画路径：从画面外移入的GPU动画对象不被剔除"""
+    frames = []
+    for culling in (True, False):
+        engine = MiniAnimationEngine(160, 120, "Culling Test", render_mode='gpu_animation', headless=True, clock=FrameClock(30))
+        engine.scene.culling = culling
+        triangles = Triangle.create_many(40, positions=np.random.default_rng(2).uniform(-20, 20, (40, 2)))
+        engine.add(triangles)
+        engine.animate_on_gpu([move_to(triangle, (0, 0), 0.5) for triangle in triangles[:10]])
+        frames.append(run_frames(engine, 20))
+        engine.cleanup()
+    assert np.array_equal(frames[0], frames[1]), "GPU动画对象的画面应与不剔除时一致"
+
+
+def main():
+    print("Mini Animation Engine - Culling Test")
+    
+    check_grid()
+    cases = [('batched', 'opengl'), ('instanced', 'opengl'), ('immediate', 'opengl'), ('gpu_transform', 'opengl'), ('batched', 'software')]
+    for render_mode, backend in cases:
+        culled_frames, culled, expected = play_scene(render_mode, True, backend)
+        reference, _, _ = play_scene(render_mode, False, backend)
+        assert np.array_equal(culled_frames, reference), f"{backend}/{render_mode} 剔除后的画面应与绘制所有对象一致"
+        assert culled == expected > 0, (culled, expected)
+        print(f"  {backend}/{render_mode}: {len(reference)} 帧一致，最后一帧剔除 {culled} 个对象")
+        
+    check_gpu_animation()
+    print("Culling test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Export test
+离线导出测试：逐帧时钟 + 异步回读，检查导出的帧数和内容
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.animation import move_to, color_to
+
+
+def main():
+    print("Mini Animation Engine - Export Test")
+    
+    width, height, fps = 160, 120, 30
+    engine = MiniAnimationEngine(width, height, "Export Test", headless=True)
+    
+    triangle = engine.create_equilateral_triangle(1.5, (1.0, 0.0, 0.0))
+    triangle.move_to(-2, 0)
+    engine.add(triangle)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # 原始RGB帧
+        raw_path = os.path.join(directory, 'frames.rgb')
+        engine.start_export(raw_path, fps=fps)
+        engine.play(move_to(triangle, (2, 0), 1.0))
+        engine.play(color_to(triangle, (0.0, 1.0, 0.0), 0.5))
+        engine.wait(0.5)
+        last_frame = engine.renderer.read_pixels().copy()
+        stats = engine.finish_export()
+        
+        print(f"  导出 {stats['frames']} 帧，{stats['fps']:.1f} 帧/秒")
+        assert stats['frames'] == 2 * fps, f"应导出 {2 * fps} 帧"
+        assert stats['duplicates'] == fps // 2, "wait期间画面未变化，应直接重复上一帧"
+        frames = np.fromfile(raw_path, dtype=np.uint8).reshape(-1, height, width, 3)
+        assert len(frames) == stats['frames']
+        assert np.array_equal(frames[-1], last_frame), "最后一帧应与帧缓冲一致"
+        assert not np.array_equal(frames[0], frames[fps - 1]), "移动过程中画面应变化"
+        
+        # PNG序列
+        png_pattern = os.path.join(directory, 'png', 'frame_%04d.png')
+        engine.start_export(png_pattern, fps=fps)
+        engine.wait(0.2)
+        stats = engine.finish_export()
+        files = sorted(os.listdir(os.path.dirname(png_pattern)))
+        assert len(files) == stats['frames'] == 6
+        with open(os.path.join(os.path.dirname(png_pattern), files[0]), 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+            
+    engine.cleanup()
+    print("Export test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
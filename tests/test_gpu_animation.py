@@ -0,0 +1,68 @@
+"""
+GPU animation test
+GPU动画测试：着色器求值的画面与CPU回退路径一致，参数只上传一次，结束后终值写回存储
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.clock import FrameClock
+from core.geometry import Triangle
+from core.animation import move_to, rotate_to, scale_to, color_to, EaseFunction
+from frame_helpers import run_frames
+
+
+def render_frames(render_mode: str, count: int = 120, frames: int = 40):
+    """用GPU动画播放一组旋转、变色、移动和缩放，返回每帧画面和引擎"""
+    engine = MiniAnimationEngine(160, 120, "GPU Animation Test", render_mode=render_mode, headless=True, clock=FrameClock(30))
+    vertices = np.array([[0.0, 0.3, 0.0], [-0.3, -0.3, 0.0], [0.3, -0.3, 0.0]], dtype=np.float32)
+    positions = np.random.default_rng(0).uniform(-5, 5, (count, 2))
+    triangles = Triangle.create_many(count, vertices=vertices, positions=positions)
+    engine.add(triangles)
+    engine.animate_on_gpu([rotate_to(triangle, 6.28, 1.0, EaseFunction.linear) for triangle in triangles], loop='repeat')
+    engine.animate_on_gpu([color_to(triangle, (0.0, 1.0, 0.0), 0.7, EaseFunction.ease_in_out_quad) for triangle in triangles[::2]], loop='pingpong')
+    engine.animate_on_gpu([move_to(triangle, (0, 0), 0.5) for triangle in triangles[:20]])
+    engine.animate_on_gpu([scale_to(triangle, 2.0, 0.5, EaseFunction.ease_out_quad) for triangle in triangles[20:40]])
+    return run_frames(engine, frames), engine, triangles
+
+
+def main():
+    print("Mini Animation Engine - GPU Animation Test")
+    
+    gpu_frames, engine, triangles = render_frames('gpu_animation')
+    cpu_frames, reference, _ = render_frames('instanced')
+    assert np.array_equal(gpu_frames, cpu_frames), "着色器求值应与CPU回退路径的画面一致"
+    assert not np.array_equal(gpu_frames[5], gpu_frames[10]), "画面应随时间变化"
+    
+    # 播放一次的动画结束后终值写回存储，循环的动画继续由GPU求值
+    assert np.array_equal(triangles[0].transform.position, (0, 0, 0))
+    assert np.allclose(triangles[25].transform.scale, (2, 2, 2))
+    assert len(engine.scene.gpu_animations) == len(triangles)
+    
+    # 场景和存储不变时不重新上传参数，只更新时间
+    version = engine.scene._animated_version
+    for _ in range(5):
+        engine.scene._run_frame(update=True)
+    assert engine.scene._animated_version == version
+    
+    # 不支持的缓动在添加时报错
+    try:
+        engine.animate_on_gpu(move_to(triangles[0], (1, 1), 1.0, EaseFunction.bounce()))
+        assert False, "bounce不能在GPU上求值"
+    except ValueError:
+        pass
+        
+    # 移除对象时一并移除其GPU动画
+    engine.remove(triangles[:10])
+    assert len(engine.scene.gpu_animations) == len(triangles) - 10
+    print(f"  {len(triangles)} 个对象，{len(gpu_frames)} 帧一致")
+    
+    engine.cleanup()
+    reference.cleanup()
+    print("GPU animation test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
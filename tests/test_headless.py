@@ -0,0 +1,75 @@
+"""
+Headless rendering test
+无窗口模式测试：离屏渲染，检查各渲染路径输出一致
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import math
+import numpy as np
+from core.scene import MiniAnimationEngine, Scene
+from core.animation import move_to, rotate_to
+
+
+def build_objects(engine, count=50):
+    """创建一组分布在画面中的三角形
+    
+    使用同一基础网格，保证实例化路径的绘制顺序与其他路径一致
+    """
+    triangles = []
+    for i in range(count):
+        color = (i / count, 0.5, 1.0 - i / count)
+        triangle = engine.create_equilateral_triangle(0.8, color)
+        triangle.move_to(math.sin(i) * 5, math.cos(i * 1.3) * 3).rotate(i * 0.7).scale(0.5 + i / (2 * count))
+        triangles.append(triangle)
+    return triangles
+
+
+def main():
+    print("Mini Animation Engine - Headless Test")
+    
+    engine = MiniAnimationEngine(320, 240, "Headless Test", headless=True)
+    assert 'pygame' not in sys.modules, "无窗口模式不应导入pygame"
+    
+    triangles = build_objects(engine)
+    engine.add(*triangles)
+    
+    # 各渲染路径应输出相同的画面
+    frames = {}
+    for mode in Scene.RENDER_MODES:
+        engine.scene.render_mode = mode
+        engine.scene._render_frame()
+        frames[mode] = engine.renderer.read_pixels().copy()
+        
+    reference = frames['batched']
+    assert reference.shape == (240, 320, 3)
+    assert (reference != reference[0, 0]).any(), "画面中应包含三角形"
+    for mode, frame in frames.items():
+        assert np.array_equal(frame, reference), f"{mode} 渲染结果与batched不一致"
+        print(f"  {mode}: OK")
+        
+    # 动画在无窗口模式下同样可以播放
+    engine.play(move_to(triangles[0], (1, 1), 0.2), rotate_to(triangles[1], math.pi, 0.2))
+    assert np.allclose(triangles[0].transform.position[:2], (1, 1))
+    
+    # render_frame：窗口模式下交换缓冲后的后台缓冲内容未定义，画面未变化时也应重新绘制并在显示前读回
+    expected = engine.render_frame()
+    renderer = engine.renderer
+    renderer.headless = False
+    renderer.present = lambda: renderer.ctx.clear(0.0, 0.0, 0.0)
+    try:
+        # 上一帧已显示（缓冲已交换）
+        renderer.present()
+        assert np.array_equal(engine.render_frame(), expected), "画面未变化时应重新绘制，而不是读取交换后的缓冲"
+        assert np.array_equal(engine.render_frame(), expected)
+    finally:
+        renderer.headless = True
+        del renderer.present
+        
+    engine.cleanup()
+    print("Headless test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Morph animation test
+变形动画测试：实例化路径在GPU上混合顶点的画面与CPU回退路径一致，结束后顶点写回对象
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.geometry import Triangle
+from core.animation import morph_to, move_to, EaseFunction
+from frame_helpers import export_frames
+
+
+SOURCE = np.array([[0.0, 0.3, 0.0], [-0.3, -0.3, 0.0], [0.3, -0.3, 0.0]], dtype=np.float32)
+TARGET = np.array([[-0.3, 0.3, 0.0], [0.3, 0.3, 0.0], [0.0, -0.35, 0.0]], dtype=np.float32)
+
+
+def morph_frames(render_mode: str, count: int = 400):
+    """在网格上排列count个三角形并播放变形，返回逐帧导出的画面和三角形"""
+    side = int(np.ceil(np.sqrt(count)))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), axis=-1).reshape(-1, 2)[:count]
+    positions = (grid - (side - 1) / 2.0) * 0.55
+    triangles = Triangle.create_many(count, vertices=SOURCE, positions=positions)
+    other = Triangle(TARGET * 2.0, (0.0, 0.5, 1.0))
+    
+    engine = MiniAnimationEngine(160, 120, "Morph Test", render_mode=render_mode, headless=True)
+    engine.add(triangles)
+    half = count // 2
+    
+    def play():
+        # 批量变形与普通动画同时播放；一半对象变为单个三角形的形状，一半逐个指定
+        engine.play(morph_to(triangles[:half], TARGET, 0.5),
+                    morph_to(triangles[half:], [TARGET * 0.5] * (count - half), 0.5, EaseFunction.linear),
+                    move_to(triangles[0], (0, 0), 0.5))
+        # 中途停止的变形按当前进度写回顶点
+        engine.play(morph_to(triangles[:half], other, 1.0, EaseFunction.linear), run_time=0.5)
+        
+    frames = export_frames(engine, play)
+    engine.cleanup()
+    return frames, triangles
+
+
+def main():
+    print("Mini Animation Engine - Morph Test")
+    
+    gpu_frames, triangles = morph_frames('instanced')
+    cpu_frames, reference = morph_frames('batched')
+    assert gpu_frames.shape == cpu_frames.shape
+    # 两条路径的三角形光栅化可能在边缘相差一个像素
+    mismatch = np.any(gpu_frames != cpu_frames, axis=-1).mean()
+    assert mismatch < 0.005, f"GPU混合与CPU混合的画面差异过大: {mismatch:.4f}"
+    assert not np.array_equal(gpu_frames[3], gpu_frames[10]), "画面应随变形变化"
+    
+    # 结束后顶点写回对象：完成的变形为目标形状，中途停止的为当时的混合结果
+    half = len(triangles) // 2
+    assert np.allclose(triangles[-1].original_vertices, TARGET * 0.5)
+    assert np.allclose(triangles[0].original_vertices, TARGET + (TARGET * 2.0 - TARGET) * 0.5, atol=1e-5)
+    assert triangles[0].original_vertices is triangles[half - 1].original_vertices, "同组对象应共享混合后的顶点"
+    for ours, theirs in zip(triangles, reference):
+        assert np.array_equal(ours.original_vertices, theirs.original_vertices)
+    print(f"  {len(triangles)} 个对象，{len(gpu_frames)} 帧一致（像素差异 {mismatch:.4%}）")
+    
+    # 时间线随机访问：定位回变形之前恢复原来的顶点
+    class MorphScene(MiniAnimationEngine):
+        def construct(self):
+            triangle = Triangle(SOURCE)
+            self.add(triangle)
+            self.play(morph_to(triangle, TARGET, 1.0))
+            
+    engine = MorphScene(160, 120, "Morph Timeline", headless=True)
+    timeline = engine.compile_timeline(30)
+    triangle = engine.scene.objects[0]
+    timeline.seek(timeline.duration)
+    assert np.allclose(triangle.original_vertices, TARGET)
+    timeline.seek(0.0)
+    assert np.allclose(triangle.original_vertices, SOURCE)
+    engine.cleanup()
+    print("Morph test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
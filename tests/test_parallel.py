@@ -0,0 +1,66 @@
+"""
+Parallel export test
+多进程并行导出测试：与单进程逐帧导出的结果逐帧比较
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import math
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.animation import move_to, rotate_to, color_to
+from core.parallel import render_parallel, _compiled_timeline
+
+
+class ParallelTestScene(MiniAnimationEngine):
+    """用于并行导出的测试场景"""
+    
+    def construct(self):
+        triangle = self.create_equilateral_triangle(1.5, (1.0, 0.0, 0.0))
+        triangle.move_to(-3, 0)
+        self.add(triangle)
+        self.play(move_to(triangle, (3, 0), 1.0), rotate_to(triangle, math.pi, 1.0))
+        
+        other = self.create_right_triangle(1.0, 1.5, (0.0, 0.0, 1.0))
+        self.add(other)
+        self.play(color_to(triangle, (0.0, 1.0, 0.0), 0.5))
+        self.wait(0.3)
+
+
+def main():
+    print("Mini Animation Engine - Parallel Export Test")
+    
+    width, height, fps = 160, 120, 30
+    with tempfile.TemporaryDirectory() as directory:
+        # 单进程参考结果
+        sequential_path = os.path.join(directory, 'sequential.rgb')
+        engine = ParallelTestScene(width, height, "Parallel Test", headless=True)
+        engine.start_export(sequential_path, fps=fps)
+        engine.construct()
+        engine.finish_export()
+        engine.cleanup()
+        
+        # 多进程并行导出，使用较小的区间以覆盖区间拼接
+        parallel_path = os.path.join(directory, 'parallel.rgb')
+        stats = render_parallel(ParallelTestScene, parallel_path, fps=fps, workers=2, chunk_frames=7,
+                                width=width, height=height)
+        print(f"  并行导出 {stats['frames']} 帧，{stats['fps']:.1f} 帧/秒，{stats['workers']} 个进程")
+        
+        sequential = np.fromfile(sequential_path, dtype=np.uint8).reshape(-1, height, width, 3)
+        parallel = np.fromfile(parallel_path, dtype=np.uint8).reshape(-1, height, width, 3)
+        assert len(sequential) == stats['frames'] == round(1.8 * fps)
+        assert np.array_equal(sequential, parallel), "并行导出结果应与单进程一致"
+        
+    # 工作进程中的时间线只编译一次，之后的区间直接复用
+    kwargs = {'width': width, 'height': height}
+    engine, timeline = _compiled_timeline(ParallelTestScene, kwargs, fps)
+    assert _compiled_timeline(ParallelTestScene, dict(kwargs), fps) == (engine, timeline)
+    assert _compiled_timeline(ParallelTestScene, kwargs, fps * 2)[1] is not timeline
+    
+    print("Parallel export test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Frame scheduler test
+帧调度测试：逐帧时钟下不限速不跳帧，实时限速、落后跳帧和帧统计
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from core.scene import MiniAnimationEngine
+from core.clock import FrameClock
+from core.scheduler import FrameScheduler
+from core.animation import move_to
+
+
+def run_frames(scheduler: FrameScheduler, count: int, work: float = 0.0) -> list:
+    """按场景的调用顺序驱动count帧，每帧更新耗时work秒，返回每帧是否渲染"""
+    decisions = []
+    for _ in range(count):
+        scheduler.begin_frame()
+        if work:
+            time.sleep(work)
+        scheduler.end_update()
+        rendered = scheduler.should_render()
+        decisions.append(rendered)
+        scheduler.end_frame(rendered)
+    return decisions
+
+
+def check_frame_clock():
+    """逐帧时钟：每帧都渲染、不sleep；画面未变化的帧计为复用而不是渲染"""
+    engine = MiniAnimationEngine(160, 120, "Scheduler Test", headless=True, clock=FrameClock(30))
+    assert not engine.scene.scheduler.pacing
+    triangle = engine.create_equilateral_triangle(1.0)
+    engine.add(triangle)
+    start = time.perf_counter()
+    engine.play(move_to(triangle, (2, 0), 0.5))
+    engine.wait(0.5)
+    elapsed = time.perf_counter() - start
+    stats = engine.frame_stats()
+    assert stats['frames_rendered'] == 15, stats
+    assert stats['frames_reused'] == 15, stats
+    assert stats['frames_skipped'] == 0, stats
+    assert abs(engine.scene.clock.time() - 1.0) < 1e-6
+    assert elapsed < 1.0, "逐帧时钟不应按真实时间限速"
+    engine.cleanup()
+
+
+def check_idle_gap():
+    """两次play之间的空闲时间不算作落后：下一次play的第一帧不应被跳过"""
+    engine = MiniAnimationEngine(160, 120, "Scheduler Test", headless=True, target_fps=30)
+    assert engine.scene.scheduler.pacing
+    triangle = engine.create_equilateral_triangle(1.0)
+    engine.add(triangle)
+    engine.play(move_to(triangle, (1, 0), 0.2))
+    time.sleep(0.3)
+    engine.play(move_to(triangle, (-1, 0), 0.2))
+    engine.wait(0.1)
+    stats = engine.frame_stats()
+    assert stats['frames_skipped'] == 0, stats
+    engine.cleanup()
+
+
+def check_pacing():
+    """实时限速：提前完成的帧sleep到截止时间，不跳帧"""
+    scheduler = FrameScheduler(target_fps=50)
+    start = time.perf_counter()
+    decisions = run_frames(scheduler, 10)
+    elapsed = time.perf_counter() - start
+    assert all(decisions)
+    assert elapsed >= 9 * scheduler.frame_budget, f"10帧应至少用时9个帧预算: {elapsed:.3f}s"
+    stats = scheduler.stats()
+    assert stats['frames_rendered'] == 10 and stats['frames_skipped'] == 0 and stats['overruns'] == 0, stats
+
+
+def check_skipping():
+    """落后超过一帧预算时跳过渲染，连续跳帧不超过max_skip"""
+    scheduler = FrameScheduler(target_fps=100, max_skip=2)
+    decisions = run_frames(scheduler, 9, work=0.03)
+    assert decisions == [False, False, True] * 3, decisions
+    stats = scheduler.stats()
+    assert stats['frames_rendered'] == 3 and stats['frames_skipped'] == 6, stats
+    assert stats['overruns'] == 9, stats
+    assert stats['last_render_ms'] >= 0.0 and stats['average_frame_ms'] >= 30.0, stats
+    
+    # 重置后统计归零，复用的帧单独计数
+    scheduler.reset_stats()
+    scheduler.begin_frame()
+    scheduler.end_update()
+    scheduler.end_frame(True, reused=True)
+    stats = scheduler.stats()
+    assert stats['frames_reused'] == 1 and stats['frames_rendered'] == 0 and stats['fps'] == 0.0, stats
+
+
+def main():
+    print("Mini Animation Engine - Scheduler Test")
+    
+    check_frame_clock()
+    check_idle_gap()
+    check_pacing()
+    check_skipping()
+    print("Scheduler test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Static layer test
+静态层测试：烘焙静态对象后合成的画面与逐帧绘制所有对象一致，只在静态对象变化时重新烘焙
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.clock import FrameClock
+from core.geometry import Triangle
+from core.animation import move_to, rotate_to, color_to
+from frame_helpers import export_frames
+
+
+def play_scene(render_mode: str, static: bool, backend: str = 'opengl'):
+    """静态背景上播放少量动画，中途修改和移除静态对象；返回逐帧画面和引擎的帧统计"""
+    rng = np.random.default_rng(0)
+    background = Triangle.create_many(300, positions=rng.uniform(-6, 6, (300, 2)), colors=rng.uniform(0, 1, (300, 3)),
+                                      scales=np.full((300, 3), 0.5))
+    actors = Triangle.create_many(12, positions=rng.uniform(-5, 5, (12, 2)), colors=np.tile((1.0, 1.0, 1.0), (12, 1)))
+    
+    engine = MiniAnimationEngine(160, 120, "Static Layer Test", render_mode=render_mode, headless=True, backend=backend)
+    # 静态层先于动态对象绘制，参考场景中静态对象也排在前面
+    engine.add(background, actors)
+    if static:
+        engine.set_static(background)
+        
+    def play():
+        engine.play(*[move_to(actor, (0, 0), 0.4) for actor in actors], rotate_to(actors[0], 3.0, 0.4))
+        background[0].color = (0.0, 1.0, 0.0)
+        engine.remove(background[1:50])
+        engine.play(*[color_to(actor, (1.0, 0.0, 0.0), 0.3) for actor in actors])
+        engine.set_background_color((0.1, 0.1, 0.3))
+        engine.wait(0.1)
+        
+    frames = export_frames(engine, play)
+    stats = engine.frame_stats()
+    engine.cleanup()
+    return frames, stats
+
+
+def check_gpu_animation():
+    """GPU动画路径：在GPU上动画的静态对象按动态对象绘制"""
+    engine = MiniAnimationEngine(160, 120, "Static Layer Test", render_mode='gpu_animation', headless=True, clock=FrameClock(30))
+    triangles = Triangle.create_many(50, positions=np.random.default_rng(1).uniform(-5, 5, (50, 2)))
+    engine.add(triangles)
+    engine.set_static(triangles)
+    engine.animate_on_gpu([rotate_to(triangle, 3.0, 1.0) for triangle in triangles[:5]], loop='repeat')
+    reference = MiniAnimationEngine(160, 120, "Static Layer Test", render_mode='gpu_animation', headless=True, clock=FrameClock(30))
+    reference.add(triangles[5:], triangles[:5])
+    reference.animate_on_gpu([rotate_to(triangle, 3.0, 1.0) for triangle in triangles[:5]], loop='repeat')
+    # 两个引擎共享同一批对象，逐帧交替运行
+    for _ in range(10):
+        engine.scene._run_frame(update=True)
+        reference.scene._run_frame(update=True)
+        assert np.array_equal(engine.renderer.read_pixels(), reference.renderer.read_pixels())
+    assert engine.frame_stats()['layer_bakes'] == 1
+    engine.cleanup()
+    reference.cleanup()
+
+
+def main():
+    print("Mini Animation Engine - Static Layer Test")
+    
+    cases = [('batched', 'opengl'), ('instanced', 'opengl'), ('immediate', 'opengl'), ('gpu_transform', 'opengl'), ('batched', 'software')]
+    for render_mode, backend in cases:
+        baked, stats = play_scene(render_mode, True, backend)
+        reference, _ = play_scene(render_mode, False, backend)
+        assert np.array_equal(baked, reference), f"{backend}/{render_mode} 合成静态层的画面应与逐帧绘制一致"
+        # 首次烘焙、修改并移除静态对象（同一帧之前）、更换背景色各烘焙一次
+        assert stats['layer_bakes'] == 3, stats['layer_bakes']
+        print(f"  {backend}/{render_mode}: {len(baked)} 帧一致，烘焙 {stats['layer_bakes']} 次")
+        
+    check_gpu_animation()
+    print("Static layer test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Timeline test
+时间线测试：乱序定位到任意帧的画面与逐帧导出一致
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import math
+import numpy as np
+from core.scene import MiniAnimationEngine
+from core.animation import move_to, rotate_to, scale_to, color_to, Succession, LaggedStart, EaseFunction
+from frame_helpers import export_frames
+
+
+class TimelineTestScene(MiniAnimationEngine):
+    """覆盖成员变化、背景色、动画之间的直接修改和动画组"""
+    
+    def construct(self):
+        triangle = self.create_equilateral_triangle(1.5, (1.0, 0.0, 0.0))
+        triangle.move_to(-3, 0)
+        self.add(triangle)
+        self.play(move_to(triangle, (3, 0), 1.0), rotate_to(triangle, math.pi, 1.0))
+        
+        other = self.create_right_triangle(1.0, 1.5, (0.0, 0.0, 1.0))
+        other.move_to(0, 2)
+        self.add(other)
+        self.set_background_color((0.1, 0.1, 0.3))
+        self.play(color_to(triangle, (0.0, 1.0, 0.0), 0.5), scale_to(other, 2.0, 0.4))
+        self.wait(0.3)
+        
+        self.remove(triangle)
+        other.transform.translate(-1, 0)
+        self.play(move_to(other, (0, -2), 0.6))
+        
+        # 错开开始的子动画，以及同一对象上依次播放的子动画（同一属性交替使用不同缓动，分属不同批量组）
+        small = [self.create_equilateral_triangle(0.4, (1.0, 1.0, 0.0)) for _ in range(8)]
+        for i, triangle in enumerate(small):
+            triangle.move_to(i - 3.5, 2)
+        self.add(small)
+        self.play(LaggedStart(*[move_to(triangle, (triangle.transform.position[0], -1), 0.4) for triangle in small], lag_ratio=0.3),
+                  Succession(rotate_to(other, math.pi, 0.3), move_to(other, (2, -2), 0.3, EaseFunction.linear),
+                             move_to(other, (-2, -1), 0.3), move_to(other, (1, 1), 0.2, EaseFunction.linear),
+                             color_to(other, (1.0, 1.0, 1.0), 0.2)))
+
+
+class ManyPlaysScene(MiniAnimationEngine):
+    """大量短小的play：快照以增量保存，跨越多个关键快照"""
+    
+    def construct(self):
+        rng = np.random.default_rng(1)
+        triangles = [self.create_equilateral_triangle(0.5, tuple(rng.uniform(0, 1, 3))) for _ in range(40)]
+        for triangle in triangles:
+            triangle.move_to(*rng.uniform(-4, 4, 2))
+        self.add(triangles)
+        for step in range(80):
+            triangle = triangles[step % len(triangles)]
+            self.play(move_to(triangle, tuple(rng.uniform(-4, 4, 2)), 0.1), color_to(triangles[step * 7 % 40], tuple(rng.uniform(0, 1, 3)), 0.1))
+            if step == 50:
+                self.remove(triangles[:5])
+            elif step == 60:
+                self.add(triangles[:5])
+                triangles[0].rotate(1.0)
+
+
+class GpuAnimationScene(MiniAnimationEngine):
+    """GPU动画与play/wait同时进行：循环、往返和播放一次的动画，以及之后读取终值的CPU动画"""
+    
+    def construct(self):
+        triangles = [self.create_equilateral_triangle(0.6, (1.0, 0.5, 0.0)) for _ in range(6)]
+        for i, triangle in enumerate(triangles):
+            triangle.move_to(i - 2.5, 0)
+        self.add(triangles)
+        self.animate_on_gpu([rotate_to(triangle, 6.28, 0.8, EaseFunction.linear) for triangle in triangles[:3]], loop='repeat')
+        self.play(move_to(triangles[5], (2.5, 2), 0.5))
+        self.animate_on_gpu(move_to(triangles[3], (-2, -2), 0.4), scale_to(triangles[4], 2.0, 0.6))
+        self.animate_on_gpu(color_to(triangles[5], (0.0, 0.0, 1.0), 0.3), loop='pingpong')
+        self.wait(0.5)
+        self.play(move_to(triangles[3], (2, -2), 0.4))
+        self.wait(0.2)
+
+
+def sequential_frames(scene_class, width: int, height: int, fps: float, render_mode: str = 'batched') -> np.ndarray:
+    """逐帧导出的参考结果"""
+    engine = scene_class(width, height, "Timeline Test", render_mode=render_mode, headless=True)
+    frames = export_frames(engine, engine.construct, fps)
+    engine.cleanup()
+    return frames
+
+
+def check_delta_snapshots(width: int, height: int, fps: float):
+    """增量快照：乱序定位与逐帧导出一致，只有少数快照保存所有成员的值"""
+    sequential = sequential_frames(ManyPlaysScene, width, height, fps)
+    engine = ManyPlaysScene(width, height, "Timeline Test", headless=True)
+    timeline = engine.compile_timeline(fps)
+    assert timeline.frame_count == len(sequential)
+    keyframes = sum(segment.snapshot.slots is None for segment in timeline.segments)
+    assert 1 < keyframes <= len(timeline.segments) // 10, keyframes
+    for index in np.random.default_rng(2).permutation(timeline.frame_count):
+        timeline.seek_frame(int(index))
+        engine.scene._render_frame()
+        assert np.array_equal(engine.renderer.read_pixels(), sequential[index]), f"第 {index} 帧不一致"
+    engine.cleanup()
+    print(f"  增量快照：{len(timeline.segments)} 个片段，{keyframes} 个关键快照")
+
+
+def check_gpu_animation(width: int, height: int, fps: float):
+    """animate_on_gpu的动画随时间线定位：乱序定位与逐帧导出一致（GPU和CPU求值两条路径）"""
+    for render_mode in ('gpu_animation', 'batched'):
+        sequential = sequential_frames(GpuAnimationScene, width, height, fps, render_mode)
+        engine = GpuAnimationScene(width, height, "Timeline Test", render_mode=render_mode, headless=True)
+        timeline = engine.compile_timeline(fps)
+        assert timeline.frame_count == len(sequential)
+        for index in np.random.default_rng(3).permutation(timeline.frame_count):
+            timeline.seek_frame(int(index))
+            assert engine.scene.clock.time() == timeline.frame_time(int(index))
+            engine.scene._render_frame()
+            assert np.array_equal(engine.renderer.read_pixels(), sequential[index]), f"{render_mode} 第 {index} 帧不一致"
+        assert np.array_equal(engine.render_at(timeline.frame_time(4)), sequential[4])
+        engine.cleanup()
+    print(f"  GPU动画：{len(sequential)} 帧一致")
+
+
+def main():
+    print("Mini Animation Engine - Timeline Test")
+    
+    width, height, fps = 160, 120, 30
+    sequential = sequential_frames(TimelineTestScene, width, height, fps)
+    engine = TimelineTestScene(width, height, "Timeline Test", headless=True)
+    timeline = engine.compile_timeline(fps)
+    print(f"  编译 {timeline.frame_count} 帧，{len(timeline.segments)} 个片段")
+    assert timeline.frame_count == len(sequential), "帧数应与逐帧导出一致"
+    assert engine.scene.frame_index == 0, "编译时不应渲染任何帧"
+    assert len(timeline.segments) == 5, "每次play/wait是一个片段"
+    
+    # 乱序定位，每一帧都应与逐帧导出一致
+    order = np.random.default_rng(0).permutation(timeline.frame_count)
+    for index in order:
+        timeline.seek_frame(int(index))
+        engine.scene._render_frame()
+        assert np.array_equal(engine.renderer.read_pixels(), sequential[index]), f"第 {index} 帧不一致"
+        
+    # 时间线结束之后保持最终状态
+    assert np.array_equal(engine.render_at(timeline.duration + 1.0), sequential[-1])
+    assert len(engine.scene.objects) == 9
+    engine.cleanup()
+    
+    check_delta_snapshots(width, height, fps)
+    check_gpu_animation(width, height, fps)
+    print("Timeline test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Transform store test
+结构数组存储测试：变换视图、加入/移出场景时的迁移和修改追踪
+"""
+import sys
+import os
+import math
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+from core.geometry import Triangle, Transform, TransformStore, transform_matrices
+from core.scene import MiniAnimationEngine
+
+
+def main():
+    print("Mini Animation Engine - Transform Store Test")
+    
+    # 链式接口写入所在的行
+    triangle = Triangle(color=(0.0, 0.5, 1.0))
+    triangle.move_to(1, 2).shift(0.5, 0).rotate(math.pi / 2).scale(2)
+    transform = triangle.transform
+    assert np.allclose(transform.position, (1.5, 2, 0))
+    assert math.isclose(transform.rotation, math.pi / 2, rel_tol=1e-6)
+    assert np.allclose(transform.scale, 2)
+    assert triangle.color == (0.0, 0.5, 1.0)
+    
+    # 旋转和颜色读回的值与赋值相等（0.1等float32无法精确表示的值），实例数据仍为float32
+    exact = Triangle(color=(0.1, 0.2, 0.3))
+    exact.transform.rotation = 0.1
+    assert exact.color == (0.1, 0.2, 0.3) and exact.transform.rotation == 0.1
+    data = exact._transform._store.instance_data(np.array([exact._transform._row]))
+    assert data.dtype == np.float32 and data[0, 3] == np.float32(0.1)
+    engine = MiniAnimationEngine(160, 120, "Store Test", headless=True)
+    engine.add(exact)
+    assert exact.color == (0.1, 0.2, 0.3) and exact.transform.rotation == 0.1
+    engine.cleanup()
+    
+    # 修改戳随赋值增大
+    version = triangle.version
+    triangle.shift(1, 0)
+    assert triangle.version > version
+    version = triangle.version
+    triangle.color = (1.0, 0.0, 0.0)
+    assert triangle.version > version
+    
+    # 矩阵缓存在变换被修改（包括原地运算）后失效，批量计算与逐个计算一致
+    matrix = transform.get_matrix()
+    assert transform.get_matrix() is matrix
+    transform.translate(1, 0)
+    assert transform.get_matrix() is not matrix and math.isclose(transform.get_matrix()[0, 3], matrix[0, 3] + 1)
+    batch = transform_matrices(transform.position[None], [transform.rotation], transform.scale[None])
+    assert np.array_equal(batch[0], transform.get_matrix())
+    
+    # 替换变换时复制数值
+    triangle.transform = Transform(position=(3, 4, 0))
+    assert triangle.transform is transform
+    assert np.allclose(transform.position, (3, 4, 0)) and np.allclose(transform.scale, 1)
+    
+    # 加入场景后迁移到场景的存储，移出后迁回单行存储，数值保持不变
+    engine = MiniAnimationEngine(160, 120, "Store Test", headless=True)
+    others = [Triangle().move_to(i, 0) for i in range(100)]
+    engine.add(triangle, *others)
+    store = engine.scene.store
+    assert transform._store is store and len(store) == 101
+    assert np.allclose(store.positions[transform._row], (3, 4, 0))
+    assert np.allclose(store.colors[transform._row], (1, 0, 0))
+    
+    # 整个场景的平移是一次数组运算
+    rows = engine.scene._rows()
+    store.positions[rows, 1] += 1.0
+    store.touch(rows)
+    assert np.allclose(others[10].transform.position, (10, 1, 0))
+    
+    # 整个场景的批量变换与逐对象变换一致
+    others[3].rotate(1.0).scale(0.5)
+    others[4].set_vertices([[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    vertices = engine.scene.get_transformed_vertices()
+    assert vertices.dtype == np.float32 and vertices.shape == (101, 3, 3)
+    assert np.allclose(vertices, np.stack([obj.get_vertices() for obj in engine.scene.objects]), atol=1e-6)
+    
+    engine.remove(triangle)
+    assert transform._store is not store and len(store) == 100
+    assert np.allclose(transform.position, (3, 5, 0)) and triangle.color == (1.0, 0.0, 0.0)
+    
+    # 释放的行被复用
+    engine.add(Triangle())
+    assert store._size == 101
+    
+    # 副本共享只读顶点，set_vertices时才替换
+    copy = others[0].copy()
+    assert copy.original_vertices is others[0].original_vertices
+    assert np.allclose(copy.transform.position, others[0].transform.position)
+    copy.set_vertices([[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    assert not np.allclose(copy.original_vertices, others[0].original_vertices)
+    
+    # 批量创建：同一个存储的连续行
+    positions = np.column_stack([np.arange(1000), np.zeros(1000)])
+    particles = Triangle.create_many(1000, positions=positions, scales=np.full(1000, 0.1), colors=(0.0, 1.0, 0.0))
+    assert len({id(p.transform._store) for p in particles}) == 1
+    assert np.allclose(particles[7].transform.position, (7, 0, 0)) and np.allclose(particles[7].transform.scale, 0.1)
+    assert particles[7].color == (0.0, 1.0, 0.0)
+    engine.add(*particles)
+    assert np.allclose(engine.scene.get_transformed_vertices()[-1], particles[-1].get_vertices())
+    
+    # 批量移除后空行过多时整理存储：行号紧凑且与绘制顺序一致，id不变
+    scene = engine.scene
+    survivor = particles[-1]
+    survivor_id = scene.registry.id_of(survivor)
+    scene.remove(particles[:-1])
+    assert survivor in scene.registry and particles[0] not in scene.registry
+    assert scene.registry.id_of(survivor) == survivor_id
+    assert len(store) == len(scene.registry) == scene.get_object_count()
+    assert np.array_equal(scene._rows(), np.arange(len(scene.registry)))
+    assert np.allclose(survivor.transform.position, (999, 0, 0))
+    assert np.allclose(particles[0].transform.position, (0, 0, 0)) and particles[0].transform._store is not store
+    
+    # 单独的存储容量翻倍扩容
+    standalone = TransformStore()
+    for _ in range(5):
+        standalone.allocate()
+    assert standalone.capacity == 8 and len(standalone) == 5
+    
+    engine.cleanup()
+    print("Transform store test completed successfully!")
+
+
+if __name__ == "__main__":
+    main()